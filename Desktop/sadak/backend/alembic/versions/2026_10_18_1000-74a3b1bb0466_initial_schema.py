@@ -0,0 +1,231 @@
+"""initial schema
+
+Revision ID: 74a3b1bb0466
+Revises:
+Create Date: 2026-10-18 10:00:00.000000
+
+Базовая схема, соответствующая моделям app/models.
+Для БД, созданной раньше через autogenerate, выполните
+`alembic stamp 74a3b1bb0466`, затем `alembic upgrade head`.
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers, used by Alembic.
+revision: str = '74a3b1bb0466'
+down_revision: Union[str, None] = None
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+campaign_status = sa.Enum(
+    'DRAFT', 'PENDING', 'ACTIVE', 'COMPLETED', 'EXPIRED', 'REJECTED', 'CANCELLED',
+    name='campaignstatus'
+)
+donation_status = sa.Enum(
+    'PENDING', 'PROCESSING', 'COMPLETED', 'FAILED', 'CANCELLED',
+    name='donationstatus'
+)
+payment_provider = sa.Enum('YOOKASSA', 'CLOUDPAYMENTS', name='paymentprovider')
+subscription_plan = sa.Enum('BASIC', 'PRO', 'PREMIUM', name='subscriptionplan')
+subscription_period = sa.Enum('P1M', 'P3M', 'P6M', 'P12M', name='subscriptionperiod')
+subscription_status = sa.Enum('ACTIVE', 'PAUSED', 'CANCELLED', 'EXPIRED', name='subscriptionstatus')
+partner_application_status = sa.Enum('PENDING', 'APPROVED', 'REJECTED', name='partnerapplicationstatus')
+
+
+def upgrade() -> None:
+    op.create_table(
+        'users',
+        sa.Column('id', sa.BigInteger(), nullable=False),
+        sa.Column('tg_id', sa.BigInteger(), nullable=False),
+        sa.Column('first_name', sa.String(length=255), nullable=True),
+        sa.Column('last_name', sa.String(length=255), nullable=True),
+        sa.Column('username', sa.String(length=255), nullable=True),
+        sa.Column('locale', sa.String(length=10), nullable=True),
+        sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=True),
+        sa.Column('updated_at', sa.DateTime(timezone=True), nullable=True),
+        sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index(op.f('ix_users_id'), 'users', ['id'], unique=False)
+    op.create_index(op.f('ix_users_tg_id'), 'users', ['tg_id'], unique=True)
+
+    op.create_table(
+        'funds',
+        sa.Column('id', sa.BigInteger(), nullable=False),
+        sa.Column('name', sa.String(length=255), nullable=False),
+        sa.Column('description', sa.Text(), nullable=True),
+        sa.Column('country_code', sa.String(length=2), nullable=True),
+        sa.Column('categories', postgresql.ARRAY(sa.String()), nullable=True),
+        sa.Column('verified', sa.Boolean(), nullable=True),
+        sa.Column('logo_url', sa.String(length=512), nullable=True),
+        sa.Column('website_url', sa.String(length=512), nullable=True),
+        sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=True),
+        sa.Column('updated_at', sa.DateTime(timezone=True), nullable=True),
+        sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index(op.f('ix_funds_id'), 'funds', ['id'], unique=False)
+
+    op.create_table(
+        'campaigns',
+        sa.Column('id', sa.BigInteger(), nullable=False),
+        sa.Column('owner_id', sa.BigInteger(), nullable=False),
+        sa.Column('fund_id', sa.BigInteger(), nullable=False),
+        sa.Column('title', sa.String(length=255), nullable=False),
+        sa.Column('description', sa.Text(), nullable=False),
+        sa.Column('category', sa.String(length=100), nullable=True),
+        sa.Column('goal_amount', sa.Numeric(precision=10, scale=2), nullable=False),
+        sa.Column('collected_amount', sa.Numeric(precision=10, scale=2), nullable=True),
+        sa.Column('currency', sa.String(length=3), nullable=True),
+        sa.Column('country_code', sa.String(length=2), nullable=True),
+        sa.Column('banner_url', sa.String(length=512), nullable=True),
+        sa.Column('start_date', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=True),
+        sa.Column('end_date', sa.DateTime(timezone=True), nullable=False),
+        sa.Column('status', campaign_status, nullable=True),
+        sa.Column('moderated_by', sa.BigInteger(), nullable=True),
+        sa.Column('moderated_at', sa.DateTime(timezone=True), nullable=True),
+        sa.Column('rejection_reason', sa.Text(), nullable=True),
+        sa.Column('participants_count', sa.BigInteger(), nullable=True),
+        sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=True),
+        sa.Column('updated_at', sa.DateTime(timezone=True), nullable=True),
+        sa.ForeignKeyConstraint(['fund_id'], ['funds.id']),
+        sa.ForeignKeyConstraint(['moderated_by'], ['users.id']),
+        sa.ForeignKeyConstraint(['owner_id'], ['users.id']),
+        sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index(op.f('ix_campaigns_id'), 'campaigns', ['id'], unique=False)
+
+    op.create_table(
+        'donations',
+        sa.Column('id', sa.BigInteger(), nullable=False),
+        sa.Column('user_id', sa.BigInteger(), nullable=False),
+        sa.Column('fund_id', sa.BigInteger(), nullable=True),
+        sa.Column('campaign_id', sa.BigInteger(), nullable=True),
+        sa.Column('amount_value', sa.Numeric(precision=10, scale=2), nullable=False),
+        sa.Column('currency', sa.String(length=3), nullable=True),
+        sa.Column('status', donation_status, nullable=True),
+        sa.Column('provider', payment_provider, nullable=True),
+        sa.Column('payment_id', sa.String(length=255), nullable=True),
+        sa.Column('payment_url', sa.String(length=512), nullable=True),
+        sa.Column('donation_type', sa.String(length=50), nullable=True),
+        sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=True),
+        sa.Column('updated_at', sa.DateTime(timezone=True), nullable=True),
+        sa.Column('completed_at', sa.DateTime(timezone=True), nullable=True),
+        sa.ForeignKeyConstraint(['campaign_id'], ['campaigns.id']),
+        sa.ForeignKeyConstraint(['fund_id'], ['funds.id']),
+        sa.ForeignKeyConstraint(['user_id'], ['users.id']),
+        sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index(op.f('ix_donations_id'), 'donations', ['id'], unique=False)
+
+    op.create_table(
+        'subscriptions',
+        sa.Column('id', sa.BigInteger(), nullable=False),
+        sa.Column('user_id', sa.BigInteger(), nullable=False),
+        sa.Column('fund_id', sa.BigInteger(), nullable=True),
+        sa.Column('plan', subscription_plan, nullable=False),
+        sa.Column('period', subscription_period, nullable=False),
+        sa.Column('amount_value', sa.Numeric(precision=10, scale=2), nullable=False),
+        sa.Column('currency', sa.String(length=3), nullable=True),
+        sa.Column('charity_percent', sa.Numeric(precision=5, scale=2), nullable=True),
+        sa.Column('status', subscription_status, nullable=True),
+        sa.Column('payment_token', sa.String(length=255), nullable=True),
+        sa.Column('payment_provider', sa.String(length=50), nullable=True),
+        sa.Column('started_at', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=True),
+        sa.Column('next_charge_at', sa.DateTime(timezone=True), nullable=True),
+        sa.Column('expires_at', sa.DateTime(timezone=True), nullable=True),
+        sa.Column('cancelled_at', sa.DateTime(timezone=True), nullable=True),
+        sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=True),
+        sa.Column('updated_at', sa.DateTime(timezone=True), nullable=True),
+        sa.ForeignKeyConstraint(['fund_id'], ['funds.id']),
+        sa.ForeignKeyConstraint(['user_id'], ['users.id']),
+        sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index(op.f('ix_subscriptions_id'), 'subscriptions', ['id'], unique=False)
+
+    op.create_table(
+        'zakat_calculations',
+        sa.Column('id', sa.BigInteger(), nullable=False),
+        sa.Column('user_id', sa.BigInteger(), nullable=False),
+        sa.Column('payload_json', sa.JSON(), nullable=True),
+        sa.Column('total_wealth', sa.Numeric(precision=10, scale=2), nullable=True),
+        sa.Column('nisab_value', sa.Numeric(precision=10, scale=2), nullable=True),
+        sa.Column('zakat_due', sa.Numeric(precision=10, scale=2), nullable=True),
+        sa.Column('donation_id', sa.BigInteger(), nullable=True),
+        sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=True),
+        sa.ForeignKeyConstraint(['donation_id'], ['donations.id']),
+        sa.ForeignKeyConstraint(['user_id'], ['users.id']),
+        sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index(op.f('ix_zakat_calculations_id'), 'zakat_calculations', ['id'], unique=False)
+
+    op.create_table(
+        'reports',
+        sa.Column('id', sa.BigInteger(), nullable=False),
+        sa.Column('fund_id', sa.BigInteger(), nullable=False),
+        sa.Column('period_start', sa.DateTime(timezone=True), nullable=False),
+        sa.Column('period_end', sa.DateTime(timezone=True), nullable=False),
+        sa.Column('title', sa.String(length=255), nullable=True),
+        sa.Column('description', sa.String(length=1000), nullable=True),
+        sa.Column('file_url', sa.String(length=512), nullable=True),
+        sa.Column('verified', sa.Boolean(), nullable=True),
+        sa.Column('verified_by', sa.BigInteger(), nullable=True),
+        sa.Column('verified_at', sa.DateTime(timezone=True), nullable=True),
+        sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=True),
+        sa.Column('updated_at', sa.DateTime(timezone=True), nullable=True),
+        sa.ForeignKeyConstraint(['fund_id'], ['funds.id']),
+        sa.ForeignKeyConstraint(['verified_by'], ['users.id']),
+        sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index(op.f('ix_reports_id'), 'reports', ['id'], unique=False)
+
+    op.create_table(
+        'partner_applications',
+        sa.Column('id', sa.BigInteger(), nullable=False),
+        sa.Column('organization_name', sa.String(length=255), nullable=False),
+        sa.Column('contact_email', sa.String(length=255), nullable=False),
+        sa.Column('contact_phone', sa.String(length=50), nullable=True),
+        sa.Column('category', sa.String(length=100), nullable=False),
+        sa.Column('country_code', sa.String(length=2), nullable=False),
+        sa.Column('description', sa.Text(), nullable=False),
+        sa.Column('website_url', sa.String(length=500), nullable=True),
+        sa.Column('status', partner_application_status, nullable=True),
+        sa.Column('reviewed_by', sa.BigInteger(), nullable=True),
+        sa.Column('reviewed_at', sa.DateTime(timezone=True), nullable=True),
+        sa.Column('rejection_reason', sa.Text(), nullable=True),
+        sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=True),
+        sa.Column('updated_at', sa.DateTime(timezone=True), nullable=True),
+        sa.ForeignKeyConstraint(['reviewed_by'], ['users.id']),
+        sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index(op.f('ix_partner_applications_id'), 'partner_applications', ['id'], unique=False)
+
+
+def downgrade() -> None:
+    op.drop_index(op.f('ix_partner_applications_id'), table_name='partner_applications')
+    op.drop_table('partner_applications')
+    op.drop_index(op.f('ix_reports_id'), table_name='reports')
+    op.drop_table('reports')
+    op.drop_index(op.f('ix_zakat_calculations_id'), table_name='zakat_calculations')
+    op.drop_table('zakat_calculations')
+    op.drop_index(op.f('ix_subscriptions_id'), table_name='subscriptions')
+    op.drop_table('subscriptions')
+    op.drop_index(op.f('ix_donations_id'), table_name='donations')
+    op.drop_table('donations')
+    op.drop_index(op.f('ix_campaigns_id'), table_name='campaigns')
+    op.drop_table('campaigns')
+    op.drop_index(op.f('ix_funds_id'), table_name='funds')
+    op.drop_table('funds')
+    op.drop_index(op.f('ix_users_tg_id'), table_name='users')
+    op.drop_index(op.f('ix_users_id'), table_name='users')
+    op.drop_table('users')
+
+    bind = op.get_bind()
+    for enum_type in (
+        partner_application_status, subscription_status, subscription_period,
+        subscription_plan, payment_provider, donation_status, campaign_status,
+    ):
+        enum_type.drop(bind, checkfirst=True)
@@ -0,0 +1,86 @@
+"""hot query indexes
+
+Revision ID: 87c374885f90
+Revises: 74a3b1bb0466
+Create Date: 2026-10-18 10:10:00.000000
+
+Составные и частичные индексы для горячих запросов. Строятся через
+CREATE INDEX CONCURRENTLY, поэтому не блокируют запись в таблицы;
+CONCURRENTLY нельзя выполнять в транзакции, отсюда autocommit_block.
+Для пожертвований и отчётов используются частичные индексы: все
+горячие запросы фильтруют status = 'COMPLETED' / verified.
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '87c374885f90'
+down_revision: Union[str, None] = '74a3b1bb0466'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    with op.get_context().autocommit_block():
+        op.create_index(
+            'ix_donations_campaign_completed', 'donations', ['campaign_id', 'completed_at'],
+            postgresql_where=sa.text("status = 'COMPLETED'"),
+            postgresql_concurrently=True, if_not_exists=True,
+        )
+        op.create_index(
+            'ix_donations_user_completed', 'donations', ['user_id', 'completed_at'],
+            postgresql_where=sa.text("status = 'COMPLETED'"),
+            postgresql_concurrently=True, if_not_exists=True,
+        )
+        op.create_index(
+            'ix_donations_user_created', 'donations', ['user_id', 'created_at'],
+            postgresql_concurrently=True, if_not_exists=True,
+        )
+        op.create_index(
+            'ix_campaigns_status_created', 'campaigns', ['status', 'created_at'],
+            postgresql_concurrently=True, if_not_exists=True,
+        )
+        op.create_index(
+            'ix_campaigns_status_end_date', 'campaigns', ['status', 'end_date'],
+            postgresql_concurrently=True, if_not_exists=True,
+        )
+        op.create_index(
+            'ix_subscriptions_user_status', 'subscriptions', ['user_id', 'status'],
+            postgresql_concurrently=True, if_not_exists=True,
+        )
+        op.create_index(
+            'ix_zakat_calculations_user_created', 'zakat_calculations', ['user_id', 'created_at'],
+            postgresql_concurrently=True, if_not_exists=True,
+        )
+        op.create_index(
+            'ix_funds_categories', 'funds', ['categories'],
+            postgresql_using='gin',
+            postgresql_concurrently=True, if_not_exists=True,
+        )
+        op.create_index(
+            'ix_reports_fund_verified_created', 'reports', ['fund_id', 'created_at'],
+            postgresql_where=sa.text('verified'),
+            postgresql_concurrently=True, if_not_exists=True,
+        )
+
+
+def downgrade() -> None:
+    with op.get_context().autocommit_block():
+        for index_name, table_name in (
+            ('ix_reports_fund_verified_created', 'reports'),
+            ('ix_funds_categories', 'funds'),
+            ('ix_zakat_calculations_user_created', 'zakat_calculations'),
+            ('ix_subscriptions_user_status', 'subscriptions'),
+            ('ix_campaigns_status_end_date', 'campaigns'),
+            ('ix_campaigns_status_created', 'campaigns'),
+            ('ix_donations_user_created', 'donations'),
+            ('ix_donations_user_completed', 'donations'),
+            ('ix_donations_campaign_completed', 'donations'),
+        ):
+            op.drop_index(
+                index_name, table_name=table_name,
+                postgresql_concurrently=True, if_exists=True,
+            )
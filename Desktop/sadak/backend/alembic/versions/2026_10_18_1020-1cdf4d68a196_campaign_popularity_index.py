@@ -0,0 +1,36 @@
+"""campaign popularity index
+
+Revision ID: 1cdf4d68a196
+Revises: 87c374885f90
+Create Date: 2026-10-18 10:20:00.000000
+
+Индекс для keyset-пагинации GET /campaigns?sort=popularity:
+(participants_count, id) < (:key, :id) внутри статуса читается
+прямо из индекса, без сортировки всех активных кампаний.
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = '1cdf4d68a196'
+down_revision: Union[str, None] = '87c374885f90'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    with op.get_context().autocommit_block():
+        op.create_index(
+            'ix_campaigns_status_participants', 'campaigns', ['status', 'participants_count', 'id'],
+            postgresql_concurrently=True, if_not_exists=True,
+        )
+
+
+def downgrade() -> None:
+    with op.get_context().autocommit_block():
+        op.drop_index(
+            'ix_campaigns_status_participants', table_name='campaigns',
+            postgresql_concurrently=True, if_exists=True,
+        )
@@ -0,0 +1,53 @@
+"""campaign progress column
+
+Revision ID: 388da48f57dc
+Revises: 1cdf4d68a196
+Create Date: 2026-10-18 10:30:00.000000
+
+Хранимая вычисляемая колонка campaigns.progress (collected / goal) и
+индекс (status, progress, id) для GET /campaigns?sort=progress: листинг
+читается индексом вместо вычисления CASE по всем активным строкам и сортировки.
+
+ADD COLUMN ... GENERATED ALWAYS AS ... STORED переписывает таблицу под
+эксклюзивной блокировкой - на больших таблицах запускать в окно обслуживания.
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '388da48f57dc'
+down_revision: Union[str, None] = '1cdf4d68a196'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.add_column(
+        'campaigns',
+        sa.Column(
+            'progress', sa.Float(),
+            sa.Computed(
+                "CASE WHEN goal_amount > 0 "
+                "THEN CAST(COALESCE(collected_amount, 0) AS DOUBLE PRECISION) / CAST(goal_amount AS DOUBLE PRECISION) "
+                "ELSE 0 END",
+                persisted=True
+            ),
+        ),
+    )
+    with op.get_context().autocommit_block():
+        op.create_index(
+            'ix_campaigns_status_progress', 'campaigns', ['status', 'progress', 'id'],
+            postgresql_concurrently=True, if_not_exists=True,
+        )
+
+
+def downgrade() -> None:
+    with op.get_context().autocommit_block():
+        op.drop_index(
+            'ix_campaigns_status_progress', table_name='campaigns',
+            postgresql_concurrently=True, if_exists=True,
+        )
+    op.drop_column('campaigns', 'progress')
@@ -0,0 +1,35 @@
+"""campaign counter shards
+
+Revision ID: a9518a24b18f
+Revises: 388da48f57dc
+Create Date: 2026-10-18 10:40:00.000000
+
+Строки-дельты для write-behind счётчиков кампаний (CAMPAIGN_COUNTER_SHARDS > 0).
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'a9518a24b18f'
+down_revision: Union[str, None] = '388da48f57dc'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        'campaign_counter_shards',
+        sa.Column('campaign_id', sa.BigInteger(), nullable=False),
+        sa.Column('shard', sa.Integer(), nullable=False),
+        sa.Column('amount', sa.Numeric(12, 2), nullable=False),
+        sa.Column('participants', sa.BigInteger(), nullable=False),
+        sa.ForeignKeyConstraint(['campaign_id'], ['campaigns.id'], ondelete='CASCADE'),
+        sa.PrimaryKeyConstraint('campaign_id', 'shard'),
+    )
+
+
+def downgrade() -> None:
+    op.drop_table('campaign_counter_shards')
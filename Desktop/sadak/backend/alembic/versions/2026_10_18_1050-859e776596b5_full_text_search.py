@@ -0,0 +1,63 @@
+"""full text search
+
+Revision ID: 859e776596b5
+Revises: a9518a24b18f
+Create Date: 2026-10-18 10:50:00.000000
+
+Хранимые колонки search_vector (to_tsvector, русская конфигурация; название
+с весом A, описание - B) у campaigns и funds и GIN-индексы по ним для GET /search.
+
+ADD COLUMN ... GENERATED ALWAYS AS ... STORED переписывает таблицу под
+эксклюзивной блокировкой - на больших таблицах запускать в окно обслуживания.
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers, used by Alembic.
+revision: str = '859e776596b5'
+down_revision: Union[str, None] = 'a9518a24b18f'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def _search_vector(title: str) -> sa.Column:
+    return sa.Column(
+        'search_vector', postgresql.TSVECTOR(),
+        sa.Computed(
+            f"setweight(to_tsvector('russian', coalesce({title}, '')), 'A') || "
+            "setweight(to_tsvector('russian', coalesce(description, '')), 'B')",
+            persisted=True
+        ),
+    )
+
+
+def upgrade() -> None:
+    op.add_column('campaigns', _search_vector('title'))
+    op.add_column('funds', _search_vector('name'))
+    with op.get_context().autocommit_block():
+        op.create_index(
+            'ix_campaigns_search', 'campaigns', ['search_vector'],
+            postgresql_using='gin', postgresql_concurrently=True, if_not_exists=True,
+        )
+        op.create_index(
+            'ix_funds_search', 'funds', ['search_vector'],
+            postgresql_using='gin', postgresql_concurrently=True, if_not_exists=True,
+        )
+
+
+def downgrade() -> None:
+    with op.get_context().autocommit_block():
+        op.drop_index(
+            'ix_funds_search', table_name='funds',
+            postgresql_concurrently=True, if_exists=True,
+        )
+        op.drop_index(
+            'ix_campaigns_search', table_name='campaigns',
+            postgresql_concurrently=True, if_exists=True,
+        )
+    op.drop_column('funds', 'search_vector')
+    op.drop_column('campaigns', 'search_vector')
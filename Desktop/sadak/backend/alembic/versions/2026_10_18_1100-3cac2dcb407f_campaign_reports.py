@@ -0,0 +1,63 @@
+"""campaign reports
+
+Revision ID: 3cac2dcb407f
+Revises: 859e776596b5
+Create Date: 2026-10-18 11:00:00.000000
+
+Материализованные отчёты завершённых кампаний (GET /campaigns/{id}/report
+читает строку по первичному ключу) и заполнение для уже завершённых кампаний.
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers, used by Alembic.
+revision: str = '3cac2dcb407f'
+down_revision: Union[str, None] = '859e776596b5'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        'campaign_reports',
+        sa.Column('campaign_id', sa.BigInteger(), nullable=False),
+        sa.Column('fund_id', sa.BigInteger(), nullable=False),
+        sa.Column('fund_name', sa.String(length=255), nullable=False),
+        sa.Column('total_collected', sa.Numeric(12, 2), nullable=False),
+        sa.Column('total_participants', sa.BigInteger(), nullable=False),
+        sa.Column('fund_report_url', sa.String(length=512), nullable=True),
+        sa.Column('transferred_at', sa.DateTime(timezone=True), nullable=True),
+        sa.Column('report_documents', postgresql.ARRAY(sa.String()), nullable=True),
+        sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=True),
+        sa.Column('updated_at', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=True),
+        sa.ForeignKeyConstraint(['campaign_id'], ['campaigns.id'], ondelete='CASCADE'),
+        sa.ForeignKeyConstraint(['fund_id'], ['funds.id']),
+        sa.PrimaryKeyConstraint('campaign_id'),
+    )
+    op.create_index(op.f('ix_campaign_reports_fund_id'), 'campaign_reports', ['fund_id'], unique=False)
+
+    # Те же значения, что пишет campaign_service.refresh_campaign_reports
+    op.execute("""
+        INSERT INTO campaign_reports (campaign_id, fund_id, fund_name, total_collected,
+                                      total_participants, fund_report_url, transferred_at)
+        SELECT c.id, c.fund_id, f.name,
+               COALESCE(c.collected_amount, 0), COALESCE(c.participants_count, 0),
+               (SELECT r.file_url FROM reports r
+                 WHERE r.fund_id = c.fund_id AND r.verified
+                 ORDER BY r.created_at DESC LIMIT 1),
+               COALESCE((SELECT max(d.completed_at) FROM donations d
+                          WHERE d.campaign_id = c.id AND d.status = 'COMPLETED'),
+                        c.updated_at)
+        FROM campaigns c
+        JOIN funds f ON f.id = c.fund_id
+        WHERE c.status IN ('COMPLETED', 'EXPIRED')
+    """)
+
+
+def downgrade() -> None:
+    op.drop_index(op.f('ix_campaign_reports_fund_id'), table_name='campaign_reports')
+    op.drop_table('campaign_reports')
@@ -0,0 +1,70 @@
+"""campaign trending score
+
+Revision ID: c3bfc09e6aee
+Revises: 3cac2dcb407f
+Create Date: 2026-10-18 11:10:00.000000
+
+Колонка campaigns.trending_score для GET /campaigns?sort=trending, её
+заполнение по уже завершённым пожертвованиям и индекс (status,
+trending_score, id) для keyset-пагинации.
+
+ADD COLUMN с постоянным DEFAULT не переписывает таблицу; заполнение -
+один UPDATE по кампаниям с пожертвованиями.
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'c3bfc09e6aee'
+down_revision: Union[str, None] = '3cac2dcb407f'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.add_column(
+        'campaigns',
+        sa.Column('trending_score', sa.Float(), server_default='0', nullable=False),
+    )
+
+    # То же, что campaign_service.recompute_trending_scores при
+    # TRENDING_HALF_LIFE_HOURS = 24 (эпоха - TRENDING_EPOCH)
+    op.execute("""
+        UPDATE campaigns c
+        SET trending_score = s.score
+        FROM (
+            SELECT campaign_id, peak + ln(sum(exp(exponent - peak))) AS score
+            FROM (
+                SELECT campaign_id, exponent,
+                       max(exponent) OVER (PARTITION BY campaign_id) AS peak
+                FROM (
+                    SELECT campaign_id,
+                           extract(epoch FROM COALESCE(completed_at, created_at)
+                                              - TIMESTAMPTZ '2026-01-01 00:00:00+00')
+                           * ln(2) / (24 * 3600) AS exponent
+                    FROM donations
+                    WHERE campaign_id IS NOT NULL AND status = 'COMPLETED'
+                ) AS weights
+            ) AS shifted
+            GROUP BY campaign_id, peak
+        ) AS s
+        WHERE c.id = s.campaign_id
+    """)
+
+    with op.get_context().autocommit_block():
+        op.create_index(
+            'ix_campaigns_status_trending', 'campaigns', ['status', 'trending_score', 'id'],
+            postgresql_concurrently=True, if_not_exists=True,
+        )
+
+
+def downgrade() -> None:
+    with op.get_context().autocommit_block():
+        op.drop_index(
+            'ix_campaigns_status_trending', table_name='campaigns',
+            postgresql_concurrently=True, if_exists=True,
+        )
+    op.drop_column('campaigns', 'trending_score')
@@ -0,0 +1,104 @@
+"""campaign effective country
+
+Revision ID: 0084eda12e3b
+Revises: c3bfc09e6aee
+Create Date: 2026-10-18 11:20:00.000000
+
+Денормализованная страна кампании для GET /campaigns?country_code=:
+campaigns.effective_country_code = COALESCE(campaigns.country_code,
+funds.country_code). Листинг с фильтром по стране читает одну таблицу
+по индексу (status, effective_country_code, ключ сортировки, id) вместо
+outer join с funds и условия OR, которое индексом не обслуживается.
+
+Колонку поддерживают триггеры:
+- campaigns BEFORE INSERT / UPDATE OF country_code, fund_id - пересчёт
+  для строки (обновления прогресса эти колонки не трогают и триггер не
+  вызывают);
+- funds AFTER UPDATE OF country_code - новая страна фонда переносится в
+  его кампании без собственной country_code.
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '0084eda12e3b'
+down_revision: Union[str, None] = 'c3bfc09e6aee'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.add_column('campaigns', sa.Column('effective_country_code', sa.String(length=2), nullable=True))
+
+    op.execute("""
+        CREATE FUNCTION campaigns_effective_country() RETURNS trigger AS $$
+        BEGIN
+            NEW.effective_country_code := COALESCE(
+                NEW.country_code,
+                (SELECT country_code FROM funds WHERE id = NEW.fund_id)
+            );
+            RETURN NEW;
+        END
+        $$ LANGUAGE plpgsql
+    """)
+    op.execute("""
+        CREATE TRIGGER campaigns_effective_country
+        BEFORE INSERT OR UPDATE OF country_code, fund_id ON campaigns
+        FOR EACH ROW EXECUTE FUNCTION campaigns_effective_country()
+    """)
+    op.execute("""
+        CREATE FUNCTION funds_propagate_country() RETURNS trigger AS $$
+        BEGIN
+            UPDATE campaigns
+            SET effective_country_code = NEW.country_code
+            WHERE fund_id = NEW.id AND country_code IS NULL;
+            RETURN NULL;
+        END
+        $$ LANGUAGE plpgsql
+    """)
+    op.execute("""
+        CREATE TRIGGER funds_propagate_country
+        AFTER UPDATE OF country_code ON funds
+        FOR EACH ROW WHEN (OLD.country_code IS DISTINCT FROM NEW.country_code)
+        EXECUTE FUNCTION funds_propagate_country()
+    """)
+
+    # Триггеры уже созданы: кампании, вставленные во время заполнения, не пропадут
+    op.execute("""
+        UPDATE campaigns c
+        SET effective_country_code = COALESCE(c.country_code, f.country_code)
+        FROM funds f
+        WHERE f.id = c.fund_id
+    """)
+
+    with op.get_context().autocommit_block():
+        op.create_index(
+            'ix_campaigns_status_country_created', 'campaigns',
+            ['status', 'effective_country_code', 'created_at', 'id'],
+            postgresql_concurrently=True, if_not_exists=True,
+        )
+        op.create_index(
+            'ix_campaigns_status_country_end_date', 'campaigns',
+            ['status', 'effective_country_code', 'end_date', 'id'],
+            postgresql_concurrently=True, if_not_exists=True,
+        )
+
+
+def downgrade() -> None:
+    with op.get_context().autocommit_block():
+        op.drop_index(
+            'ix_campaigns_status_country_end_date', table_name='campaigns',
+            postgresql_concurrently=True, if_exists=True,
+        )
+        op.drop_index(
+            'ix_campaigns_status_country_created', table_name='campaigns',
+            postgresql_concurrently=True, if_exists=True,
+        )
+    op.execute("DROP TRIGGER IF EXISTS funds_propagate_country ON funds")
+    op.execute("DROP FUNCTION IF EXISTS funds_propagate_country()")
+    op.execute("DROP TRIGGER IF EXISTS campaigns_effective_country ON campaigns")
+    op.execute("DROP FUNCTION IF EXISTS campaigns_effective_country()")
+    op.drop_column('campaigns', 'effective_country_code')
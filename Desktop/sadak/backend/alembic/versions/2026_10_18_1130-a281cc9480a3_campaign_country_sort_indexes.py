@@ -0,0 +1,50 @@
+"""campaign country sort indexes
+
+Revision ID: a281cc9480a3
+Revises: 0084eda12e3b
+Create Date: 2026-10-18 11:30:00.000000
+
+Индексы (status, effective_country_code, ключ сортировки, id) для
+GET /campaigns?country_code= с sort=popularity, progress и trending:
+без них листинг страны по этим сортировкам читает все активные кампании
+страны по ix_campaigns_status_country_created и сортирует их целиком.
+
+participants_count, progress и trending_score уже входят в индексы
+листинга без страны, поэтому обновление прогресса и так не бывает HOT:
+новые индексы добавляют по одной записи индекса на пожертвование.
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'a281cc9480a3'
+down_revision: Union[str, None] = '0084eda12e3b'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+INDEXES = (
+    ('ix_campaigns_status_country_participants', 'participants_count'),
+    ('ix_campaigns_status_country_progress', 'progress'),
+    ('ix_campaigns_status_country_trending', 'trending_score'),
+)
+
+
+def upgrade() -> None:
+    with op.get_context().autocommit_block():
+        for name, sort_column in INDEXES:
+            op.create_index(
+                name, 'campaigns',
+                ['status', 'effective_country_code', sort_column, 'id'],
+                postgresql_concurrently=True, if_not_exists=True,
+            )
+
+
+def downgrade() -> None:
+    with op.get_context().autocommit_block():
+        for name, _ in reversed(INDEXES):
+            op.drop_index(
+                name, table_name='campaigns',
+                postgresql_concurrently=True, if_exists=True,
+            )
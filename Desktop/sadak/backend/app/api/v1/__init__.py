@@ -2,10 +2,11 @@
 API v1 роутеры
 """
 from fastapi import APIRouter
-from app.api.v1 import funds, donations, subscriptions, campaigns, zakat, history, webhooks, admin, statistics, partners
+from app.api.v1 import funds, donations, subscriptions, campaigns, zakat, history, webhooks, admin, statistics, partners, auth, search, autocomplete
 
 api_router = APIRouter()
 
+api_router.include_router(auth.router, prefix="/auth", tags=["auth"])
 api_router.include_router(funds.router, prefix="/funds", tags=["funds"])
 api_router.include_router(donations.router, prefix="/donations", tags=["donations"])
 api_router.include_router(subscriptions.router, prefix="/subscriptions", tags=["subscriptions"])
@@ -16,4 +17,6 @@ api_router.include_router(webhooks.router, prefix="/payments/webhook", tags=["we
 api_router.include_router(admin.router, tags=["admin"])
 api_router.include_router(statistics.router, tags=["statistics"])
 api_router.include_router(partners.router, prefix="/partners", tags=["partners"])
+api_router.include_router(search.router, prefix="/search", tags=["search"])
+api_router.include_router(autocomplete.router, prefix="/autocomplete", tags=["search"])
 
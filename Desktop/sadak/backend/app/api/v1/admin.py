@@ -1,12 +1,12 @@
 """
-API роутер для администраторов (модерация кампаний)
+API роутер для администраторов (модерация кампаний и фондов)
 """
-from fastapi import APIRouter, Depends, HTTPException, Header
-from sqlalchemy.orm import Session
+from fastapi import APIRouter, Depends, HTTPException
+from sqlalchemy.ext.asyncio import AsyncSession
 from typing import List
 from pydantic import BaseModel
 from app.core.database import get_db
-from app.core.telegram import get_user_from_init_data
+from app.core.security import get_admin_user
 from app import schemas
 from app.services import campaign_service
 from app.models.campaign import CampaignStatus
@@ -14,44 +14,13 @@ from app.models.campaign import CampaignStatus
 router = APIRouter(prefix="/admin", tags=["admin"])
 
 
-def get_admin_user(
-    x_telegram_init_data: str = Header(..., alias="X-Telegram-Init-Data"),
-    db: Session = Depends(get_db)
-):
-    """Получение администратора с проверкой прав"""
-    from app.services import donation_service
-    from app.core.config import settings
-    
-    user_data = get_user_from_init_data(x_telegram_init_data)
-    if not user_data:
-        raise HTTPException(status_code=401, detail="Invalid Telegram initData")
-    
-    user = donation_service.get_or_create_user(
-        db=db,
-        tg_id=user_data.get("id"),
-        first_name=user_data.get("first_name"),
-        last_name=user_data.get("last_name"),
-        username=user_data.get("username")
-    )
-    
-    # Проверка прав администратора
-    tg_id = user_data.get("id")
-    admin_ids = [int(id.strip()) for id in settings.ADMIN_TELEGRAM_IDS.split(",") if id.strip()] if settings.ADMIN_TELEGRAM_IDS else []
-    
-    if admin_ids and tg_id not in admin_ids:
-        raise HTTPException(status_code=403, detail="Access denied. Admin rights required.")
-    
-    # Если ADMIN_TELEGRAM_IDS не настроен, разрешаем всем (для разработки)
-    return user
-
-
 @router.get("/campaigns/pending", response_model=List[schemas.Campaign])
 async def get_pending_campaigns(
     admin = Depends(get_admin_user),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_db)
 ):
     """Получить список кампаний на модерации"""
-    campaigns = campaign_service.get_campaigns(
+    campaigns = await campaign_service.get_campaigns(
         db=db,
         status="pending"
     )
@@ -62,10 +31,10 @@ async def get_pending_campaigns(
 async def approve_campaign(
     campaign_id: int,
     admin = Depends(get_admin_user),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_db)
 ):
     """Одобрить кампанию"""
-    campaign = campaign_service.moderate_campaign(
+    campaign = await campaign_service.moderate_campaign(
         db=db,
         campaign_id=campaign_id,
         moderator_id=admin.id,
@@ -83,10 +52,10 @@ async def reject_campaign(
     campaign_id: int,
     request: CampaignRejectRequest,
     admin = Depends(get_admin_user),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_db)
 ):
     """Отклонить кампанию"""
-    campaign = campaign_service.moderate_campaign(
+    campaign = await campaign_service.moderate_campaign(
         db=db,
         campaign_id=campaign_id,
         moderator_id=admin.id,
@@ -99,12 +68,65 @@ async def reject_campaign(
 @router.post("/campaigns/check-expired")
 async def check_expired_campaigns(
     admin = Depends(get_admin_user),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_db)
 ):
     """Проверить и завершить истекшие кампании"""
-    expired = campaign_service.check_and_expire_campaigns(db=db)
+    expired = await campaign_service.check_and_expire_campaigns(db=db)
     return {
         "message": f"Expired {len(expired)} campaigns",
         "expired_campaigns": len(expired)
     }
 
+
+@router.post("/funds/{fund_id}/verify", response_model=schemas.Fund)
+async def verify_fund(
+    fund_id: int,
+    admin = Depends(get_admin_user),
+    db: AsyncSession = Depends(get_db)
+):
+    """Отметить фонд как проверенный"""
+    from app.services import fund_service
+    
+    try:
+        return await fund_service.set_fund_verified(db=db, fund_id=fund_id)
+    except ValueError as e:
+        raise HTTPException(status_code=404, detail=str(e))
+
+
+@router.patch("/funds/{fund_id}/country", response_model=schemas.Fund)
+async def update_fund_country(
+    fund_id: int,
+    request: schemas.FundCountryUpdate,
+    admin = Depends(get_admin_user),
+    db: AsyncSession = Depends(get_db)
+):
+    """Сменить страну фонда (и кампаний фонда без собственной страны)"""
+    from app.services import fund_service
+    
+    try:
+        return await fund_service.set_fund_country(
+            db=db, fund_id=fund_id, country_code=request.country_code.upper() if request.country_code else None
+        )
+    except ValueError as e:
+        raise HTTPException(status_code=404, detail=str(e))
+
+
+@router.post("/reports/{report_id}/verify")
+async def verify_fund_report(
+    report_id: int,
+    admin = Depends(get_admin_user),
+    db: AsyncSession = Depends(get_db)
+):
+    """Отметить отчёт фонда как проверенный (обновляет отчёты завершённых кампаний фонда)"""
+    from app.services import report_service
+    
+    try:
+        report = await report_service.verify_report(db=db, report_id=report_id, verified_by=admin.id)
+    except ValueError as e:
+        raise HTTPException(status_code=404, detail=str(e))
+    return {
+        "id": report.id,
+        "fund_id": report.fund_id,
+        "verified": report.verified,
+        "verified_at": report.verified_at
+    }
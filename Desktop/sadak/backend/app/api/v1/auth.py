@@ -0,0 +1,43 @@
+"""
+API роутер для авторизации (обмен initData на сессионный токен)
+"""
+from fastapi import APIRouter, Depends, HTTPException, Header
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.core.config import settings
+from app.core.database import get_db
+from app.core.security import create_access_token
+from app.core.telegram import get_user_from_init_data
+from app import schemas
+from app.services import donation_service
+
+router = APIRouter()
+
+
+@router.post("/token", response_model=schemas.AccessToken)
+async def create_token(
+    x_telegram_init_data: str = Header(..., alias="X-Telegram-Init-Data"),
+    db: AsyncSession = Depends(get_db)
+):
+    """
+    Обменять Telegram initData на сессионный токен
+
+    Дальнейшие запросы передают токен в заголовке
+    Authorization: Bearer <access_token> вместо initData.
+    По истечении expires_in секунд токен нужно получить заново.
+    """
+    user_data = get_user_from_init_data(x_telegram_init_data)
+    if not user_data:
+        raise HTTPException(status_code=401, detail="Invalid Telegram initData")
+
+    user = await donation_service.get_or_create_user(
+        db=db,
+        tg_id=user_data.get("id"),
+        first_name=user_data.get("first_name"),
+        last_name=user_data.get("last_name"),
+        username=user_data.get("username")
+    )
+
+    return schemas.AccessToken(
+        access_token=create_access_token(user_id=user.id, tg_id=user.tg_id),
+        expires_in=settings.ACCESS_TOKEN_EXPIRE_MINUTES * 60
+    )
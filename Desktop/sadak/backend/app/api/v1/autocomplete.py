@@ -0,0 +1,28 @@
+"""
+API роутер для автодополнения строки поиска
+"""
+from fastapi import APIRouter, HTTPException, Query
+from typing import List, Optional
+from app import schemas
+from app.services import autocomplete_service
+from app.services.search import SEARCH_TYPES
+
+router = APIRouter()
+
+
+@router.get("", response_model=List[schemas.AutocompleteItem])
+async def autocomplete(
+    q: str = Query(..., min_length=1, max_length=100, description="Начало слова из названия"),
+    type: Optional[str] = Query(None, description="Что подсказывать: campaign, fund (по умолчанию всё)"),
+    limit: int = Query(10, ge=1, le=20, description="Количество подсказок"),
+):
+    """
+    Подсказки по названиям активных кампаний и проверенных фондов
+    
+    Отвечает из индекса в памяти, без запроса к БД. Совпадение - с начала
+    любого слова названия, без учёта регистра и ё/е.
+    """
+    if type is not None and type not in SEARCH_TYPES:
+        raise HTTPException(status_code=400, detail=f"Invalid search type: {type}")
+    
+    return autocomplete_service.suggest(q, kind=type, limit=limit)
@@ -1,44 +1,26 @@
 """
 API роутер для кампаний
 """
-from fastapi import APIRouter, Depends, HTTPException, Header, Query, BackgroundTasks
-from sqlalchemy.orm import Session
+from fastapi import APIRouter, Depends, HTTPException, Query, BackgroundTasks, Response
+from sqlalchemy.ext.asyncio import AsyncSession
 from typing import List, Optional
-from app.core.database import get_db
-from app.core.telegram import get_user_from_init_data
+from app.core.database import get_db, get_read_db
+from app.core.security import get_admin_user, get_current_user
 from app import schemas
 from app.services import campaign_service
 
 router = APIRouter()
 
 
-def get_current_user(
-    x_telegram_init_data: str = Header(..., alias="X-Telegram-Init-Data"),
-    db: Session = Depends(get_db)
-):
-    """Получение текущего пользователя из Telegram initData"""
-    from app.services import donation_service
-    user_data = get_user_from_init_data(x_telegram_init_data)
-    if not user_data:
-        raise HTTPException(status_code=401, detail="Invalid Telegram initData")
-    
-    user = donation_service.get_or_create_user(
-        db=db,
-        tg_id=user_data.get("id"),
-        first_name=user_data.get("first_name"),
-        last_name=user_data.get("last_name"),
-        username=user_data.get("username")
-    )
-    return user
-
-
-@router.get("", response_model=List[schemas.Campaign])
+@router.get("", response_model=schemas.CampaignPage)
 async def get_campaigns(
     country_code: Optional[str] = Query(None, description="Фильтр по стране (ISO 3166-1 alpha-2)"),
     category: Optional[str] = Query(None, description="Фильтр по категории"),
     status: Optional[str] = Query(None, description="Фильтр по статусу"),
-    sort: Optional[str] = Query(None, description="Сортировка: popularity, progress, newest, oldest"),
-    db: Session = Depends(get_db)
+    sort: Optional[str] = Query(None, description="Сортировка: popularity, progress, newest, oldest, ending_soon, trending"),
+    cursor: Optional[str] = Query(None, description="Курсор следующей страницы (next_cursor из предыдущего ответа)"),
+    limit: int = Query(20, ge=1, le=100, description="Размер страницы"),
+    db: AsyncSession = Depends(get_read_db)
 ):
     """
     Получить список активных кампаний
@@ -48,39 +30,121 @@ async def get_campaigns(
     - progress: по прогрессу (% сбора)
     - newest: по дате создания (новые сначала)
     - oldest: по дате создания (старые сначала)
+    - ending_soon: срочные - ближайший end_date первым (только ещё не истёкшие)
+    - trending: трендовые - пожертвования последних дней весят больше старых
+    
+    Пагинация курсором: следующая страница запрашивается с теми же
+    фильтрами и cursor=next_cursor; next_cursor=null - страниц больше нет
+    
+    Страницы кэшируются в сериализованном виде; кэш сбрасывается при
+    создании, модерации, пожертвовании и завершении кампаний. Сразу после
+    сброса страницы с реплики не кэшируются - она может отставать
     """
-    campaigns = campaign_service.get_campaigns(
-        db=db,
-        country_code=country_code,
-        category=category,
-        status=status,
-        sort=sort
-    )
-    return campaigns
+    cache = campaign_service.campaign_listing_cache
+    try:
+        cache_key = campaign_service.listing_cache_key(
+            country_code=country_code,
+            category=category,
+            status=status,
+            sort=sort,
+            cursor=cursor,
+            limit=limit
+        )
+    except ValueError:
+        raise HTTPException(status_code=400, detail=f"Invalid status: {status}")
+    
+    body = cache.get(cache_key)
+    if body is None:
+        generation = cache.generation
+        try:
+            campaigns, next_cursor = await campaign_service.get_campaigns_page(
+                db=db,
+                country_code=country_code,
+                category=category,
+                status=status,
+                sort=sort,
+                cursor=cursor,
+                limit=limit
+            )
+        except ValueError as e:
+            raise HTTPException(status_code=400, detail=str(e))
+        body = schemas.CampaignPage(items=campaigns, next_cursor=next_cursor).model_dump_json().encode()
+        if campaign_service.can_cache_listing(db):
+            cache.set(cache_key, body, generation=generation)
+    
+    return Response(content=body, media_type="application/json")
+
+
+@router.get("/facets", response_model=schemas.CampaignFacets)
+async def get_campaign_facets():
+    """
+    Счётчики для панели фильтров: активные кампании и проверенные фонды
+    по категориям и странам
+    
+    Отдаются из счётчиков в памяти (обновляются при смене статуса кампании,
+    проверке фонда и полным перечитыванием по таймеру), без запроса к БД
+    """
+    from app.services import facets_service
+    return facets_service.get_facets()
+
+
+@router.get("/urgent", response_model=List[schemas.Campaign])
+async def get_urgent_campaigns(
+    limit: int = Query(5, ge=1, le=20, description="Количество кампаний")
+):
+    """
+    Срочные кампании для карусели: активные, ближайший end_date первым
+    
+    Отдаётся из списка в памяти (обновляется по таймеру и при изменении
+    кампаний), без запроса к БД
+    """
+    from app.services import urgency_service
+    return urgency_service.get_urgent_campaigns(limit=limit)
 
 
 @router.get("/{campaign_id}", response_model=schemas.Campaign)
 async def get_campaign(
     campaign_id: int,
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_read_db)
 ):
     """Получить информацию о кампании"""
-    campaign = campaign_service.get_campaign(db=db, campaign_id=campaign_id)
+    campaign = await campaign_service.get_campaign(db=db, campaign_id=campaign_id)
     if not campaign:
         raise HTTPException(status_code=404, detail="Campaign not found")
     return campaign
 
 
+@router.get("/{campaign_id}/detail", response_model=schemas.CampaignDetail)
+async def get_campaign_detail(
+    campaign_id: int,
+    donations_limit: int = Query(10, ge=1, le=50, description="Сколько последних пожертвований вернуть"),
+    db: AsyncSession = Depends(get_read_db)
+):
+    """
+    Страница кампании одним запросом: кампания, фонд, последние
+    пожертвования и (для завершённых кампаний) отчёт
+    
+    Заменяет последовательные вызовы /campaigns/{id}, /donations и /report
+    """
+    detail = await campaign_service.get_campaign_detail(
+        db=db,
+        campaign_id=campaign_id,
+        donations_limit=donations_limit
+    )
+    if not detail:
+        raise HTTPException(status_code=404, detail="Campaign not found")
+    return detail
+
+
 async def sync_campaign_to_replika(campaign_id: int):
     """Фоновая задача для синхронизации кампании с e-replika"""
-    from sqlalchemy.orm import Session
-    from app.core.database import SessionLocal
+    from app.core.database import AsyncSessionLocal
     from app.services.e_replika_service import e_replika_service
     
-    db: Session = SessionLocal()
+    db: AsyncSession = AsyncSessionLocal()
     try:
         from app.models import Campaign
-        campaign = db.query(Campaign).filter(Campaign.id == campaign_id).first()
+        campaign = await db.get(Campaign, campaign_id)
         if campaign:
             campaign_data = {
                 "id": campaign.id,
@@ -106,7 +170,7 @@ async def sync_campaign_to_replika(campaign_id: int):
         logger = logging.getLogger(__name__)
         logger.error(f"Error syncing campaign {campaign_id} to e-replika: {e}")
     finally:
-        db.close()
+        await db.close()
 
 
 @router.post("", response_model=schemas.Campaign)
@@ -114,13 +178,13 @@ async def create_campaign(
     campaign_data: schemas.CampaignCreate,
     background_tasks: BackgroundTasks,
     user = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_db)
 ):
     """
     Создать новую кампанию
     Статус автоматически устанавливается в PENDING (на модерации)
     """
-    campaign = campaign_service.create_campaign(
+    campaign = await campaign_service.create_campaign(
         db=db,
         user_id=user.id,
         campaign_data=campaign_data
@@ -137,7 +201,7 @@ async def donate_to_campaign(
     campaign_id: int,
     donation_data: schemas.DonationInit,
     user = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_db)
 ):
     """
     Пожертвовать в кампанию
@@ -145,7 +209,7 @@ async def donate_to_campaign(
     from app.services import donation_service
     
     # Проверяем существование кампании и что она активна
-    campaign = campaign_service.get_campaign(db=db, campaign_id=campaign_id)
+    campaign = await campaign_service.get_campaign(db=db, campaign_id=campaign_id)
     if not campaign:
         raise HTTPException(status_code=404, detail="Campaign not found")
     from app.models.campaign import CampaignStatus
@@ -156,7 +220,7 @@ async def donate_to_campaign(
     donation_data.campaign_id = campaign_id
     donation_data.donation_type = "campaign"
     
-    donation = donation_service.init_donation(
+    donation = await donation_service.init_donation(
         db=db,
         user_id=user.id,
         donation_data=donation_data
@@ -169,36 +233,26 @@ async def donate_to_campaign(
 async def get_campaign_donations(
     campaign_id: int,
     limit: int = Query(10, ge=1, le=50),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_read_db)
 ):
     """
     Получить историю пожертвований кампании (последние N)
     """
-    from app.models import Donation
-    from app.models.donation import DonationStatus
-    
     # Проверяем существование кампании
-    campaign = campaign_service.get_campaign(db=db, campaign_id=campaign_id)
+    campaign = await campaign_service.get_campaign(db=db, campaign_id=campaign_id)
     if not campaign:
         raise HTTPException(status_code=404, detail="Campaign not found")
     
     # Получаем завершённые пожертвования для этой кампании
-    donations = db.query(Donation).filter(
-        Donation.campaign_id == campaign_id,
-        Donation.status == DonationStatus.COMPLETED
-    ).order_by(
-        Donation.completed_at.desc()
-    ).limit(limit).all()
-    
-    return donations
+    return await campaign_service.get_recent_donations(db=db, campaign_id=campaign_id, limit=limit)
 
 
 @router.patch("/{campaign_id}/status", response_model=schemas.Campaign)
 async def update_campaign_status(
     campaign_id: int,
     status_data: schemas.CampaignStatusUpdate,
-    x_telegram_init_data: str = Header(..., alias="X-Telegram-Init-Data"),
-    db: Session = Depends(get_db)
+    admin = Depends(get_admin_user),
+    db: AsyncSession = Depends(get_db)
 ):
     """
     Обновить статус кампании (модерация)
@@ -211,42 +265,20 @@ async def update_campaign_status(
     
     Только администраторы могут изменять статус
     """
-    from app.core.config import settings
-    from app.core.telegram import get_user_from_init_data
-    from app.services import donation_service
-    
-    # Проверка прав администратора
-    user_data = get_user_from_init_data(x_telegram_init_data)
-    if not user_data:
-        raise HTTPException(status_code=401, detail="Invalid Telegram initData")
-    
-    user = donation_service.get_or_create_user(
-        db=db,
-        tg_id=user_data.get("id"),
-        first_name=user_data.get("first_name"),
-        last_name=user_data.get("last_name"),
-        username=user_data.get("username")
-    )
-    
-    admin_ids = [int(id.strip()) for id in settings.ADMIN_TELEGRAM_IDS.split(",") if id.strip()] if settings.ADMIN_TELEGRAM_IDS else []
-    
-    if admin_ids and user_data.get("id") not in admin_ids:
-        raise HTTPException(status_code=403, detail="Access denied. Admin rights required.")
-    
     if status_data.status == "approved":
         # Одобрить кампанию
-        campaign = campaign_service.moderate_campaign(
+        campaign = await campaign_service.moderate_campaign(
             db=db,
             campaign_id=campaign_id,
-            moderator_id=user.id,
+            moderator_id=admin.id,
             action="approve"
         )
     elif status_data.status == "rejected":
         # Отклонить кампанию
-        campaign = campaign_service.moderate_campaign(
+        campaign = await campaign_service.moderate_campaign(
             db=db,
             campaign_id=campaign_id,
-            moderator_id=user.id,
+            moderator_id=admin.id,
             action="reject",
             rejection_reason=status_data.rejection_reason
         )
@@ -262,60 +294,27 @@ async def update_campaign_status(
 @router.get("/{campaign_id}/report", response_model=schemas.CampaignReport)
 async def get_campaign_report(
     campaign_id: int,
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_read_db)
 ):
     """
     Получить отчёт о завершённой кампании
+    
+    Отчёт материализуется при завершении кампании (campaign_reports),
+    здесь - чтение по первичному ключу
     """
-    from app.models import Fund
-    from app.models.campaign import CampaignStatus
+    from app.models import CampaignReport
     
-    # Получаем кампанию
-    campaign = campaign_service.get_campaign(db=db, campaign_id=campaign_id)
+    report = await db.get(CampaignReport, campaign_id)
+    if report:
+        return report
+    
+    # Отчёта нет - различаем несуществующую и незавершённую кампанию
+    campaign = await campaign_service.get_campaign(db=db, campaign_id=campaign_id)
     if not campaign:
         raise HTTPException(status_code=404, detail="Campaign not found")
-    
-    # Проверяем, что кампания завершена
-    if campaign.status not in [CampaignStatus.COMPLETED, CampaignStatus.EXPIRED]:
-        raise HTTPException(
-            status_code=400, 
-            detail="Campaign is not completed. Report available only for completed campaigns."
-        )
-    
-    # Получаем информацию о фонде
-    fund = db.query(Fund).filter(Fund.id == campaign.fund_id).first()
-    if not fund:
-        raise HTTPException(status_code=404, detail="Fund not found")
-    
-    # Получаем дату перечисления (последнее завершённое пожертвование)
-    from app.models import Donation
-    from app.models.donation import DonationStatus
-    
-    last_donation = db.query(Donation).filter(
-        Donation.campaign_id == campaign_id,
-        Donation.status == DonationStatus.COMPLETED
-    ).order_by(
-        Donation.completed_at.desc()
-    ).first()
-    
-    # Получаем отчёт фонда, если есть
-    from app.models.report import Report
-    fund_report = db.query(Report).filter(
-        Report.fund_id == campaign.fund_id,
-        Report.verified == True
-    ).order_by(
-        Report.created_at.desc()
-    ).first()
-    
-    # Формируем отчёт
-    report = schemas.CampaignReport(
-        campaign_id=campaign.id,
-        total_collected=campaign.collected_amount,
-        total_participants=campaign.participants_count,
-        fund_name=fund.name,
-        fund_report_url=fund_report.file_url if fund_report else None,
-        transferred_at=last_donation.completed_at if last_donation else campaign.updated_at,
-        report_documents=None  # Пока нет системы хранения документов для кампаний
+    if campaign.status in campaign_service.FINISHED_STATUSES:
+        raise HTTPException(status_code=404, detail="Report not found")
+    raise HTTPException(
+        status_code=400, 
+        detail="Campaign is not completed. Report available only for completed campaigns."
     )
-    
-    return report
\ No newline at end of file
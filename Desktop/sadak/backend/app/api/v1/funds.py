@@ -2,9 +2,9 @@
 API роутер для фондов
 """
 from fastapi import APIRouter, Depends, Query
-from sqlalchemy.orm import Session
+from sqlalchemy.ext.asyncio import AsyncSession
 from typing import List, Optional
-from app.core.database import get_db
+from app.core.database import get_read_db
 from app import schemas
 from app.services import fund_service
 
@@ -16,12 +16,12 @@ async def get_funds(
     country_code: Optional[str] = Query(None, description="Фильтр по стране"),
     category: Optional[str] = Query(None, description="Фильтр по категории"),
     verified: Optional[bool] = Query(None, description="Только проверенные"),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_read_db)
 ):
     """
     Получить список фондов с фильтрацией
     """
-    funds = fund_service.get_funds(
+    funds = await fund_service.get_funds(
         db=db,
         country_code=country_code,
         category=category,
@@ -33,9 +33,9 @@ async def get_funds(
 @router.get("/{fund_id}", response_model=schemas.Fund)
 async def get_fund(
     fund_id: int,
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_read_db)
 ):
     """Получить информацию о фонде"""
-    fund = fund_service.get_fund(db=db, fund_id=fund_id)
+    fund = await fund_service.get_fund(db=db, fund_id=fund_id)
     return fund
 
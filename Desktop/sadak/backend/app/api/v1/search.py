@@ -0,0 +1,45 @@
+"""
+API роутер для полнотекстового поиска
+"""
+from fastapi import APIRouter, Depends, HTTPException, Query
+from sqlalchemy.ext.asyncio import AsyncSession
+from typing import Optional
+from app.core.database import get_read_db
+from app import schemas
+from app.services.search import search_backend, SEARCH_TYPES
+
+router = APIRouter()
+
+
+@router.get("", response_model=schemas.SearchPage)
+async def search(
+    q: str = Query(..., min_length=1, max_length=200, description="Поисковый запрос"),
+    type: Optional[str] = Query(None, description="Что искать: campaign, fund (по умолчанию всё)"),
+    cursor: Optional[str] = Query(None, description="Курсор следующей страницы (next_cursor из предыдущего ответа)"),
+    limit: int = Query(20, ge=1, le=100, description="Размер страницы"),
+    db: AsyncSession = Depends(get_read_db)
+):
+    """
+    Поиск по названию и описанию активных кампаний и фондов
+    
+    Результаты упорядочены по релевантности (совпадения в названии весомее).
+    Поддерживается синтаксис веб-поиска: "точная фраза", -исключить, or.
+    """
+    query = q.strip()
+    if not query:
+        raise HTTPException(status_code=400, detail="Empty search query")
+    if type is not None and type not in SEARCH_TYPES:
+        raise HTTPException(status_code=400, detail=f"Invalid search type: {type}")
+    
+    try:
+        items, next_cursor = await search_backend.search(
+            db=db,
+            query=query,
+            kind=type,
+            cursor=cursor,
+            limit=limit
+        )
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    
+    return schemas.SearchPage(items=items, next_cursor=next_cursor)
@@ -2,49 +2,17 @@
 API роутер для статистики (интеграция с e-replika.ru)
 """
 from fastapi import APIRouter, Depends, HTTPException, Query
-from sqlalchemy.orm import Session
+from sqlalchemy.ext.asyncio import AsyncSession
 from typing import Optional
 from datetime import datetime, timedelta
 from pydantic import BaseModel
 from app.core.database import get_db
 from app.services.e_replika_service import e_replika_service
-from app.services.donation_service import get_or_create_user
-from app.core.telegram import get_user_from_init_data
-from fastapi import Header
+from app.core.security import get_optional_user
 
 router = APIRouter(prefix="/statistics", tags=["statistics"])
 
 
-def get_authorized_user(
-    x_telegram_init_data: Optional[str] = Header(None, alias="X-Telegram-Init-Data"),
-    authorization: Optional[str] = Header(None),
-    db: Session = Depends(get_db)
-):
-    """Получение авторизованного пользователя для статистики"""
-    # Приоритет: Telegram initData, затем Bearer токен
-    if x_telegram_init_data:
-        user_data = get_user_from_init_data(x_telegram_init_data)
-        if user_data:
-            user = get_or_create_user(
-                db=db,
-                tg_id=user_data.get("id"),
-                first_name=user_data.get("first_name"),
-                last_name=user_data.get("last_name"),
-                username=user_data.get("username")
-            )
-            return user
-    
-    # TODO: Добавить JWT валидацию для Bearer токена
-    # Пока возвращаем заглушку
-    if authorization and authorization.startswith("Bearer "):
-        # В будущем здесь будет валидация JWT токена
-        pass
-    
-    # Для разработки: если нет авторизации, возвращаем None
-    # В продакшене здесь должно быть исключение
-    return None
-
-
 class StatisticsResponse(BaseModel):
     """Базовая модель ответа статистики"""
     total_donations: Optional[float] = None
@@ -61,8 +29,8 @@ async def get_statistics(
     start_date: Optional[str] = Query(None, description="Начальная дата (YYYY-MM-DD)"),
     end_date: Optional[str] = Query(None, description="Конечная дата (YYYY-MM-DD)"),
     group_by: Optional[str] = Query(None, description="Группировка: day, week, month"),
-    user = Depends(get_authorized_user),
-    db: Session = Depends(get_db)
+    user = Depends(get_optional_user),
+    db: AsyncSession = Depends(get_db)
 ):
     """
     Получить общую статистику из e-replika.ru
@@ -106,8 +74,8 @@ async def get_statistics(
 async def get_donations_statistics(
     start_date: Optional[str] = Query(None, description="Начальная дата (YYYY-MM-DD)"),
     end_date: Optional[str] = Query(None, description="Конечная дата (YYYY-MM-DD)"),
-    user = Depends(get_authorized_user),
-    db: Session = Depends(get_db)
+    user = Depends(get_optional_user),
+    db: AsyncSession = Depends(get_db)
 ):
     """
     Получить статистику по пожертвованиям из e-replika.ru
@@ -143,8 +111,8 @@ async def get_donations_statistics(
 async def get_campaigns_statistics(
     start_date: Optional[str] = Query(None, description="Начальная дата (YYYY-MM-DD)"),
     end_date: Optional[str] = Query(None, description="Конечная дата (YYYY-MM-DD)"),
-    user = Depends(get_authorized_user),
-    db: Session = Depends(get_db)
+    user = Depends(get_optional_user),
+    db: AsyncSession = Depends(get_db)
 ):
     """
     Получить статистику по кампаниям из e-replika.ru
@@ -180,8 +148,8 @@ async def get_campaigns_statistics(
 async def get_users_statistics(
     start_date: Optional[str] = Query(None, description="Начальная дата (YYYY-MM-DD)"),
     end_date: Optional[str] = Query(None, description="Конечная дата (YYYY-MM-DD)"),
-    user = Depends(get_authorized_user),
-    db: Session = Depends(get_db)
+    user = Depends(get_optional_user),
+    db: AsyncSession = Depends(get_db)
 ):
     """
     Получить статистику по пользователям из e-replika.ru
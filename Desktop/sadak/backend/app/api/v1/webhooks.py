@@ -2,7 +2,7 @@
 Вебхуки для платежных систем
 """
 from fastapi import APIRouter, Request, HTTPException, Depends
-from sqlalchemy.orm import Session
+from sqlalchemy.ext.asyncio import AsyncSession
 from app.core.database import get_db
 from app.services import donation_service
 from app.services.payment import payment_service
@@ -18,7 +18,7 @@ router = APIRouter()
 @router.post("/yookassa")
 async def yookassa_webhook(
     request: Request,
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_db)
 ):
     """
     Вебхук от YooKassa
@@ -38,7 +38,7 @@ async def yookassa_webhook(
         if event == "payment.succeeded":
             order_id = payment.get("metadata", {}).get("order_id")
             if order_id:
-                donation = donation_service.update_donation_status(
+                donation = await donation_service.update_donation_status(
                     db=db,
                     donation_id=int(order_id),
                     status=DonationStatus.COMPLETED,
@@ -73,7 +73,7 @@ async def yookassa_webhook(
 @router.post("/cloudpayments")
 async def cloudpayments_webhook(
     request: Request,
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_db)
 ):
     """
     Вебхук от CloudPayments
@@ -91,7 +91,7 @@ async def cloudpayments_webhook(
         invoice_id = body.get("InvoiceId")
         
         if transaction_status == "Completed" and invoice_id:
-            donation = donation_service.update_donation_status(
+            donation = await donation_service.update_donation_status(
                 db=db,
                 donation_id=int(invoice_id),
                 status=DonationStatus.COMPLETED,
@@ -0,0 +1,87 @@
+"""
+Кэш в памяти процесса с TTL, инвалидацией и счётчиками попаданий
+
+Каждый воркер держит свой экземпляр: инвалидация действует только в
+процессе, где произошло изменение, в остальных запись доживает до TTL.
+"""
+import time
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Hashable, Optional, Tuple
+
+
+class TTLCache:
+    """LRU-кэш с ограничением по размеру и сроку жизни записей"""
+
+    def __init__(self, name: str, maxsize: int, ttl: float):
+        self.name = name
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self.hits = 0
+        self.misses = 0
+        self.invalidations = 0
+        # Растёт при каждой инвалидации: значение, прочитанное из БД до
+        # инвалидации, не должно попасть в кэш после неё
+        self.generation = 0
+        self._data: "OrderedDict[Hashable, Tuple[float, Any]]" = OrderedDict()
+        _caches[name] = self
+
+    def get(self, key: Hashable) -> Optional[Any]:
+        entry = self._data.get(key)
+        if entry is not None:
+            expires_at, value = entry
+            if expires_at > time.monotonic():
+                self._data.move_to_end(key)
+                self.hits += 1
+                return value
+            del self._data[key]
+        self.misses += 1
+        return None
+
+    def set(self, key: Hashable, value: Any, generation: Optional[int] = None) -> None:
+        """
+        Положить значение в кэш
+
+        Args:
+            generation: self.generation на момент начала чтения из БД;
+                если с тех пор была инвалидация, значение не кэшируется
+        """
+        if generation is not None and generation != self.generation:
+            return
+        self._data[key] = (time.monotonic() + self.ttl, value)
+        self._data.move_to_end(key)
+        while len(self._data) > self.maxsize:
+            self._data.popitem(last=False)
+
+    def invalidate(self, predicate: Callable[[Hashable], bool]) -> int:
+        """Удалить записи, ключи которых подходят под predicate"""
+        self.generation += 1
+        keys = [key for key in self._data if predicate(key)]
+        for key in keys:
+            del self._data[key]
+        self.invalidations += len(keys)
+        return len(keys)
+
+    def clear(self) -> None:
+        self.generation += 1
+        self.invalidations += len(self._data)
+        self._data.clear()
+
+    def stats(self) -> Dict:
+        lookups = self.hits + self.misses
+        return {
+            "size": len(self._data),
+            "maxsize": self.maxsize,
+            "ttl": self.ttl,
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_ratio": self.hits / lookups if lookups else 0.0,
+            "invalidations": self.invalidations,
+        }
+
+
+_caches: Dict[str, TTLCache] = {}
+
+
+def get_cache_metrics() -> Dict:
+    """Снимок счётчиков всех кэшей процесса"""
+    return {name: cache.stats() for name, cache in sorted(_caches.items())}
@@ -1,28 +1,174 @@
 """
 Подключение к базе данных
 """
-from sqlalchemy import create_engine
-from sqlalchemy.ext.declarative import declarative_base
-from sqlalchemy.orm import sessionmaker
+import time
+from contextvars import ContextVar
+from typing import Dict, List, Optional
+from fastapi import Request
+from sqlalchemy import event
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
+from sqlalchemy.orm import Session, declarative_base
 from app.core.config import settings
+from app.core.metrics import instrument_engine, make_instrumented_pool_class
 
-engine = create_engine(
-    settings.DATABASE_URL,
+
+def get_async_database_url(url: str) -> str:
+    """
+    Приводит DATABASE_URL к async-драйверу (asyncpg)
+
+    В .env хранится обычный postgresql:// URL (его же использует Alembic),
+    а приложение работает через postgresql+asyncpg://
+    """
+    if url.startswith("postgresql+psycopg2://"):
+        return url.replace("postgresql+psycopg2://", "postgresql+asyncpg://", 1)
+    if url.startswith("postgresql://"):
+        return url.replace("postgresql://", "postgresql+asyncpg://", 1)
+    if url.startswith("postgres://"):
+        return url.replace("postgres://", "postgresql+asyncpg://", 1)
+    return url
+
+
+engine = create_async_engine(
+    get_async_database_url(settings.DATABASE_URL),
+    poolclass=make_instrumented_pool_class("primary"),
     pool_pre_ping=True,
     pool_size=10,
     max_overflow=20
 )
+instrument_engine(engine.sync_engine, "primary")
+
+# Реплика для чтения. Если DATABASE_READ_URL не задан, используется primary
+if settings.DATABASE_READ_URL:
+    read_engine = create_async_engine(
+        get_async_database_url(settings.DATABASE_READ_URL),
+        poolclass=make_instrumented_pool_class("replica"),
+        pool_pre_ping=True,
+        pool_size=10,
+        max_overflow=20
+    )
+    instrument_engine(read_engine.sync_engine, "replica")
+else:
+    read_engine = engine
+
+# expire_on_commit=False: после commit атрибуты не сбрасываются,
+# иначе обращение к ним вызвало бы неявный (запрещённый в async) запрос
+AsyncSessionLocal = async_sessionmaker(
+    bind=engine,
+    class_=AsyncSession,
+    autoflush=False,
+    expire_on_commit=False
+)
 
-SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+AsyncReadSessionLocal = async_sessionmaker(
+    bind=read_engine,
+    class_=AsyncSession,
+    autoflush=False,
+    expire_on_commit=False
+)
 
 Base = declarative_base()
 
 
-def get_db():
-    """Dependency для получения сессии БД"""
-    db = SessionLocal()
+# Read-your-writes. Момент последнего commit клиента уходит ему в заголовке
+# X-Last-Write, клиент возвращает его в следующих запросах - так окно
+# работает в любом воркере. Карта в памяти процесса - запасной путь для
+# клиентов, которые заголовок не возвращают; реплика обычно догоняет
+# primary за доли секунды
+LAST_WRITE_HEADER = "X-Last-Write"
+
+_recent_writes: Dict[str, float] = {}
+_RECENT_WRITES_MAX_SIZE = 10000
+
+# Момент commit в primary-сессии текущего HTTP-запроса (см. read_after_write_middleware)
+_request_write: ContextVar[Optional[List[float]]] = ContextVar("request_write", default=None)
+
+
+def get_client_key(request: Request) -> Optional[str]:
+    """Ключ клиента для read-your-writes (заголовок авторизации)"""
+    return request.headers.get("X-Telegram-Init-Data") or request.headers.get("Authorization")
+
+
+def mark_recent_write(client_key: str) -> None:
+    """Запомнить, что клиент только что записал данные в primary"""
+    now = time.monotonic()
+    # Окно у всех записей одной длины, поэтому порядок вставки - порядок истечения
+    _recent_writes.pop(client_key, None)
+    if len(_recent_writes) >= _RECENT_WRITES_MAX_SIZE:
+        for key, until in list(_recent_writes.items()):
+            if until > now and len(_recent_writes) < _RECENT_WRITES_MAX_SIZE:
+                break
+            del _recent_writes[key]
+    _recent_writes[client_key] = now + settings.READ_AFTER_WRITE_SECONDS
+
+
+def has_recent_write(client_key: Optional[str]) -> bool:
+    """Писал ли клиент в primary в пределах READ_AFTER_WRITE_SECONDS (в этом процессе)"""
+    if not client_key:
+        return False
+    until = _recent_writes.get(client_key)
+    if until is None:
+        return False
+    if until <= time.monotonic():
+        _recent_writes.pop(client_key, None)
+        return False
+    return True
+
+
+def has_fresh_write_marker(request: Request) -> bool:
+    """Прислал ли клиент X-Last-Write моложе READ_AFTER_WRITE_SECONDS"""
     try:
+        written_at = float(request.headers.get(LAST_WRITE_HEADER, ""))
+    except ValueError:
+        return False
+    now = time.time()
+    # Отметка из будущего (больше рассинхрона часов) не продлевает окно
+    return now - settings.READ_AFTER_WRITE_SECONDS < written_at <= now + 1
+
+
+@event.listens_for(Session, "after_commit")
+def _remember_client_write(session: Session) -> None:
+    """После commit в primary-сессии запроса включаем read-your-writes для клиента"""
+    client_key = session.info.get("client_key")
+    if client_key:
+        mark_recent_write(client_key)
+    written_at = session.info.get("request_write")
+    if written_at is not None:
+        written_at[:] = [time.time()]
+
+
+async def read_after_write_middleware(request: Request, call_next):
+    """HTTP middleware: после commit в primary отдаёт клиенту X-Last-Write"""
+    written_at: List[float] = []
+    _request_write.set(written_at)
+    response = await call_next(request)
+    if written_at:
+        response.headers[LAST_WRITE_HEADER] = f"{written_at[0]:.3f}"
+    return response
+
+
+async def get_db(request: Request):
+    """Dependency для получения сессии БД (primary, для записи)"""
+    async with AsyncSessionLocal() as db:
+        db.sync_session.info["client_key"] = get_client_key(request)
+        db.sync_session.info["request_write"] = _request_write.get()
         yield db
-    finally:
-        db.close()
 
+
+async def get_read_db(request: Request):
+    """
+    Dependency для read-only эндпоинтов
+
+    Возвращает сессию реплики, кроме случая, когда клиент недавно писал
+    в primary (X-Last-Write или отметка в этом процессе) - тогда читаем
+    с primary, чтобы он увидел свои изменения
+    """
+    if (
+        read_engine is engine
+        or has_fresh_write_marker(request)
+        or has_recent_write(get_client_key(request))
+    ):
+        session_factory = AsyncSessionLocal
+    else:
+        session_factory = AsyncReadSessionLocal
+    async with session_factory() as db:
+        yield db
@@ -0,0 +1,109 @@
+"""
+Таймер сроков: вызывает обработчик в момент наступления дедлайна
+
+Куча (deadline, key) и одна фоновая задача, которая спит до ближайшего
+срока. Хранит только сроки в пределах горизонта - дальние догружает
+периодический проход, поэтому куча остаётся маленькой. Обработчик сам
+перепроверяет условие в БД: устаревшие и повторные ключи безопасны.
+"""
+import asyncio
+import heapq
+import logging
+import time
+from datetime import datetime, timezone
+from typing import Awaitable, Callable, Dict, Hashable, Iterable, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+
+def _timestamp(deadline: datetime) -> float:
+    # Наивные даты в БД хранятся в UTC
+    if deadline.tzinfo is None:
+        deadline = deadline.replace(tzinfo=timezone.utc)
+    return deadline.timestamp()
+
+
+class DeadlineTimer:
+    """Куча сроков с фоновой задачей, срабатывающей по ближайшему"""
+
+    def __init__(self, name: str):
+        self.name = name
+        self.horizon: Optional[float] = None  # секунды; None - без ограничения
+        self.fired = 0
+        self._heap: List[Tuple[float, Hashable]] = []
+        self._scheduled: Dict[Hashable, float] = {}
+        self._callback: Optional[Callable[[List[Hashable]], Awaitable]] = None
+        self._wakeup: Optional[asyncio.Event] = None
+        self._task: Optional[asyncio.Task] = None
+
+    def add(self, key: Hashable, deadline: datetime) -> None:
+        """Запланировать срабатывание для key; дальше горизонта - не храним"""
+        if self._task is None:
+            return
+        at = _timestamp(deadline)
+        if self.horizon is not None and at > time.time() + self.horizon:
+            return
+        if self._scheduled.get(key) == at:
+            return
+        self._scheduled[key] = at
+        heapq.heappush(self._heap, (at, key))
+        if self._heap[0][1] == key:
+            self._wakeup.set()
+
+    def add_many(self, items: Iterable[Tuple[Hashable, datetime]]) -> None:
+        for key, deadline in items:
+            self.add(key, deadline)
+
+    def start(self, callback: Callable[[List[Hashable]], Awaitable], horizon: Optional[float] = None) -> None:
+        """Запустить фоновую задачу; callback получает ключи наступивших сроков"""
+        self._callback = callback
+        self.horizon = horizon
+        self._wakeup = asyncio.Event()
+        self._task = asyncio.create_task(self._run())
+
+    async def stop(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+        self._heap.clear()
+        self._scheduled.clear()
+
+    def _pop_due(self) -> List[Hashable]:
+        now = time.time()
+        due = []
+        while self._heap and self._heap[0][0] <= now:
+            at, key = heapq.heappop(self._heap)
+            # Ключ мог быть перепланирован на другой срок
+            if self._scheduled.get(key) == at:
+                del self._scheduled[key]
+                due.append(key)
+        return due
+
+    async def _run(self) -> None:
+        while True:
+            self._wakeup.clear()
+            due = self._pop_due()
+            if due:
+                self.fired += len(due)
+                try:
+                    await self._callback(due)
+                except Exception as e:
+                    logger.error(f"Ошибка обработчика таймера {self.name}: {e}", exc_info=True)
+                continue
+
+            delay = self._heap[0][0] - time.time() if self._heap else None
+            try:
+                await asyncio.wait_for(self._wakeup.wait(), timeout=delay)
+            except asyncio.TimeoutError:
+                pass
+
+    def stats(self) -> Dict:
+        return {"scheduled": len(self._scheduled), "fired": self.fired}
+
+
+# Сроки окончания активных кампаний (ключ - id кампании)
+campaign_deadlines = DeadlineTimer("campaign_deadlines")
@@ -0,0 +1,225 @@
+"""
+Метрики пула соединений и запросов к БД
+
+- пул: время ожидания checkout, занятые соединения, overflow
+- запрос: количество SQL-запросов и суммарное время в БД на HTTP-запрос
+  (отдаётся клиенту в заголовке Server-Timing и копится по эндпоинтам)
+- фоновые задачи: обработано, ошибок и длительность по каждому проходу
+"""
+import logging
+import time
+from contextvars import ContextVar
+from typing import Dict, Optional
+from fastapi import Request
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+from sqlalchemy.pool import AsyncAdaptedQueuePool
+from app.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+
+class RequestDBStats:
+    """Счётчики БД в рамках одного HTTP-запроса"""
+
+    __slots__ = ("queries", "db_time")
+
+    def __init__(self):
+        self.queries = 0
+        self.db_time = 0.0
+
+
+_request_stats: ContextVar[Optional[RequestDBStats]] = ContextVar("request_db_stats", default=None)
+
+
+class PoolMetrics:
+    """Агрегаты по checkout из пула"""
+
+    def __init__(self):
+        self.checkouts = 0
+        self.wait_total = 0.0
+        self.wait_max = 0.0
+
+    def observe_checkout(self, wait: float) -> None:
+        self.checkouts += 1
+        self.wait_total += wait
+        if wait > self.wait_max:
+            self.wait_max = wait
+
+
+class EndpointMetrics:
+    """Агрегаты запросов к БД по эндпоинту"""
+
+    def __init__(self):
+        self.requests = 0
+        self.queries_total = 0
+        self.queries_max = 0
+        self.db_time_total = 0.0
+
+    def observe(self, stats: RequestDBStats) -> None:
+        self.requests += 1
+        self.queries_total += stats.queries
+        self.db_time_total += stats.db_time
+        if stats.queries > self.queries_max:
+            self.queries_max = stats.queries
+
+
+class TaskMetrics:
+    """Агрегаты проходов фоновой задачи и последний проход"""
+
+    def __init__(self):
+        self.runs = 0
+        self.processed_total = 0
+        self.failures_total = 0
+        self.duration_total = 0.0
+        self.duration_max = 0.0
+        self.last: Dict = {}
+
+    def observe(self, processed: int, failures: int, duration: float) -> None:
+        self.runs += 1
+        self.processed_total += processed
+        self.failures_total += failures
+        self.duration_total += duration
+        if duration > self.duration_max:
+            self.duration_max = duration
+        self.last = {
+            "processed": processed,
+            "failures": failures,
+            "duration_ms": duration * 1000,
+            "finished_at": time.time(),
+        }
+
+
+_pool_metrics: Dict[str, PoolMetrics] = {}
+_endpoint_metrics: Dict[str, EndpointMetrics] = {}
+_task_metrics: Dict[str, TaskMetrics] = {}
+_instrumented_engines: Dict[str, Engine] = {}
+
+
+class InstrumentedAsyncQueuePool(AsyncAdaptedQueuePool):
+    """
+    Пул, замеряющий время ожидания свободного соединения
+
+    В SQLAlchemy нет события "перед checkout", поэтому ожидание
+    замеряется вокруг _do_get (выдача соединения из очереди пула)
+    """
+
+    metrics_name = "primary"
+
+    def _do_get(self):
+        started = time.perf_counter()
+        try:
+            return super()._do_get()
+        finally:
+            _pool_metrics.setdefault(self.metrics_name, PoolMetrics()).observe_checkout(
+                time.perf_counter() - started
+            )
+
+
+def make_instrumented_pool_class(name: str) -> type:
+    """Класс пула с отдельным именем в метриках (primary / replica)"""
+    return type(f"InstrumentedAsyncQueuePool_{name}", (InstrumentedAsyncQueuePool,), {"metrics_name": name})
+
+
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    # Время старта - на контексте выполнения: упавшее выражение не оставляет
+    # за собой записи, с которой сопоставилось бы следующее
+    if context is not None:
+        context._metrics_query_start = time.perf_counter()
+
+
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    started = getattr(context, "_metrics_query_start", None)
+    stats = _request_stats.get()
+    if stats is not None and started is not None:
+        stats.queries += 1
+        stats.db_time += time.perf_counter() - started
+
+
+def instrument_engine(sync_engine: Engine, name: str) -> None:
+    """Подключить счётчики запросов к движку (для AsyncEngine - engine.sync_engine)"""
+    if name in _instrumented_engines:
+        return
+    event.listen(sync_engine, "before_cursor_execute", _before_cursor_execute)
+    event.listen(sync_engine, "after_cursor_execute", _after_cursor_execute)
+    _instrumented_engines[name] = sync_engine
+
+
+def start_request_stats() -> RequestDBStats:
+    """Начать подсчёт запросов к БД для текущего контекста"""
+    stats = RequestDBStats()
+    _request_stats.set(stats)
+    return stats
+
+
+async def db_metrics_middleware(request: Request, call_next):
+    """HTTP middleware: Server-Timing с количеством запросов и временем в БД"""
+    stats = start_request_stats()
+    response = await call_next(request)
+
+    response.headers["Server-Timing"] = (
+        f'db;dur={stats.db_time * 1000:.1f};desc="{stats.queries} queries"'
+    )
+
+    route = request.scope.get("route")
+    endpoint = f"{request.method} {route.path if route else request.url.path}"
+    if route is not None:
+        _endpoint_metrics.setdefault(endpoint, EndpointMetrics()).observe(stats)
+
+        if settings.ENVIRONMENT != "production":
+            from app.core.query_budget import get_endpoint_budget
+            budget = get_endpoint_budget(endpoint)
+            if budget is not None and stats.queries > budget:
+                logger.warning(f"⚠️ {endpoint}: {stats.queries} SQL-запросов при бюджете {budget}")
+    return response
+
+
+def get_db_metrics() -> Dict:
+    """Снимок метрик пула и эндпоинтов"""
+    pools = {}
+    for name, sync_engine in _instrumented_engines.items():
+        pool = sync_engine.pool
+        pool_metrics = _pool_metrics.get(name, PoolMetrics())
+        pools[name] = {
+            "size": pool.size() if hasattr(pool, "size") else None,
+            "checked_out": pool.checkedout() if hasattr(pool, "checkedout") else None,
+            "overflow": max(pool.overflow(), 0) if hasattr(pool, "overflow") else None,
+            "checkouts": pool_metrics.checkouts,
+            "checkout_wait_avg_ms": (
+                pool_metrics.wait_total / pool_metrics.checkouts * 1000
+                if pool_metrics.checkouts else 0.0
+            ),
+            "checkout_wait_max_ms": pool_metrics.wait_max * 1000,
+        }
+
+    endpoints = {
+        endpoint: {
+            "requests": m.requests,
+            "queries_avg": m.queries_total / m.requests,
+            "queries_max": m.queries_max,
+            "db_time_avg_ms": m.db_time_total / m.requests * 1000,
+        }
+        for endpoint, m in sorted(_endpoint_metrics.items())
+    }
+
+    return {"pools": pools, "endpoints": endpoints}
+
+
+def observe_task_run(name: str, processed: int, failures: int, duration: float) -> None:
+    """Записать проход фоновой задачи"""
+    _task_metrics.setdefault(name, TaskMetrics()).observe(processed, failures, duration)
+
+
+def get_task_metrics() -> Dict:
+    """Снимок метрик фоновых задач"""
+    return {
+        name: {
+            "runs": m.runs,
+            "processed_total": m.processed_total,
+            "failures_total": m.failures_total,
+            "duration_avg_ms": m.duration_total / m.runs * 1000,
+            "duration_max_ms": m.duration_max * 1000,
+            "last": m.last,
+        }
+        for name, m in sorted(_task_metrics.items())
+    }
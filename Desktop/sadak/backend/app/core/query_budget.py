@@ -0,0 +1,103 @@
+"""
+Бюджеты количества SQL-запросов
+
+Ловит N+1 и лишние round-trip'ы: блок кода или эндпоинт не должен
+выполнять больше заявленного числа запросов.
+
+Использование в тестах (pytest, фикстура query_budget из tests/conftest.py):
+
+    async def test_campaigns_listing(client, query_budget):
+        with query_budget("GET /api/v1/campaigns"):
+            await client.get("/api/v1/campaigns")
+
+    async def test_expiry_task_is_constant(query_budget):
+        with query_budget(EXPIRY_TASK_QUERY_BUDGET):
+            await check_expired_campaigns_task()
+
+Каждый бюджет покрыт тестом в tests/test_query_budgets.py.
+
+Вне тестов бюджеты эндпоинтов проверяет db_metrics_middleware: в
+не-production окружении превышение пишется в лог предупреждением.
+"""
+from contextlib import contextmanager
+from typing import Iterator, List, Optional
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+
+# Максимум запросов на эндпоинт (ключ - "МЕТОД шаблон пути")
+QUERY_BUDGETS = {
+    "GET /api/v1/campaigns": 1,
+    "GET /api/v1/campaigns/{campaign_id}/report": 2,
+    # INSERT и UPDATE ... RETURNING; с initData - ещё upsert пользователя при промахе кэша
+    "POST /api/v1/donations/init": 3,
+}
+
+# Задача завершения истекших кампаний при числе кампаний до
+# CAMPAIGN_EXPIRY_BATCH_SIZE: UPDATE ... RETURNING, пересчёт отчётов,
+# организаторы одним запросом, сроки для таймера. Каждая следующая пачка
+# добавляет три запроса, но не запрос на кампанию
+EXPIRY_TASK_QUERY_BUDGET = 4
+
+
+class QueryBudgetExceeded(AssertionError):
+    """Блок кода выполнил больше запросов, чем позволяет бюджет"""
+
+
+class QueryCounter:
+    """Список выполненных SQL-выражений"""
+
+    def __init__(self):
+        self.statements: List[str] = []
+
+    @property
+    def count(self) -> int:
+        return len(self.statements)
+
+
+def _default_engines() -> List[Engine]:
+    from app.core.database import engine, read_engine
+    engines = [engine.sync_engine]
+    if read_engine is not engine:
+        engines.append(read_engine.sync_engine)
+    return engines
+
+
+@contextmanager
+def count_queries(*engines) -> Iterator[QueryCounter]:
+    """
+    Считать запросы, выполненные внутри блока
+
+    Args:
+        engines: Engine или AsyncEngine; по умолчанию primary и реплика
+    """
+    counter = QueryCounter()
+    targets = [getattr(e, "sync_engine", e) for e in engines] or _default_engines()
+
+    def _on_execute(conn, cursor, statement, parameters, context, executemany):
+        counter.statements.append(statement)
+
+    for target in targets:
+        event.listen(target, "before_cursor_execute", _on_execute)
+    try:
+        yield counter
+    finally:
+        for target in targets:
+            event.remove(target, "before_cursor_execute", _on_execute)
+
+
+@contextmanager
+def assert_max_queries(budget: int, *engines) -> Iterator[QueryCounter]:
+    """Упасть с QueryBudgetExceeded, если блок выполнил больше `budget` запросов"""
+    with count_queries(*engines) as counter:
+        yield counter
+    if counter.count > budget:
+        statements = "\n".join(f"  {i}. {s}" for i, s in enumerate(counter.statements, 1))
+        raise QueryBudgetExceeded(
+            f"Query budget exceeded: {counter.count} > {budget}\n{statements}"
+        )
+
+
+def get_endpoint_budget(endpoint: str) -> Optional[int]:
+    """Бюджет эндпоинта или None, если он не задан"""
+    return QUERY_BUDGETS.get(endpoint)
@@ -0,0 +1,117 @@
+"""
+Сессионные токены (JWT)
+
+Клиент один раз обменивает Telegram initData на токен (POST /api/v1/auth/token)
+и дальше передаёт его в заголовке Authorization: Bearer <token>.
+Токен подписан SECRET_KEY и содержит внутренний id пользователя, поэтому
+его проверка не требует ни разбора initData, ни запроса к БД. С ключом
+по умолчанию токены работают только в development и test.
+
+Здесь же зависимости авторизации для роутеров: get_current_user,
+get_optional_user и get_admin_user.
+"""
+from datetime import datetime, timedelta
+from typing import NamedTuple, Optional
+from fastapi import Depends, Header, HTTPException
+from jose import JWTError, jwt
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.core.config import settings
+from app.core.database import get_db
+
+
+class TokenUser(NamedTuple):
+    """Пользователь, восстановленный из токена"""
+    id: int
+    tg_id: int
+
+
+def create_access_token(user_id: int, tg_id: int) -> str:
+    """
+    Выпустить токен на ACCESS_TOKEN_EXPIRE_MINUTES минут
+
+    Raises:
+        RuntimeError: SECRET_KEY не задан (см. Settings.secret_key_configured)
+    """
+    if not settings.secret_key_configured:
+        raise RuntimeError("SECRET_KEY is not configured")
+    expire = datetime.utcnow() + timedelta(minutes=settings.ACCESS_TOKEN_EXPIRE_MINUTES)
+    payload = {
+        "sub": str(user_id),
+        "tg_id": tg_id,
+        "exp": expire,
+    }
+    return jwt.encode(payload, settings.SECRET_KEY, algorithm=settings.ALGORITHM)
+
+
+def decode_access_token(token: str) -> Optional[TokenUser]:
+    """Проверить подпись и срок токена; None если токен невалиден или SECRET_KEY не задан"""
+    if not settings.secret_key_configured:
+        return None
+    try:
+        payload = jwt.decode(token, settings.SECRET_KEY, algorithms=[settings.ALGORITHM])
+        return TokenUser(id=int(payload["sub"]), tg_id=int(payload["tg_id"]))
+    except (JWTError, KeyError, TypeError, ValueError):
+        return None
+
+
+def get_user_from_authorization(authorization: Optional[str]) -> Optional[TokenUser]:
+    """Пользователь из заголовка Authorization: Bearer <token>"""
+    if not authorization or not authorization.startswith("Bearer "):
+        return None
+    return decode_access_token(authorization[len("Bearer "):])
+
+
+async def get_optional_user(
+    x_telegram_init_data: Optional[str] = Header(None, alias="X-Telegram-Init-Data"),
+    authorization: Optional[str] = Header(None),
+    db: AsyncSession = Depends(get_db)
+):
+    """
+    Пользователь из сессионного токена или Telegram initData; None без авторизации
+
+    Приоритет у токена: он проверяется без разбора initData и запроса к БД.
+    Неверный токен или initData - 401, а не анонимный доступ.
+    """
+    from app.core.telegram import get_user_from_init_data
+    from app.services import donation_service
+    
+    if authorization:
+        token_user = get_user_from_authorization(authorization)
+        if not token_user:
+            raise HTTPException(status_code=401, detail="Invalid or expired token")
+        return token_user
+    
+    if not x_telegram_init_data:
+        return None
+    
+    user_data = get_user_from_init_data(x_telegram_init_data)
+    if not user_data:
+        raise HTTPException(status_code=401, detail="Invalid Telegram initData")
+    
+    return await donation_service.get_or_create_user(
+        db=db,
+        tg_id=user_data.get("id"),
+        first_name=user_data.get("first_name"),
+        last_name=user_data.get("last_name"),
+        username=user_data.get("username")
+    )
+
+
+async def get_current_user(user = Depends(get_optional_user)):
+    """Текущий пользователь (TokenUser или UserIdentity: id, tg_id); без авторизации - 401"""
+    if user is None:
+        raise HTTPException(status_code=401, detail="Telegram initData required")
+    return user
+
+
+def is_admin(tg_id: int) -> bool:
+    """Есть ли tg_id в ADMIN_TELEGRAM_IDS; если список не настроен - да (для разработки)"""
+    admin_ids = [int(id.strip()) for id in settings.ADMIN_TELEGRAM_IDS.split(",") if id.strip()]
+    return not admin_ids or tg_id in admin_ids
+
+
+async def get_admin_user(user = Depends(get_current_user)):
+    """Текущий пользователь с проверкой прав администратора"""
+    if not is_admin(user.tg_id):
+        raise HTTPException(status_code=403, detail="Access denied. Admin rights required.")
+    return user
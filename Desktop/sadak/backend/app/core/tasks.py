@@ -1,50 +1,224 @@
 """
 Фоновые задачи для периодического выполнения
 """
-from app.core.database import SessionLocal
+from app.core.database import AsyncSessionLocal
+from app.core.metrics import observe_task_run
 from app.services import campaign_service
-from datetime import datetime
+from datetime import datetime, timedelta, timezone
+import asyncio
 import logging
+import time
 
 logger = logging.getLogger(__name__)
 
 
+async def _notify_expired(db, expired) -> int:
+    """
+    Уведомить организаторов о завершении кампаний по сроку
+    
+    Организаторы загружаются одним запросом на пачку из
+    CAMPAIGN_EXPIRY_BATCH_SIZE кампаний, сообщения пачки уходят параллельно,
+    не больше CAMPAIGN_EXPIRY_NOTIFY_CONCURRENCY одновременно, через общий
+    httpx-клиент.
+    
+    Returns:
+        Количество неотправленных уведомлений
+    """
+    import httpx
+    from sqlalchemy import select
+    from app.core.config import settings
+    from app.models import Campaign, User
+    from app.services import notification_service
+    
+    semaphore = asyncio.Semaphore(settings.CAMPAIGN_EXPIRY_NOTIFY_CONCURRENCY)
+    batch_size = settings.CAMPAIGN_EXPIRY_BATCH_SIZE
+    failures = 0
+    
+    async def send(client, campaign, owner_tg_id) -> bool:
+        async with semaphore:
+            try:
+                return await notification_service.notify_campaign_expired(
+                    owner_tg_id=int(owner_tg_id),
+                    campaign_title=campaign.title,
+                    total_collected=float(campaign.collected_amount),
+                    goal_amount=float(campaign.goal_amount),
+                    participants_count=int(campaign.participants_count),
+                    currency=campaign.currency or "RUB",
+                    client=client
+                )
+            except Exception as e:
+                logger.warning(f"Не удалось отправить уведомление организатору кампании {campaign.id}: {e}")
+                return False
+    
+    async with httpx.AsyncClient(timeout=10.0) as client:
+        for start in range(0, len(expired), batch_size):
+            batch = expired[start:start + batch_size]
+            try:
+                owners = dict((await db.execute(
+                    select(Campaign.id, User.tg_id)
+                    .join(User, User.id == Campaign.owner_id)
+                    .where(Campaign.id.in_([campaign.id for campaign in batch]), User.tg_id.isnot(None))
+                )).all())
+            except Exception as e:
+                logger.warning(f"Не удалось загрузить организаторов завершённых кампаний: {e}")
+                failures += len(batch)
+                continue
+            
+            results = await asyncio.gather(*(
+                send(client, campaign, owners[campaign.id])
+                for campaign in batch if campaign.id in owners
+            ))
+            failures += results.count(False)
+    return failures
+
+
+async def _expire_and_notify(name: str, db, campaign_ids=None):
+    """Завершить кампании, уведомить организаторов и записать метрики прохода"""
+    started = time.perf_counter()
+    expired = []
+    failures = 0
+    try:
+        expired = await campaign_service.expire_campaigns(db=db, campaign_ids=campaign_ids)
+        if expired:
+            failures = await _notify_expired(db, expired)
+        return expired
+    except Exception:
+        failures += 1
+        raise
+    finally:
+        duration = time.perf_counter() - started
+        observe_task_run(name, processed=len(expired), failures=failures, duration=duration)
+        if expired or failures:
+            logger.info(
+                f"⏰ {name}: завершено {len(expired)} кампаний за {duration * 1000:.0f} мс, "
+                f"ошибок {failures}: {[c.id for c in expired]}"
+            )
+
+
 async def check_expired_campaigns_task():
     """
     Задача для проверки и завершения истекших кампаний
-    Вызывается периодически (через APScheduler)
+    Вызывается периодически (через APScheduler), раз в CAMPAIGN_EXPIRY_SCAN_MINUTES
+    
+    Завершает всё, что пропустил таймер (простой, рестарт), и загружает в
+    таймер сроки кампаний, истекающих до следующего прохода.
     """
-    from app.models import User
+    from app.core.config import settings
+    from app.core.deadlines import campaign_deadlines
     
-    db = SessionLocal()
+    db = AsyncSessionLocal()
     try:
-        expired = campaign_service.check_and_expire_campaigns(db=db)
-        if expired:
-            logger.info(f"⏰ Завершено {len(expired)} истекших кампаний: {[c.id for c in expired]}")
-            
-            # Отправляем уведомления организаторам
-            from app.services import notification_service
-            
-            for campaign in expired:
-                try:
-                    owner = db.query(User).filter(User.id == campaign.owner_id).first()
-                    if owner and owner.tg_id:
-                        await notification_service.notify_campaign_expired(
-                            owner_tg_id=int(owner.tg_id),
-                            campaign_title=campaign.title,
-                            total_collected=float(campaign.collected_amount),
-                            goal_amount=float(campaign.goal_amount),
-                            participants_count=int(campaign.participants_count),
-                            currency=campaign.currency or "RUB"
-                        )
-                except Exception as e:
-                    logger.warning(f"Не удалось отправить уведомление организатору кампании {campaign.id}: {e}")
-        else:
+        expired = await _expire_and_notify("check_expired_campaigns", db)
+        if not expired:
             logger.debug("Проверка кампаний: истекших не найдено")
+        
+        # С запасом в 5 минут: сроки на стыке проходов не теряются
+        until = datetime.now(timezone.utc) + timedelta(minutes=settings.CAMPAIGN_EXPIRY_SCAN_MINUTES + 5)
+        campaign_deadlines.add_many(await campaign_service.get_upcoming_deadlines(db=db, until=until))
         return expired
     except Exception as e:
         logger.error(f"❌ Ошибка при проверке истекших кампаний: {e}", exc_info=True)
         return []
     finally:
-        db.close()
+        await db.close()
+
 
+async def expire_due_campaigns_task(campaign_ids):
+    """
+    Завершение кампаний в момент наступления end_date
+    Вызывается таймером campaign_deadlines
+    """
+    from app.core.deadlines import campaign_deadlines
+    
+    db = AsyncSessionLocal()
+    try:
+        expired = await _expire_and_notify("expire_due_campaigns", db, campaign_ids=list(campaign_ids))
+        
+        # Ещё активные: строка была заблокирована (SKIP LOCKED) или часы БД
+        # отстают - повторяем через несколько секунд
+        expired_ids = {campaign.id for campaign in expired}
+        remaining = [campaign_id for campaign_id in campaign_ids if campaign_id not in expired_ids]
+        if remaining:
+            retry_at = datetime.now(timezone.utc) + timedelta(seconds=5)
+            for campaign_id, end_date in await campaign_service.get_upcoming_deadlines(
+                db=db, campaign_ids=remaining
+            ):
+                if end_date.tzinfo is None:
+                    end_date = end_date.replace(tzinfo=timezone.utc)
+                campaign_deadlines.add(campaign_id, max(end_date, retry_at))
+        return expired
+    finally:
+        await db.close()
+
+
+async def flush_campaign_counters_task():
+    """
+    Перенос шардированных счётчиков кампаний в campaigns
+    Вызывается каждые CAMPAIGN_COUNTER_FLUSH_SECONDS, если CAMPAIGN_COUNTER_SHARDS > 0
+    """
+    db = AsyncSessionLocal()
+    try:
+        flushed = await campaign_service.flush_campaign_counters(db=db)
+        if flushed:
+            logger.debug(f"Счётчики перенесены для кампаний: {[c.id for c in flushed]}")
+        return flushed
+    except Exception as e:
+        logger.error(f"❌ Ошибка при переносе счётчиков кампаний: {e}", exc_info=True)
+        return []
+    finally:
+        await db.close()
+
+
+async def rebuild_autocomplete_task():
+    """
+    Полная пересборка индекса автодополнения
+    Вызывается при старте и каждые AUTOCOMPLETE_REBUILD_MINUTES
+    """
+    from app.services import autocomplete_service
+    
+    db = AsyncSessionLocal()
+    try:
+        size = await autocomplete_service.rebuild_autocomplete_index(db=db)
+        logger.debug(f"Индекс автодополнения пересобран: {size} записей")
+        return size
+    except Exception as e:
+        logger.error(f"❌ Ошибка при пересборке индекса автодополнения: {e}", exc_info=True)
+        return 0
+    finally:
+        await db.close()
+
+
+async def refresh_urgent_campaigns_task():
+    """
+    Перечитать ленту срочных кампаний
+    Вызывается при старте и каждые URGENT_CAMPAIGNS_REFRESH_SECONDS
+    """
+    from app.services import urgency_service
+    
+    db = AsyncSessionLocal()
+    try:
+        return await urgency_service.refresh_urgent_campaigns(db=db)
+    except Exception as e:
+        logger.error(f"❌ Ошибка при обновлении ленты срочных кампаний: {e}", exc_info=True)
+        return 0
+    finally:
+        await db.close()
+
+
+async def rebuild_facets_task():
+    """
+    Полное перечитывание счётчиков панели фильтров
+    Вызывается при старте и каждые FACETS_REBUILD_MINUTES
+    """
+    from app.services import facets_service
+    
+    db = AsyncSessionLocal()
+    try:
+        size = await facets_service.rebuild_facets(db=db)
+        logger.debug(f"Счётчики фильтров перечитаны: {size} записей")
+        return size
+    except Exception as e:
+        logger.error(f"❌ Ошибка при перечитывании счётчиков фильтров: {e}", exc_info=True)
+        return 0
+    finally:
+        await db.close()
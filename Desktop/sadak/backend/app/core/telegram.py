@@ -4,77 +4,121 @@
 import hmac
 import hashlib
 import json
+import time
+from collections import OrderedDict
+from functools import lru_cache
 from urllib.parse import parse_qsl
-from typing import Optional, Dict
+from typing import Optional, Dict, Tuple
 from app.core.config import settings
 
 
-def validate_telegram_init_data(init_data: str) -> Optional[Dict]:
-    """
-    Валидация initData от Telegram WebApp
-    
-    Args:
-        init_data: Строка initData от Telegram
-        
-    Returns:
-        Dict с данными пользователя или None если невалидно
-    """
+# Кэш уже проверенных initData: строка initData -> (срок годности, результат).
+# Mini App шлёт одну и ту же initData на каждый запрос сессии, поэтому
+# повторные запросы обходятся без HMAC и разбора JSON
+_verified_cache: "OrderedDict[str, Tuple[float, Dict]]" = OrderedDict()
+
+
+@lru_cache(maxsize=4)
+def _get_secret_key(telegram_secret_key: str) -> bytes:
+    """Секрет для HMAC initData (вычисляется один раз на значение ключа)"""
+    return hmac.new(
+        b"WebAppData",
+        telegram_secret_key.encode(),
+        hashlib.sha256
+    ).digest()
+
+
+def _get_cached(init_data: str) -> Optional[Dict]:
+    entry = _verified_cache.get(init_data)
+    if entry is None:
+        return None
+    expires_at, validated = entry
+    if expires_at <= time.time():
+        _verified_cache.pop(init_data, None)
+        return None
+    _verified_cache.move_to_end(init_data)
+    return validated
+
+
+def _put_cached(init_data: str, validated: Dict) -> None:
     try:
-        # Если SECRET_KEY не настроен, пропускаем валидацию (для разработки)
-        if not settings.TELEGRAM_SECRET_KEY:
-            # В режиме разработки просто парсим данные без валидации
-            parsed_data = dict(parse_qsl(init_data))
-            if 'user' in parsed_data:
-                user_data = json.loads(parsed_data['user'])
-                return {
-                    'user': user_data,
-                    'auth_date': parsed_data.get('auth_date'),
-                    'query_id': parsed_data.get('query_id'),
-                }
-            return None
-        
-        # Парсинг параметров
-        parsed_data = dict(parse_qsl(init_data))
-        
+        auth_date = int(validated.get('auth_date') or 0)
+    except (TypeError, ValueError):
+        auth_date = 0
+    # Запись живёт до auth_date + TTL; без auth_date - TTL от текущего момента
+    expires_at = (auth_date or time.time()) + settings.TELEGRAM_INIT_DATA_CACHE_TTL
+    if expires_at <= time.time():
+        return
+    _verified_cache[init_data] = (expires_at, validated)
+    _verified_cache.move_to_end(init_data)
+    while len(_verified_cache) > settings.TELEGRAM_INIT_DATA_CACHE_SIZE:
+        _verified_cache.popitem(last=False)
+
+
+def _validate(init_data: str) -> Optional[Dict]:
+    """Разбор и проверка подписи initData (без кэша)"""
+    # Парсинг параметров
+    parsed_data = dict(parse_qsl(init_data))
+
+    # Если SECRET_KEY не настроен, пропускаем валидацию (для разработки)
+    if settings.TELEGRAM_SECRET_KEY:
         # Извлечение hash и остальных данных
         received_hash = parsed_data.pop('hash', None)
         if not received_hash:
             return None
-        
+
         # Создание строки для проверки
         data_check_string = '\n'.join(
             f"{k}={v}" for k, v in sorted(parsed_data.items())
         )
-        
-        # Генерация секретного ключа
-        secret_key = hmac.new(
-            b"WebAppData",
-            settings.TELEGRAM_SECRET_KEY.encode(),
-            hashlib.sha256
-        ).digest()
-        
+
         # Вычисление hash
         calculated_hash = hmac.new(
-            secret_key,
+            _get_secret_key(settings.TELEGRAM_SECRET_KEY),
             data_check_string.encode(),
             hashlib.sha256
         ).hexdigest()
-        
+
         # Проверка
-        if calculated_hash != received_hash:
+        if not hmac.compare_digest(calculated_hash, received_hash):
             return None
-        
-        # Парсинг user данных
-        if 'user' in parsed_data:
-            user_data = json.loads(parsed_data['user'])
-            return {
-                'user': user_data,
-                'auth_date': parsed_data.get('auth_date'),
-                'query_id': parsed_data.get('query_id'),
-            }
-        
-        return None
-        
+
+    # Парсинг user данных
+    if 'user' in parsed_data:
+        user_data = json.loads(parsed_data['user'])
+        return {
+            'user': user_data,
+            'auth_date': parsed_data.get('auth_date'),
+            'query_id': parsed_data.get('query_id'),
+        }
+
+    return None
+
+
+def validate_telegram_init_data(init_data: str) -> Optional[Dict]:
+    """
+    Валидация initData от Telegram WebApp
+
+    Успешно проверенные строки кэшируются (LRU, TELEGRAM_INIT_DATA_CACHE_SIZE
+    записей, срок - auth_date + TELEGRAM_INIT_DATA_CACHE_TTL).
+    Результат из кэша общий - не изменяйте его.
+
+    Args:
+        init_data: Строка initData от Telegram
+
+    Returns:
+        Dict с данными пользователя или None если невалидно
+    """
+    try:
+        cached = _get_cached(init_data)
+        if cached is not None:
+            return cached
+
+        validated = _validate(init_data)
+        if validated is not None:
+            _put_cached(init_data, validated)
+        return validated
+
     except Exception:
         return None
 
@@ -85,4 +129,3 @@ def get_user_from_init_data(init_data: str) -> Optional[Dict]:
     if validated:
         return validated.get('user')
     return None
-
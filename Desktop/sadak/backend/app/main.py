@@ -1,10 +1,11 @@
 """
 Главный файл приложения FastAPI для Садака-Пасс
 """
-from fastapi import FastAPI
+from fastapi import Depends, FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 from app.core.config import settings
 from app.api.v1 import api_router
+from app.core.security import get_admin_user
 import logging
 import os
 
@@ -36,10 +37,13 @@ if os.getenv("FRONTEND_URL"):
     allowed_origins.append(os.getenv("FRONTEND_URL"))
 
 # Валидация критичных настроек для продакшена
+# С публичным SECRET_KEY любой может подписать токен администратора - не стартуем
+if not settings.secret_key_configured:
+    raise RuntimeError(
+        f"SECRET_KEY не задан для ENVIRONMENT={settings.ENVIRONMENT}! Используйте случайную строку"
+    )
+
 if settings.ENVIRONMENT == "production":
-    if settings.SECRET_KEY == "your-secret-key-change-in-production":
-        logger.warning("⚠️ SECRET_KEY не изменен! Используйте случайную строку в продакшене!")
-    
     if not settings.DATABASE_URL or "localhost" in settings.DATABASE_URL:
         logger.warning("⚠️ DATABASE_URL указывает на localhost! Проверьте настройки БД!")
     
@@ -52,8 +56,17 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=["X-Last-Write"],
 )
 
+# Метрики БД: Server-Timing (количество запросов и время в БД) на каждый ответ
+from app.core.metrics import db_metrics_middleware
+app.middleware("http")(db_metrics_middleware)
+
+# Read-your-writes между воркерами: X-Last-Write после commit в primary
+from app.core.database import read_after_write_middleware
+app.middleware("http")(read_after_write_middleware)
+
 # Подключение роутеров
 app.include_router(api_router, prefix="/api/v1")
 
@@ -64,23 +77,85 @@ async def startup_event():
     if settings.ENVIRONMENT == "production":
         logger.info("✅ Продакшен режим активен")
     
+    # Пулы соединений с платёжными системами
+    from app.services.payment import payment_service
+    payment_service.open()
+    
     # Настройка периодических задач
     from apscheduler.schedulers.asyncio import AsyncIOScheduler
     from app.core.tasks import check_expired_campaigns_task
     
     scheduler = AsyncIOScheduler()
     
-    # Проверка истечённых кампаний каждый час
+    # Завершение кампаний точно по end_date: таймер по ближайшему сроку
+    from app.core.deadlines import campaign_deadlines
+    from app.core.tasks import expire_due_campaigns_task
+    campaign_deadlines.start(
+        expire_due_campaigns_task,
+        horizon=(settings.CAMPAIGN_EXPIRY_SCAN_MINUTES + 5) * 60
+    )
+    
+    # Полная проверка истечённых кампаний и загрузка сроков в таймер
     scheduler.add_job(
         check_expired_campaigns_task,
         'interval',
-        hours=1,
+        minutes=settings.CAMPAIGN_EXPIRY_SCAN_MINUTES,
         id='check_expired_campaigns',
-        replace_existing=True
+        replace_existing=True,
+        max_instances=1
+    )
+    
+    # Перенос шардированных счётчиков кампаний (write-behind)
+    if settings.CAMPAIGN_COUNTER_SHARDS > 0:
+        from app.core.tasks import flush_campaign_counters_task
+        scheduler.add_job(
+            flush_campaign_counters_task,
+            'interval',
+            seconds=settings.CAMPAIGN_COUNTER_FLUSH_SECONDS,
+            id='flush_campaign_counters',
+            replace_existing=True,
+            max_instances=1
+        )
+    
+    # Пересборка индекса автодополнения (фонды и изменения из других воркеров)
+    from app.core.tasks import rebuild_autocomplete_task
+    scheduler.add_job(
+        rebuild_autocomplete_task,
+        'interval',
+        minutes=settings.AUTOCOMPLETE_REBUILD_MINUTES,
+        id='rebuild_autocomplete',
+        replace_existing=True,
+        max_instances=1
+    )
+    
+    # Лента срочных кампаний для карусели
+    from app.core.tasks import refresh_urgent_campaigns_task
+    scheduler.add_job(
+        refresh_urgent_campaigns_task,
+        'interval',
+        seconds=settings.URGENT_CAMPAIGNS_REFRESH_SECONDS,
+        id='refresh_urgent_campaigns',
+        replace_existing=True,
+        max_instances=1
+    )
+    
+    # Счётчики панели фильтров (изменения из других воркеров и в обход сервисов)
+    from app.core.tasks import rebuild_facets_task
+    scheduler.add_job(
+        rebuild_facets_task,
+        'interval',
+        minutes=settings.FACETS_REBUILD_MINUTES,
+        id='rebuild_facets',
+        replace_existing=True,
+        max_instances=1
     )
     
     scheduler.start()
-    logger.info("✅ Планировщик задач запущен (проверка истекших кампаний каждый час)")
+    logger.info("✅ Планировщик задач запущен (кампании завершаются по таймеру end_date)")
+    
+    await rebuild_autocomplete_task()
+    await refresh_urgent_campaigns_task()
+    await rebuild_facets_task()
     
     # Запускаем проверку сразу при старте
     try:
@@ -93,6 +168,20 @@ async def startup_event():
 @app.on_event("shutdown")
 async def shutdown_event():
     logger.info("🛑 Выключение Садака-Пасс API")
+    
+    from app.core.deadlines import campaign_deadlines
+    await campaign_deadlines.stop()
+    
+    from app.services.search import search_backend
+    await search_backend.aclose()
+    
+    from app.services.payment import payment_service
+    await payment_service.aclose()
+    
+    from app.core.database import engine, read_engine
+    await engine.dispose()
+    if read_engine is not engine:
+        await read_engine.dispose()
 
 
 @app.get("/")
@@ -112,8 +201,8 @@ async def health_check():
     
     try:
         # Проверка подключения к БД
-        with engine.connect() as conn:
-            conn.execute(text("SELECT 1"))
+        async with engine.connect() as conn:
+            await conn.execute(text("SELECT 1"))
         db_status = "ok"
     except Exception as e:
         logger.error(f"Database health check failed: {e}")
@@ -125,3 +214,24 @@ async def health_check():
         "environment": settings.ENVIRONMENT
     }
 
+
+@app.get("/metrics/db", dependencies=[Depends(get_admin_user)])
+async def db_metrics():
+    """Метрики пула соединений и количества запросов к БД по эндпоинтам"""
+    from app.core.metrics import get_db_metrics
+    return get_db_metrics()
+
+
+@app.get("/metrics/cache", dependencies=[Depends(get_admin_user)])
+async def cache_metrics():
+    """Размер, попадания и промахи кэшей процесса"""
+    from app.core.cache import get_cache_metrics
+    return get_cache_metrics()
+
+
+@app.get("/metrics/tasks", dependencies=[Depends(get_admin_user)])
+async def task_metrics():
+    """Проходы фоновых задач (обработано, ошибок, длительность) и таймер сроков кампаний"""
+    from app.core.deadlines import campaign_deadlines
+    from app.core.metrics import get_task_metrics
+    return {"tasks": get_task_metrics(), "campaign_deadlines": campaign_deadlines.stats()}
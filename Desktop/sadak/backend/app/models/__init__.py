@@ -3,6 +3,8 @@ from .fund import Fund
 from .donation import Donation
 from .subscription import Subscription
 from .campaign import Campaign
+from .campaign_counter import CampaignCounterShard
+from .campaign_report import CampaignReport
 from .zakat import ZakatCalc
 from .report import Report
 from .partner_application import PartnerApplication
@@ -13,6 +15,8 @@ __all__ = [
     "Donation",
     "Subscription",
     "Campaign",
+    "CampaignCounterShard",
+    "CampaignReport",
     "ZakatCalc",
     "Report",
     "PartnerApplication",
@@ -1,8 +1,9 @@
 """
 Модель целевой кампании
 """
-from sqlalchemy import Column, BigInteger, String, Numeric, DateTime, ForeignKey, Boolean, Text, Enum, func
-from sqlalchemy.orm import relationship
+from sqlalchemy import Column, BigInteger, String, Numeric, Float, DateTime, ForeignKey, Boolean, Text, Enum, Index, Computed, FetchedValue, func
+from sqlalchemy.dialects.postgresql import TSVECTOR
+from sqlalchemy.orm import relationship, deferred
 import enum
 from app.core.database import Base
 
@@ -19,6 +20,26 @@ class CampaignStatus(str, enum.Enum):
 
 class Campaign(Base):
     __tablename__ = "campaigns"
+    __table_args__ = (
+        # Листинг по статусу с сортировкой по дате
+        Index("ix_campaigns_status_created", "status", "created_at"),
+        # Листинг с фильтром по стране: по индексу на каждую сортировку
+        Index("ix_campaigns_status_country_created", "status", "effective_country_code", "created_at", "id"),
+        Index("ix_campaigns_status_country_end_date", "status", "effective_country_code", "end_date", "id"),
+        Index("ix_campaigns_status_country_participants", "status", "effective_country_code", "participants_count", "id"),
+        Index("ix_campaigns_status_country_progress", "status", "effective_country_code", "progress", "id"),
+        Index("ix_campaigns_status_country_trending", "status", "effective_country_code", "trending_score", "id"),
+        # Keyset-пагинация листинга с sort=popularity
+        Index("ix_campaigns_status_participants", "status", "participants_count", "id"),
+        # Keyset-пагинация листинга с sort=progress
+        Index("ix_campaigns_status_progress", "status", "progress", "id"),
+        # Keyset-пагинация листинга с sort=trending
+        Index("ix_campaigns_status_trending", "status", "trending_score", "id"),
+        # Полнотекстовый поиск
+        Index("ix_campaigns_search", "search_vector", postgresql_using="gin"),
+        # Поиск истекших кампаний (check_and_expire_campaigns)
+        Index("ix_campaigns_status_end_date", "status", "end_date"),
+    )
 
     id = Column(BigInteger, primary_key=True, index=True)
     owner_id = Column(BigInteger, ForeignKey("users.id"), nullable=False)
@@ -30,10 +51,24 @@ class Campaign(Base):
     
     goal_amount = Column(Numeric(10, 2), nullable=False)
     collected_amount = Column(Numeric(10, 2), default=0)
+    # Прогресс сбора (доля от цели) - вычисляется БД при каждом изменении сумм
+    progress = Column(
+        Float,
+        Computed(
+            "CASE WHEN goal_amount > 0 "
+            "THEN CAST(COALESCE(collected_amount, 0) AS DOUBLE PRECISION) / CAST(goal_amount AS DOUBLE PRECISION) "
+            "ELSE 0 END",
+            persisted=True
+        )
+    )
     currency = Column(String(3), default="RUB")
     
     # Страна (берётся из fund, но можно указать напрямую)
     country_code = Column(String(2))  # ISO 3166-1 alpha-2
+    # Страна для фильтра листинга: country_code, а без него - страна фонда.
+    # Заполняет триггер БД при вставке и смене country_code/fund_id кампании
+    # и при смене страны фонда (миграция effective_country_code)
+    effective_country_code = Column(String(2), server_default=FetchedValue())
     
     # Медиа
     banner_url = Column(String(512))
@@ -51,6 +86,19 @@ class Campaign(Base):
     
     # Статистика
     participants_count = Column(BigInteger, default=0)
+    # Трендовость: ln суммы весов пожертвований, вес растёт со временем
+    # (см. campaign_service.TRENDING_EPOCH); меняется только при пожертвовании
+    trending_score = Column(Float, nullable=False, default=0, server_default="0")
+    
+    # Полнотекстовый поиск (русская конфигурация, заголовок весомее описания)
+    search_vector = deferred(Column(
+        TSVECTOR,
+        Computed(
+            "setweight(to_tsvector('russian', coalesce(title, '')), 'A') || "
+            "setweight(to_tsvector('russian', coalesce(description, '')), 'B')",
+            persisted=True
+        )
+    ))
     
     created_at = Column(DateTime(timezone=True), server_default=func.now())
     updated_at = Column(DateTime(timezone=True), onupdate=func.now())
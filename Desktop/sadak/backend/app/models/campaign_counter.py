@@ -0,0 +1,22 @@
+"""
+Модель шардированных счётчиков кампании (write-behind)
+"""
+from sqlalchemy import Column, BigInteger, Integer, Numeric, ForeignKey
+from app.core.database import Base
+
+
+class CampaignCounterShard(Base):
+    """
+    Ещё не учтённые в campaigns суммы и участники
+
+    Каждое завершённое пожертвование прибавляется к одной из
+    CAMPAIGN_COUNTER_SHARDS строк кампании вместо строки самой кампании;
+    flush_campaign_counters периодически переносит их в campaigns.
+    """
+    __tablename__ = "campaign_counter_shards"
+
+    campaign_id = Column(BigInteger, ForeignKey("campaigns.id", ondelete="CASCADE"), primary_key=True)
+    shard = Column(Integer, primary_key=True)
+
+    amount = Column(Numeric(12, 2), nullable=False, default=0)
+    participants = Column(BigInteger, nullable=False, default=0)
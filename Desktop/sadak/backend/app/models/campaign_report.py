@@ -0,0 +1,30 @@
+"""
+Модель отчёта о завершённой кампании (материализованный снимок)
+"""
+from sqlalchemy import Column, BigInteger, String, Numeric, DateTime, ForeignKey, func
+from sqlalchemy.dialects.postgresql import ARRAY
+from app.core.database import Base
+
+
+class CampaignReport(Base):
+    """
+    Отчёт о кампании в статусе COMPLETED или EXPIRED
+
+    Заполняется campaign_service.refresh_campaign_reports в той же транзакции,
+    что и переход кампании в завершённый статус, и обновляется при проверке
+    отчёта фонда: GET /campaigns/{id}/report читает строку по первичному ключу.
+    """
+    __tablename__ = "campaign_reports"
+
+    campaign_id = Column(BigInteger, ForeignKey("campaigns.id", ondelete="CASCADE"), primary_key=True)
+    fund_id = Column(BigInteger, ForeignKey("funds.id"), nullable=False, index=True)
+
+    fund_name = Column(String(255), nullable=False)
+    total_collected = Column(Numeric(12, 2), nullable=False)
+    total_participants = Column(BigInteger, nullable=False)
+    fund_report_url = Column(String(512))  # Последний проверенный отчёт фонда
+    transferred_at = Column(DateTime(timezone=True))
+    report_documents = Column(ARRAY(String))  # URLs to PDF/images
+
+    created_at = Column(DateTime(timezone=True), server_default=func.now())
+    updated_at = Column(DateTime(timezone=True), server_default=func.now(), onupdate=func.now())
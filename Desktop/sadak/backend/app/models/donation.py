@@ -1,7 +1,7 @@
 """
 Модель пожертвования
 """
-from sqlalchemy import Column, BigInteger, String, Numeric, DateTime, ForeignKey, func, Enum
+from sqlalchemy import Column, BigInteger, String, Numeric, DateTime, ForeignKey, func, Enum, Index, text
 from sqlalchemy.orm import relationship
 import enum
 from app.core.database import Base
@@ -22,6 +22,22 @@ class PaymentProvider(str, enum.Enum):
 
 class Donation(Base):
     __tablename__ = "donations"
+    __table_args__ = (
+        # Завершённые пожертвования кампании (/campaigns/{id}/donations, отчёт)
+        Index(
+            "ix_donations_campaign_completed",
+            "campaign_id", "completed_at",
+            postgresql_where=text("status = 'COMPLETED'"),
+        ),
+        # Статистика пользователя (/me/stats)
+        Index(
+            "ix_donations_user_completed",
+            "user_id", "completed_at",
+            postgresql_where=text("status = 'COMPLETED'"),
+        ),
+        # История пользователя (/me/history)
+        Index("ix_donations_user_created", "user_id", "created_at"),
+    )
 
     id = Column(BigInteger, primary_key=True, index=True)
     user_id = Column(BigInteger, ForeignKey("users.id"), nullable=False)
@@ -1,12 +1,20 @@
 """
 Модель благотворительного фонда
 """
-from sqlalchemy import Column, BigInteger, String, Boolean, ARRAY, DateTime, func, Text
+from sqlalchemy import Column, BigInteger, String, Boolean, DateTime, func, Text, Index, Computed
+from sqlalchemy.dialects.postgresql import ARRAY, TSVECTOR
+from sqlalchemy.orm import deferred
 from app.core.database import Base
 
 
 class Fund(Base):
     __tablename__ = "funds"
+    __table_args__ = (
+        # GIN для фильтра categories.contains([...])
+        Index("ix_funds_categories", "categories", postgresql_using="gin"),
+        # Полнотекстовый поиск
+        Index("ix_funds_search", "search_vector", postgresql_using="gin"),
+    )
 
     id = Column(BigInteger, primary_key=True, index=True)
     name = Column(String(255), nullable=False)
@@ -16,6 +24,15 @@ class Fund(Base):
     verified = Column(Boolean, default=False)
     logo_url = Column(String(512))
     website_url = Column(String(512))
+    # Полнотекстовый поиск (русская конфигурация, название весомее описания)
+    search_vector = deferred(Column(
+        TSVECTOR,
+        Computed(
+            "setweight(to_tsvector('russian', coalesce(name, '')), 'A') || "
+            "setweight(to_tsvector('russian', coalesce(description, '')), 'B')",
+            persisted=True
+        )
+    ))
     created_at = Column(DateTime(timezone=True), server_default=func.now())
     updated_at = Column(DateTime(timezone=True), onupdate=func.now())
 
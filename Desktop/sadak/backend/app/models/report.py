@@ -1,13 +1,21 @@
 """
 Модель отчетности фонда
 """
-from sqlalchemy import Column, BigInteger, String, DateTime, ForeignKey, Boolean, func
+from sqlalchemy import Column, BigInteger, String, DateTime, ForeignKey, Boolean, Index, func, text
 from sqlalchemy.orm import relationship
 from app.core.database import Base
 
 
 class Report(Base):
     __tablename__ = "reports"
+    __table_args__ = (
+        # Последний проверенный отчёт фонда (отчёт кампании)
+        Index(
+            "ix_reports_fund_verified_created",
+            "fund_id", "created_at",
+            postgresql_where=text("verified"),
+        ),
+    )
 
     id = Column(BigInteger, primary_key=True, index=True)
     fund_id = Column(BigInteger, ForeignKey("funds.id"), nullable=False)
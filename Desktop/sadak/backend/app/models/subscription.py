@@ -1,7 +1,7 @@
 """
 Модель подписки (садака-джария)
 """
-from sqlalchemy import Column, BigInteger, String, Numeric, DateTime, ForeignKey, Enum, func
+from sqlalchemy import Column, BigInteger, String, Numeric, DateTime, ForeignKey, Enum, Index, func
 from sqlalchemy.orm import relationship
 import enum
 from app.core.database import Base
@@ -29,6 +29,9 @@ class SubscriptionStatus(str, enum.Enum):
 
 class Subscription(Base):
     __tablename__ = "subscriptions"
+    __table_args__ = (
+        Index("ix_subscriptions_user_status", "user_id", "status"),
+    )
 
     id = Column(BigInteger, primary_key=True, index=True)
     user_id = Column(BigInteger, ForeignKey("users.id"), nullable=False)
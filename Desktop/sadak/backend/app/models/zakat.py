@@ -1,13 +1,16 @@
 """
 Модель расчета закята
 """
-from sqlalchemy import Column, BigInteger, Numeric, DateTime, ForeignKey, JSON, func
+from sqlalchemy import Column, BigInteger, Numeric, DateTime, ForeignKey, JSON, Index, func
 from sqlalchemy.orm import relationship
 from app.core.database import Base
 
 
 class ZakatCalc(Base):
     __tablename__ = "zakat_calculations"
+    __table_args__ = (
+        Index("ix_zakat_calculations_user_created", "user_id", "created_at"),
+    )
 
     id = Column(BigInteger, primary_key=True, index=True)
     user_id = Column(BigInteger, ForeignKey("users.id"), nullable=False)
@@ -1,18 +1,22 @@
 from .user import User, UserCreate
-from .fund import Fund, FundCreate
+from .fund import Fund, FundCreate, FundCountryUpdate, FundSummary
 from .donation import Donation, DonationCreate, DonationInit
 from .subscription import Subscription, SubscriptionCreate, SubscriptionInit, SubscriptionStatusUpdate
-from .campaign import Campaign, CampaignCreate, CampaignUpdate
+from .campaign import Campaign, CampaignCreate, CampaignUpdate, CampaignStatusUpdate, CampaignPage, CampaignReport, CampaignDetail, CampaignFacets
 from .zakat import ZakatCalc, ZakatCalcCreate, ZakatPay
 from .partner_application import PartnerApplication, PartnerApplicationCreate, PartnerApplicationStatusUpdate
+from .auth import AccessToken
+from .search import SearchHit, SearchPage, AutocompleteItem
 
 __all__ = [
     "User", "UserCreate",
-    "Fund", "FundCreate",
+    "Fund", "FundCreate", "FundCountryUpdate", "FundSummary",
     "Donation", "DonationCreate", "DonationInit",
     "Subscription", "SubscriptionCreate", "SubscriptionInit", "SubscriptionStatusUpdate",
-    "Campaign", "CampaignCreate", "CampaignUpdate",
+    "Campaign", "CampaignCreate", "CampaignUpdate", "CampaignStatusUpdate", "CampaignPage", "CampaignReport", "CampaignDetail", "CampaignFacets",
     "ZakatCalc", "ZakatCalcCreate", "ZakatPay",
     "PartnerApplication", "PartnerApplicationCreate", "PartnerApplicationStatusUpdate",
+    "AccessToken",
+    "SearchHit", "SearchPage", "AutocompleteItem",
 ]
 
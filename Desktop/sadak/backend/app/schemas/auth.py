@@ -0,0 +1,10 @@
+"""
+Схемы для авторизации
+"""
+from pydantic import BaseModel
+
+
+class AccessToken(BaseModel):
+    access_token: str
+    token_type: str = "bearer"
+    expires_in: int
@@ -6,6 +6,8 @@ from datetime import datetime
 from typing import Optional, List
 from decimal import Decimal
 from app.models.campaign import CampaignStatus
+from app.schemas.donation import Donation
+from app.schemas.fund import FundSummary
 
 
 class CampaignBase(BaseModel):
@@ -53,6 +55,12 @@ class Campaign(CampaignBase):
         from_attributes = True
 
 
+class CampaignPage(BaseModel):
+    """Страница листинга кампаний"""
+    items: List[Campaign]
+    next_cursor: Optional[str] = None  # None - это последняя страница
+
+
 class CampaignReport(BaseModel):
     """Отчёт о завершённой кампании"""
     campaign_id: int
@@ -65,3 +73,29 @@ class CampaignReport(BaseModel):
 
     class Config:
         from_attributes = True
+
+
+class CampaignDetail(BaseModel):
+    """Страница кампании одним ответом"""
+    campaign: Campaign
+    fund: Optional[FundSummary] = None
+    donations: List[Donation]
+    report: Optional[CampaignReport] = None  # Только для завершённых кампаний
+
+
+class FacetValue(BaseModel):
+    value: str
+    count: int
+
+
+class FacetGroup(BaseModel):
+    """Счётчики по категориям и странам"""
+    total: int
+    categories: List[FacetValue]
+    countries: List[FacetValue]
+
+
+class CampaignFacets(BaseModel):
+    """Счётчики для панели фильтров: активные кампании и проверенные фонды"""
+    campaigns: FacetGroup
+    funds: FacetGroup
@@ -1,7 +1,7 @@
 """
 Схемы для пожертвований
 """
-from pydantic import BaseModel
+from pydantic import BaseModel, Field
 from datetime import datetime
 from typing import Optional
 from decimal import Decimal
@@ -19,6 +19,8 @@ class DonationBase(BaseModel):
 class DonationInit(DonationBase):
     """Схема для инициализации платежа"""
     return_url: Optional[str] = None
+    # Первые 6-8 цифр карты, если клиент их знает - для выбора провайдера
+    card_bin: Optional[str] = Field(None, pattern=r"^\d{6,8}$")
 
 
 class DonationCreate(DonationBase):
@@ -1,7 +1,7 @@
 """
 Схемы для фондов
 """
-from pydantic import BaseModel
+from pydantic import BaseModel, Field
 from datetime import datetime
 from typing import Optional, List
 
@@ -19,6 +19,11 @@ class FundCreate(FundBase):
     pass
 
 
+class FundCountryUpdate(BaseModel):
+    """Схема для смены страны фонда (админ)"""
+    country_code: Optional[str] = Field(None, min_length=2, max_length=2)
+
+
 class Fund(FundBase):
     id: int
     verified: bool
@@ -28,3 +33,15 @@ class Fund(FundBase):
     class Config:
         from_attributes = True
 
+
+class FundSummary(BaseModel):
+    """Краткая информация о фонде (страница кампании)"""
+    id: int
+    name: str
+    country_code: Optional[str] = None
+    verified: bool
+    logo_url: Optional[str] = None
+    website_url: Optional[str] = None
+
+    class Config:
+        from_attributes = True
@@ -0,0 +1,24 @@
+"""
+Схемы для полнотекстового поиска
+"""
+from pydantic import BaseModel
+from typing import List, Optional
+
+
+class SearchHit(BaseModel):
+    type: str  # campaign, fund
+    id: int
+    title: str
+    description: Optional[str] = None
+    rank: float
+
+
+class AutocompleteItem(BaseModel):
+    type: str  # campaign, fund
+    id: int
+    title: str
+
+
+class SearchPage(BaseModel):
+    items: List[SearchHit]
+    next_cursor: Optional[str] = None
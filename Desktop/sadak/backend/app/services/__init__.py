@@ -5,6 +5,10 @@ from . import campaign_service
 from . import zakat_service
 from . import history_service
 from . import partner_service
+from . import autocomplete_service
+from . import report_service
+from . import urgency_service
+from . import facets_service
 
 __all__ = [
     "fund_service",
@@ -14,5 +18,9 @@ __all__ = [
     "zakat_service",
     "history_service",
     "partner_service",
+    "autocomplete_service",
+    "report_service",
+    "urgency_service",
+    "facets_service",
 ]
 
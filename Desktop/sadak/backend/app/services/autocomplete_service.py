@@ -0,0 +1,231 @@
+"""
+Автодополнение по названиям активных кампаний и проверенных фондов
+
+Индекс живёт в памяти процесса: отсортированный список нормализованных
+ключей и bisect по нему, без запросов к БД на каждое нажатие клавиши.
+Ключи - хвосты названия с начала каждого слова, поэтому "мечеть" находит
+и "Сбор на мечеть". Кампании обновляются точечно из campaign_service при
+смене статуса, целиком индекс пересобирается при старте и раз в
+AUTOCOMPLETE_REBUILD_MINUTES (фонды и изменения в других воркерах).
+"""
+from bisect import bisect_left, bisect_right
+from heapq import merge
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+from typing import Dict, Iterable, List, Optional, Set, Tuple
+from app.models import Campaign, Fund
+from app.models.campaign import CampaignStatus
+import asyncio
+import re
+
+# Длина ключа: для автодополнения важно начало, хвост длинных названий не
+# храним; более длинный префикс ищется по первым MAX_KEY_LENGTH символам и
+# досматривается по названию
+MAX_KEY_LENGTH = 24
+
+# Сколько ключей с подходящим префиксом просматривать на один запрос:
+# ограничивает время ответа на коротких префиксах вроде "с"
+MAX_SCAN = 500
+
+_SEPARATORS = re.compile(r"[\W_]+")
+
+_KINDS = ("campaign", "fund")
+
+
+def normalize(text: str) -> str:
+    """Нижний регистр, ё -> е, пунктуация и повторные пробелы - в один пробел"""
+    return " ".join(_SEPARATORS.split(text.lower().replace("ё", "е"))).strip()
+
+
+def _keys(title: str) -> List[str]:
+    """Ключи названия: нормализованный текст с начала каждого слова"""
+    text = normalize(title)
+    keys = []
+    start = 0
+    while start < len(text):
+        keys.append(text[start:start + MAX_KEY_LENGTH])
+        space = text.find(" ", start)
+        if space < 0:
+            break
+        start = space + 1
+    return keys
+
+
+def _ref(kind: str, item_id: int) -> int:
+    """Кампании и фонды в одном int: младший бит - тип"""
+    return item_id * 2 + _KINDS.index(kind)
+
+
+def build_index(items: Iterable[Tuple[str, int, str]]) -> Tuple[List[str], List[int], Dict[int, str]]:
+    """
+    Собрать содержимое индекса: items - (kind, id, title)
+
+    Чистая функция без общего состояния - выполняется в отдельном потоке,
+    чтобы полная пересборка не останавливала event loop
+    """
+    keys: List[str] = []
+    refs: List[int] = []
+    titles: Dict[int, str] = {}
+    for kind, item_id, title in items:
+        ref = _ref(kind, item_id)
+        titles[ref] = title
+        for key in _keys(title):
+            keys.append(key)
+            refs.append(ref)
+    # Сортировка перестановки по строкам быстрее, чем сортировка кортежей
+    order = sorted(range(len(keys)), key=keys.__getitem__)
+    return [keys[i] for i in order], [refs[i] for i in order], titles
+
+
+class PrefixIndex:
+    """
+    Отсортированные ключи с параллельным списком ссылок на записи
+
+    Основные списки меняет только полная пересборка. Точечные изменения не
+    сдвигают их (это O(n) на ключ): удалённые и переименованные записи
+    помечаются в _dead, новые ключи пишутся в маленькие списки _delta_*,
+    которые просматриваются вместе с основными до следующей пересборки.
+    """
+
+    def __init__(self):
+        self._keys: List[str] = []
+        self._refs: List[int] = []
+        self._titles: Dict[int, str] = {}
+        self._dead: Set[int] = set()
+        self._delta_keys: List[str] = []
+        self._delta_refs: List[int] = []
+        # Пока идёт пересборка, точечные изменения копятся здесь и
+        # применяются к новому индексу после подмены
+        self._pending: Optional[List[Tuple[int, Optional[str]]]] = None
+
+    def __len__(self) -> int:
+        return len(self._titles)
+
+    def _put(self, ref: int, title: Optional[str]) -> None:
+        old_title = self._titles.pop(ref, None)
+        if old_title is not None:
+            self._dead.add(ref)
+            for key in _keys(old_title):
+                position = bisect_left(self._delta_keys, key)
+                while position < len(self._delta_keys) and self._delta_keys[position] == key:
+                    if self._delta_refs[position] == ref:
+                        del self._delta_keys[position]
+                        del self._delta_refs[position]
+                        break
+                    position += 1
+        if title:
+            self._titles[ref] = title
+            # Записи из основных списков с этим ref остаются мёртвыми:
+            # актуальные ключи теперь только в delta
+            self._dead.add(ref)
+            for key in _keys(title):
+                position = bisect_right(self._delta_keys, key)
+                self._delta_keys.insert(position, key)
+                self._delta_refs.insert(position, ref)
+
+    def put(self, kind: str, item_id: int, title: Optional[str]) -> None:
+        """Добавить или заменить запись; title=None - убрать из индекса"""
+        ref = _ref(kind, item_id)
+        if self._pending is not None:
+            self._pending.append((ref, title))
+        self._put(ref, title)
+
+    def replace(self, built: Tuple[List[str], List[int], Dict[int, str]]) -> None:
+        """Подменить содержимое результатом build_index() и доиграть изменения, пришедшие во время сборки"""
+        pending = self._pending or []
+        self._keys, self._refs, self._titles = built
+        self._dead = set()
+        self._delta_keys = []
+        self._delta_refs = []
+        self._pending = None
+        for ref, title in pending:
+            self._put(ref, title)
+
+    def _scan(self, keys: List[str], refs: List[int], prefix: str, skip_dead: bool):
+        """(ключ, ref) с подходящим префиксом, не больше MAX_SCAN просмотренных"""
+        position = bisect_left(keys, prefix)
+        end = min(len(keys), position + MAX_SCAN)
+        while position < end and keys[position].startswith(prefix):
+            ref = refs[position]
+            if not (skip_dead and ref in self._dead):
+                yield keys[position], ref
+            position += 1
+
+    def suggest(self, prefix: str, kind: Optional[str] = None, limit: int = 10) -> List[Dict]:
+        """Записи, у которых какое-либо слово названия начинается с prefix"""
+        prefix = normalize(prefix)
+        if not prefix:
+            return []
+        type_bit = _KINDS.index(kind) if kind else None
+        key_prefix = prefix[:MAX_KEY_LENGTH]
+        long_prefix = " " + prefix if len(prefix) > MAX_KEY_LENGTH else None
+
+        results = []
+        seen = set()
+        for _, ref in merge(
+            self._scan(self._keys, self._refs, key_prefix, skip_dead=True),
+            self._scan(self._delta_keys, self._delta_refs, key_prefix, skip_dead=False)
+        ):
+            if ref in seen or (type_bit is not None and ref & 1 != type_bit):
+                continue
+            seen.add(ref)
+            if long_prefix and long_prefix not in " " + normalize(self._titles[ref]):
+                continue
+            results.append({"type": _KINDS[ref & 1], "id": ref >> 1, "title": self._titles[ref]})
+            if len(results) >= limit:
+                break
+        return results
+
+    def stats(self) -> Dict:
+        return {
+            "items": len(self._titles),
+            "keys": len(self._keys),
+            "delta_keys": len(self._delta_keys),
+            "dead": len(self._dead),
+        }
+
+
+autocomplete_index = PrefixIndex()
+
+
+async def rebuild_autocomplete_index(db: AsyncSession) -> int:
+    """
+    Пересобрать индекс из БД
+
+    Returns:
+        Количество записей в индексе
+    """
+    index = autocomplete_index
+    index._pending = []
+    try:
+        campaigns = (await db.execute(
+            select(Campaign.id, Campaign.title).where(Campaign.status == CampaignStatus.ACTIVE)
+        )).all()
+        funds = (await db.execute(
+            select(Fund.id, Fund.name).where(Fund.verified.is_(True))
+        )).all()
+    except Exception:
+        index._pending = None
+        raise
+
+    items = [("campaign", row.id, row.title) for row in campaigns]
+    items += [("fund", row.id, row.name) for row in funds]
+    try:
+        built = await asyncio.to_thread(build_index, items)
+    except Exception:
+        index._pending = None
+        raise
+    index.replace(built)
+    return len(index)
+
+
+def update_campaigns(campaigns: Iterable[Campaign]) -> None:
+    """Точечно обновить кампании: активные в индексе, остальные - нет"""
+    for campaign in campaigns:
+        title = campaign.title if campaign.status == CampaignStatus.ACTIVE else None
+        autocomplete_index.put("campaign", campaign.id, title)
+
+
+def suggest(prefix: str, kind: Optional[str] = None, limit: int = 10) -> List[Dict]:
+    """Подсказки для строки поиска"""
+    return autocomplete_index.suggest(prefix, kind=kind, limit=limit)
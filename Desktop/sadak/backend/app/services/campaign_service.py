@@ -1,20 +1,199 @@
 """
 Сервис для работы с кампаниями
 """
-from sqlalchemy.orm import Session
-from typing import Optional, List
-from datetime import datetime
-from app.models import Campaign
+from sqlalchemy import select, update, delete, case, and_, func, column, tuple_, literal, cast, extract, Float
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm.attributes import set_committed_value
+from typing import Dict, Optional, List, Tuple, Union
+from datetime import datetime, timezone
+from decimal import Decimal
+from app.core.cache import TTLCache
+from app.core.config import settings
+from app.models import Campaign, CampaignCounterShard, CampaignReport, Donation, User
+from app.models.donation import DonationStatus
 from app.models.fund import Fund
 from app.schemas.campaign import CampaignCreate
 from app.models.campaign import CampaignStatus
+import base64
+import binascii
+import json
 import logging
+import math
+import random
+import time
 
 logger = logging.getLogger(__name__)
 
+# Сериализованные страницы GET /campaigns, ключ - listing_cache_key()
+campaign_listing_cache = TTLCache(
+    "campaign_listing",
+    maxsize=settings.CAMPAIGN_LISTING_CACHE_SIZE,
+    ttl=settings.CAMPAIGN_LISTING_CACHE_TTL
+)
+# time.monotonic() последнего сброса страниц листинга
+_listings_invalidated_at = 0.0
 
-def get_campaigns(
-    db: Session,
+
+# Режимы сортировки листинга. Вторым ключом всегда идёт id -
+# он делает порядок однозначным для курсора
+CAMPAIGN_SORTS = ("newest", "oldest", "popularity", "progress", "ending_soon", "trending")
+
+# Трендовость (sort=trending) - число пожертвований, каждое с весом
+# 2^(-возраст / TRENDING_HALF_LIFE_HOURS). Вместо того чтобы со временем
+# уменьшать счёт всех кампаний, новое пожертвование весит в 2^(t / T) раз
+# больше прежних (t отсчитывается от TRENDING_EPOCH): порядок кампаний тот же,
+# а хранимое значение меняется только при пожертвовании и читается индексом
+# (status, trending_score, id). Хранится натуральный логарифм суммы весов,
+# чтобы веса не переполняли double.
+TRENDING_EPOCH = datetime(2026, 1, 1, tzinfo=timezone.utc)
+
+
+def _campaign_sort_key(sort: Optional[str]):
+    """Ключ сортировки листинга: (выражение, по убыванию)"""
+    if sort == "popularity":
+        # По популярности (количество участников)
+        return Campaign.participants_count, True
+    if sort == "progress":
+        # По прогрессу (% сбора) - хранимая вычисляемая колонка с индексом
+        return Campaign.progress, True
+    if sort == "oldest":
+        # По дате создания (старые сначала)
+        return Campaign.created_at, False
+    if sort == "ending_soon":
+        # Срочные: ближайший end_date первым (индекс status, end_date)
+        return Campaign.end_date, False
+    if sort == "trending":
+        # Трендовые: затухающий со временем счёт пожертвований (индекс status, trending_score, id)
+        return Campaign.trending_score, True
+    # По умолчанию - по дате создания (новые сначала)
+    return Campaign.created_at, True
+
+
+def _filter_campaigns(
+    query,
+    country_code: Optional[str] = None,
+    category: Optional[str] = None,
+    status: Optional[str] = None
+):
+    """Фильтры листинга кампаний"""
+    # Фильтрация по статусу (по умолчанию только активные)
+    if status:
+        query = query.where(Campaign.status == CampaignStatus(status))
+    else:
+        query = query.where(Campaign.status == CampaignStatus.ACTIVE)
+    
+    # Фильтрация по стране: своя страна кампании или страна фонда,
+    # денормализована в effective_country_code (индекс со статусом)
+    if country_code:
+        query = query.where(Campaign.effective_country_code == country_code)
+    
+    if category:
+        query = query.where(Campaign.category == category)
+    
+    return query
+
+
+def encode_cursor(sort: str, key, campaign_id: int) -> str:
+    """Непрозрачный курсор: режим сортировки, значение ключа и id последней кампании"""
+    if isinstance(key, datetime):
+        key = key.isoformat()
+    elif isinstance(key, Decimal):
+        key = float(key)
+    payload = json.dumps({"s": sort, "k": key, "id": campaign_id}, separators=(",", ":"))
+    return base64.urlsafe_b64encode(payload.encode()).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str, sort: str) -> Tuple[object, int]:
+    """Разобрать курсор; ValueError если он битый или от другой сортировки"""
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        payload = json.loads(base64.urlsafe_b64decode(padded.encode()))
+        key, campaign_id = payload["k"], int(payload["id"])
+        if payload["s"] != sort:
+            raise ValueError("sort mismatch")
+        if sort in ("newest", "oldest", "ending_soon"):
+            key = datetime.fromisoformat(key)
+        elif not isinstance(key, (int, float)):
+            raise ValueError("bad key")
+    except (ValueError, KeyError, TypeError, binascii.Error) as e:
+        raise ValueError("Invalid cursor") from e
+    return key, campaign_id
+
+
+def listing_cache_key(
+    country_code: Optional[str] = None,
+    category: Optional[str] = None,
+    status: Optional[str] = None,
+    sort: Optional[str] = None,
+    cursor: Optional[str] = None,
+    limit: int = 20
+) -> tuple:
+    """
+    Нормализованный ключ страницы листинга:
+    (status, country_code, category, sort, cursor, limit)
+    """
+    status_value = CampaignStatus(status).value if status else CampaignStatus.ACTIVE.value
+    if sort not in CAMPAIGN_SORTS:
+        sort = "newest"
+    return (status_value, country_code or None, category or None, sort, cursor or None, limit)
+
+
+def invalidate_campaign_listings(
+    campaign: Campaign,
+    *statuses: CampaignStatus,
+    previous_country_code: Optional[str] = None
+) -> int:
+    """
+    Сбросить закэшированные страницы, в которые может входить кампания,
+    и обновить её в ленте срочных кампаний и счётчиках фильтров
+    
+    Args:
+        statuses: статусы до и после изменения (по умолчанию - текущий)
+        previous_country_code: страна кампании до изменения, если она сменилась
+    """
+    from app.services import facets_service, urgency_service
+    urgency_service.update_campaign(campaign)
+    facets_service.update_campaign(campaign)
+    
+    status_values = {status.value for status in (statuses or (campaign.status,))}
+    country_codes = {campaign.effective_country_code, previous_country_code}
+    category = campaign.category
+    
+    def affected(key: tuple) -> bool:
+        key_status, key_country, key_category = key[:3]
+        return (
+            key_status in status_values
+            and (key_country is None or key_country in country_codes)
+            and (key_category is None or key_category == category)
+        )
+    
+    _mark_listings_invalidated()
+    return campaign_listing_cache.invalidate(affected)
+
+
+def _mark_listings_invalidated() -> None:
+    global _listings_invalidated_at
+    _listings_invalidated_at = time.monotonic()
+
+
+def can_cache_listing(db: AsyncSession) -> bool:
+    """
+    Можно ли положить в кэш страницу, прочитанную через сессию db
+    
+    Страница с реплики сразу после сброса может не содержать изменения,
+    из-за которого кэш сбрасывали, и прожила бы в кэше весь TTL. Пока
+    реплика может отставать (READ_AFTER_WRITE_SECONDS), кэшируются только
+    страницы, прочитанные с primary.
+    """
+    from app.core.database import engine
+    return (
+        db.bind is engine
+        or time.monotonic() - _listings_invalidated_at >= settings.READ_AFTER_WRITE_SECONDS
+    )
+
+
+async def get_campaigns(
+    db: AsyncSession,
     country_code: Optional[str] = None,
     category: Optional[str] = None,
     status: Optional[str] = None,
@@ -23,64 +202,222 @@ def get_campaigns(
     limit: int = 100
 ) -> List[Campaign]:
     """Получить список кампаний с фильтрацией и сортировкой"""
-    query = db.query(Campaign)
+    query = _filter_campaigns(select(Campaign), country_code, category, status)
     
-    # Фильтрация по статусу (по умолчанию только активные)
-    if status:
-        query = query.filter(Campaign.status == CampaignStatus(status))
+    key, descending = _campaign_sort_key(sort)
+    if sort == "ending_soon":
+        # Истёкшие, но ещё не переведённые в EXPIRED, в срочные не попадают
+        query = query.where(Campaign.end_date > func.now())
+    if descending:
+        query = query.order_by(key.desc(), Campaign.id.desc())
     else:
-        query = query.filter(Campaign.status == CampaignStatus.ACTIVE)
+        query = query.order_by(key.asc(), Campaign.id.asc())
     
-    # Фильтрация по стране (используем прямое поле country_code или через fund)
-    if country_code:
-        from sqlalchemy import or_, and_
-        # Фильтруем по country_code в Campaign или через fund.country_code
-        query = query.outerjoin(Fund).filter(
-            or_(
-                Campaign.country_code == country_code,
-                and_(
-                    (Campaign.country_code.is_(None)),
-                    (Fund.country_code == country_code)
-                )
-            )
-        )
+    result = await db.execute(query.offset(skip).limit(limit))
+    return list(result.scalars().all())
+
+
+async def get_campaigns_page(
+    db: AsyncSession,
+    country_code: Optional[str] = None,
+    category: Optional[str] = None,
+    status: Optional[str] = None,
+    sort: Optional[str] = None,
+    cursor: Optional[str] = None,
+    limit: int = 20
+) -> Tuple[List[Campaign], Optional[str]]:
+    """
+    Страница листинга кампаний (keyset-пагинация)
     
-    if category:
-        query = query.filter(Campaign.category == category)
+    Вместо OFFSET страница продолжается условием (ключ, id) < (ключ, id)
+    последней строки предыдущей страницы, поэтому глубокие страницы
+    стоят столько же, сколько первая.
     
-    # Сортировка
-    if sort == "popularity":
-        # По популярности (количество участников)
-        query = query.order_by(Campaign.participants_count.desc(), Campaign.created_at.desc())
-    elif sort == "progress":
-        # По прогрессу (% сбора) - вычисляем через (collected_amount / goal_amount)
-        # Для этого используем CASE WHEN или вычисляем процент
-        from sqlalchemy import case, cast, Float
-        progress = case(
-            (Campaign.goal_amount > 0, cast(Campaign.collected_amount, Float) / cast(Campaign.goal_amount, Float)),
-            else_=0
-        )
-        query = query.order_by(progress.desc(), Campaign.created_at.desc())
-    elif sort == "newest":
-        # По дате создания (новые сначала)
-        query = query.order_by(Campaign.created_at.desc())
-    elif sort == "oldest":
-        # По дате создания (старые сначала)
-        query = query.order_by(Campaign.created_at.asc())
+    Returns:
+        (кампании, курсор следующей страницы или None)
+    """
+    if sort not in CAMPAIGN_SORTS:
+        sort = "newest"
+    
+    query = _filter_campaigns(select(Campaign), country_code, category, status)
+    key, descending = _campaign_sort_key(sort)
+    if sort == "ending_soon":
+        query = query.where(Campaign.end_date > func.now())
+    
+    if cursor:
+        last_key, last_id = decode_cursor(cursor, sort)
+        if descending:
+            query = query.where(tuple_(key, Campaign.id) < tuple_(literal(last_key), last_id))
+        else:
+            query = query.where(tuple_(key, Campaign.id) > tuple_(literal(last_key), last_id))
+    
+    if descending:
+        query = query.order_by(key.desc(), Campaign.id.desc())
     else:
-        # По умолчанию - по дате создания (новые сначала)
-        query = query.order_by(Campaign.created_at.desc())
+        query = query.order_by(key.asc(), Campaign.id.asc())
+    
+    # Берём на одну строку больше, чтобы узнать, есть ли следующая страница
+    query = query.add_columns(key.label("sort_key")).limit(limit + 1)
+    if settings.CAMPAIGN_COUNTER_SHARDS > 0:
+        query = query.add_columns(*pending_counter_columns()).execution_options(populate_existing=True)
+    rows = (await db.execute(query)).all()
     
-    return query.offset(skip).limit(limit).all()
+    next_cursor = None
+    if len(rows) > limit:
+        rows = rows[:limit]
+        last = rows[-1]
+        next_cursor = encode_cursor(sort, last.sort_key, last.Campaign.id)
+    
+    if settings.CAMPAIGN_COUNTER_SHARDS > 0:
+        for row in rows:
+            _apply_pending_counters(row.Campaign, row.pending_amount, row.pending_participants)
+    
+    return [row.Campaign for row in rows], next_cursor
 
 
-def get_campaign(db: Session, campaign_id: int) -> Optional[Campaign]:
+async def get_campaign(db: AsyncSession, campaign_id: int) -> Optional[Campaign]:
     """Получить кампанию по ID"""
-    return db.query(Campaign).filter(Campaign.id == campaign_id).first()
+    if settings.CAMPAIGN_COUNTER_SHARDS <= 0:
+        return await db.get(Campaign, campaign_id)
+    
+    # Кампания и её ещё не перенесённые дельты одним запросом (один снимок)
+    row = (await db.execute(
+        select(Campaign, *pending_counter_columns())
+        .where(Campaign.id == campaign_id)
+        .execution_options(populate_existing=True)
+    )).first()
+    if row is None:
+        return None
+    _apply_pending_counters(row.Campaign, row.pending_amount, row.pending_participants)
+    return row.Campaign
 
 
-def create_campaign(
-    db: Session,
+# Статусы, для которых доступен отчёт о кампании
+FINISHED_STATUSES = (CampaignStatus.COMPLETED, CampaignStatus.EXPIRED)
+
+
+async def get_recent_donations(db: AsyncSession, campaign_id: int, limit: int = 10) -> List[Donation]:
+    """Последние завершённые пожертвования кампании"""
+    result = await db.execute(
+        select(Donation).where(
+            Donation.campaign_id == campaign_id,
+            Donation.status == DonationStatus.COMPLETED
+        ).order_by(
+            Donation.completed_at.desc()
+        ).limit(limit)
+    )
+    return list(result.scalars().all())
+
+
+async def refresh_campaign_reports(
+    db: AsyncSession,
+    campaign_ids: Optional[List[int]] = None,
+    fund_id: Optional[int] = None
+) -> int:
+    """
+    Пересчитать материализованные отчёты завершённых кампаний
+    
+    Один INSERT ... SELECT ... ON CONFLICT DO UPDATE для всех выбранных
+    кампаний (по списку id или по фонду); незавершённые пропускаются.
+    Не коммитит: вызывается в транзакции, меняющей статус или отчёт фонда.
+    
+    Returns:
+        Количество записанных отчётов
+    """
+    from sqlalchemy.dialects.postgresql import insert
+    from app.models.report import Report
+    
+    # Незафлашенное пожертвование (autoflush выключен) должно попасть в дату перечисления
+    await db.flush()
+    
+    last_transfer = (
+        select(func.max(Donation.completed_at))
+        .where(Donation.campaign_id == Campaign.id, Donation.status == DonationStatus.COMPLETED)
+        .scalar_subquery()
+    )
+    fund_report_url = (
+        select(Report.file_url)
+        .where(Report.fund_id == Campaign.fund_id, Report.verified.is_(True))
+        .order_by(Report.created_at.desc())
+        .limit(1)
+        .scalar_subquery()
+    )
+    source = select(
+        Campaign.id,
+        Campaign.fund_id,
+        Fund.name,
+        func.coalesce(Campaign.collected_amount, 0),
+        func.coalesce(Campaign.participants_count, 0),
+        fund_report_url,
+        # Дата перечисления - последнее завершённое пожертвование
+        func.coalesce(last_transfer, Campaign.updated_at)
+    ).join(Fund, Fund.id == Campaign.fund_id).where(Campaign.status.in_(FINISHED_STATUSES))
+    if campaign_ids is not None:
+        source = source.where(Campaign.id.in_(campaign_ids))
+    if fund_id is not None:
+        source = source.where(Campaign.fund_id == fund_id)
+    
+    stmt = insert(CampaignReport).from_select(
+        ["campaign_id", "fund_id", "fund_name", "total_collected", "total_participants",
+         "fund_report_url", "transferred_at"],
+        source
+    )
+    stmt = stmt.on_conflict_do_update(
+        index_elements=[CampaignReport.campaign_id],
+        set_={
+            "fund_name": stmt.excluded.fund_name,
+            "total_collected": stmt.excluded.total_collected,
+            "total_participants": stmt.excluded.total_participants,
+            "fund_report_url": stmt.excluded.fund_report_url,
+            "transferred_at": stmt.excluded.transferred_at,
+            "updated_at": func.now(),
+        }
+    ).returning(CampaignReport.campaign_id)
+    
+    return len((await db.execute(stmt)).all())
+
+
+async def get_campaign_detail(
+    db: AsyncSession,
+    campaign_id: int,
+    donations_limit: int = 10
+) -> Optional[Dict]:
+    """
+    Всё для страницы кампании: кампания, фонд, последние пожертвования и отчёт
+    
+    Два запроса независимо от статуса: кампания с фондом и готовым отчётом
+    (JOIN по первичным ключам), затем последние пожертвования.
+    
+    Returns:
+        dict с ключами campaign, fund, donations, report (None, если кампания
+        не завершена) или None, если кампании нет
+    """
+    query = (
+        select(Campaign, Fund, CampaignReport)
+        .outerjoin(Fund, Fund.id == Campaign.fund_id)
+        .outerjoin(CampaignReport, CampaignReport.campaign_id == Campaign.id)
+        .where(Campaign.id == campaign_id)
+    )
+    sharded = settings.CAMPAIGN_COUNTER_SHARDS > 0
+    if sharded:
+        query = query.add_columns(*pending_counter_columns()).execution_options(populate_existing=True)
+    
+    row = (await db.execute(query)).first()
+    if row is None:
+        return None
+    campaign, fund = row.Campaign, row.Fund
+    if sharded:
+        _apply_pending_counters(campaign, row.pending_amount, row.pending_participants)
+    
+    donations = await get_recent_donations(db, campaign_id, limit=donations_limit)
+    
+    report = row.CampaignReport if campaign.status in FINISHED_STATUSES else None
+    
+    return {"campaign": campaign, "fund": fund, "donations": donations, "report": report}
+
+
+async def create_campaign(
+    db: AsyncSession,
     user_id: int,
     campaign_data: CampaignCreate
 ) -> Campaign:
@@ -89,7 +426,7 @@ def create_campaign(
     Статус автоматически устанавливается в PENDING (на модерации)
     """
     # Получаем country_code из fund, если не указан напрямую
-    fund = db.query(Fund).filter(Fund.id == campaign_data.fund_id).first()
+    fund = await db.get(Fund, campaign_data.fund_id)
     country_code = None
     if fund and fund.country_code:
         country_code = fund.country_code
@@ -109,85 +446,186 @@ def create_campaign(
     )
     
     db.add(campaign)
-    db.commit()
-    db.refresh(campaign)
+    await db.commit()
+    await db.refresh(campaign)
+    invalidate_campaign_listings(campaign)
+    await _update_search_indexes([campaign])
     
     # Синхронизация с e-replika.ru будет вызвана из API эндпоинта через BackgroundTasks
     
     return campaign
 
 
-def update_campaign_progress(
-    db: Session,
-    campaign_id: int,
-    amount: float,
-    send_notification: bool = True
-) -> Campaign:
+async def _update_search_indexes(campaigns: List[Campaign]) -> None:
+    """Обновить автодополнение и поисковый движок (ошибки не роняют запрос)"""
+    from app.services import autocomplete_service
+    from app.services.search import search_backend
+    if not campaigns:
+        return
+    autocomplete_service.update_campaigns(campaigns)
+    try:
+        await search_backend.index_campaigns(campaigns)
+    except Exception as e:
+        logger.warning(f"Не удалось обновить поисковый индекс кампаний: {e}")
+
+
+def pending_counter_columns():
+    """Суммы ещё не перенесённых дельт кампании (коррелированные подзапросы)"""
+    return (
+        select(func.coalesce(func.sum(CampaignCounterShard.amount), 0))
+        .where(CampaignCounterShard.campaign_id == Campaign.id)
+        .scalar_subquery().label("pending_amount"),
+        select(func.coalesce(func.sum(CampaignCounterShard.participants), 0))
+        .where(CampaignCounterShard.campaign_id == Campaign.id)
+        .scalar_subquery().label("pending_participants"),
+    )
+
+
+def _apply_pending_counters(campaign: Campaign, amount, participants) -> None:
     """
-    Обновить прогресс кампании (вызывается при успешном донате)
+    Прибавить дельты к загруженной кампании
     
-    Args:
-        send_notification: Отправлять ли уведомление организатору
+    set_committed_value не помечает объект изменённым, поэтому
+    суммы с дельтами никогда не будут записаны обратно в campaigns
     """
-    from datetime import datetime
-    from app.models import User
+    if not amount and not participants:
+        return
+    set_committed_value(campaign, "collected_amount", (campaign.collected_amount or 0) + Decimal(amount))
+    set_committed_value(campaign, "participants_count", (campaign.participants_count or 0) + int(participants))
+
+
+def _trending_exponent(at: Optional[datetime] = None) -> float:
+    """ln веса пожертвования, сделанного в момент at (по умолчанию - сейчас)"""
+    at = at or datetime.now(timezone.utc)
+    return (at - TRENDING_EPOCH).total_seconds() * math.log(2) / (settings.TRENDING_HALF_LIFE_HOURS * 3600)
+
+
+def _trending_bump(participants):
+    """
+    Новое значение trending_score после participants пожертвований сейчас
     
-    campaign = db.query(Campaign).filter(Campaign.id == campaign_id).first()
-    if campaign:
-        old_amount = float(campaign.collected_amount)
-        campaign.collected_amount += amount
-        campaign.participants_count += 1
-        
-        # Проверка достижения цели
-        goal_reached = False
-        if campaign.collected_amount >= campaign.goal_amount and campaign.status == CampaignStatus.ACTIVE:
-            campaign.status = CampaignStatus.COMPLETED
-            goal_reached = True
-        
-        db.commit()
-        db.refresh(campaign)
-        
-        # Отправка уведомления организатору (в фоне, не блокируя ответ)
-        if send_notification:
-            try:
-                owner = db.query(User).filter(User.id == campaign.owner_id).first()
-                if owner and owner.tg_id:
-                    from app.services import notification_service
-                    import threading
-                    
-                    # Отправляем уведомление в отдельном потоке (не блокируя основной поток)
-                    def send_notification_thread():
-                        try:
-                            notification_service.notify_campaign_donation_sync(
-                                owner_tg_id=int(owner.tg_id),
-                                campaign_title=campaign.title,
-                                donation_amount=amount,
-                                currency=campaign.currency or "RUB",
-                                total_collected=float(campaign.collected_amount),
-                                goal_amount=float(campaign.goal_amount)
-                            )
-                        except Exception as e:
-                            logger.warning(f"Не удалось отправить уведомление организатору: {e}")
-                    
-                    # Запускаем в отдельном потоке
-                    thread = threading.Thread(target=send_notification_thread, daemon=True)
-                    thread.start()
-                        
-            except Exception as e:
-                logger.warning(f"Ошибка при подготовке уведомления организатору: {e}")
-            
-            # Если цель достигнута, отправляем уведомление о завершении
-            if goal_reached:
-                try:
-                    owner = db.query(User).filter(User.id == campaign.owner_id).first()
-                    if owner and owner.tg_id:
-                        from app.services import notification_service
-                        import threading
-                        
-                        def send_completion_notification_thread():
-                            try:
-                                # Используем асинхронную версию для завершения
-                                message = f"""✅ <b>Кампания успешно завершена!</b>
+    ln(exp(score) + participants * exp(λt)) в виде, не переполняющем
+    double: max(a, b) + ln(1 + exp(-|a - b|))
+    """
+    current = Campaign.trending_score
+    added = func.ln(cast(participants, Float)) + _trending_exponent()
+    return func.greatest(current, added) + func.ln(1 + func.exp(-func.abs(current - added)))
+
+
+async def recompute_trending_scores(db: AsyncSession) -> int:
+    """
+    Пересчитать trending_score всех кампаний по завершённым пожертвованиям
+    
+    Нужен после смены TRENDING_HALF_LIFE_HOURS: при обычной работе счёт
+    поддерживается обновлением прогресса.
+    
+    Returns:
+        Количество обновлённых кампаний
+    """
+    rate = math.log(2) / (settings.TRENDING_HALF_LIFE_HOURS * 3600)
+    weights = select(
+        Donation.campaign_id,
+        (
+            (extract("epoch", func.coalesce(Donation.completed_at, Donation.created_at)) - TRENDING_EPOCH.timestamp())
+            * rate
+        ).label("exponent")
+    ).where(
+        Donation.campaign_id.isnot(None),
+        Donation.status == DonationStatus.COMPLETED
+    ).subquery("weights")
+    # ln(sum(exp(x))) = max(x) + ln(sum(exp(x - max(x)))): без переполнения exp
+    peak = func.max(weights.c.exponent).over(partition_by=weights.c.campaign_id)
+    shifted = select(weights.c.campaign_id, weights.c.exponent, peak.label("peak")).subquery("shifted")
+    scores = select(
+        shifted.c.campaign_id,
+        (shifted.c.peak + func.ln(func.sum(func.exp(shifted.c.exponent - shifted.c.peak)))).label("score")
+    ).group_by(shifted.c.campaign_id, shifted.c.peak).subquery("scores")
+    
+    await db.execute(update(Campaign).values(trending_score=0))
+    result = await db.execute(
+        update(Campaign).where(Campaign.id == scores.c.campaign_id).values(trending_score=scores.c.score)
+    )
+    await db.commit()
+    _mark_listings_invalidated()
+    campaign_listing_cache.clear()
+    return result.rowcount
+
+
+def _progress_update(stmt, amount, participants):
+    """
+    UPDATE campaigns: прибавить сумму и участников (и трендовость),
+    ACTIVE -> COMPLETED при достижении цели; RETURNING кампании, tg_id владельца и флага goal_reached
+    """
+    new_amount = func.coalesce(Campaign.collected_amount, 0) + amount
+    return (
+        stmt.values(
+            collected_amount=new_amount,
+            participants_count=func.coalesce(Campaign.participants_count, 0) + participants,
+            trending_score=_trending_bump(participants),
+            status=case(
+                (
+                    and_(Campaign.status == CampaignStatus.ACTIVE, new_amount >= Campaign.goal_amount),
+                    literal(CampaignStatus.COMPLETED, type_=Campaign.status.type)
+                ),
+                else_=Campaign.status
+            )
+        )
+        # В RETURNING колонки уже новые: цель достигнута этим обновлением,
+        # если кампания завершена, а без него сумма была меньше цели
+        .returning(
+            Campaign,
+            select(User.tg_id).where(User.id == Campaign.owner_id).scalar_subquery().label("owner_tg_id"),
+            and_(
+                Campaign.status == CampaignStatus.COMPLETED,
+                Campaign.collected_amount - amount < Campaign.goal_amount
+            ).label("goal_reached")
+        )
+    )
+
+
+async def _execute_progress_update(db: AsyncSession, stmt) -> list:
+    """Выполнить _progress_update; строки (кампания, owner_tg_id, goal_reached)"""
+    # Через from_statement, чтобы populate_existing обновил кампанию,
+    # если она уже загружена в эту сессию
+    orm_stmt = select(
+        Campaign, column("owner_tg_id"), column("goal_reached")
+    ).from_statement(stmt).execution_options(populate_existing=True)
+    return list((await db.execute(orm_stmt)).all())
+
+
+def _notify_donation(owner_tg_id: int, campaign: Campaign, amount: Decimal) -> None:
+    """Уведомление организатору о пожертвовании (в фоне, не блокируя ответ)"""
+    from app.services import notification_service
+    import threading
+    
+    title = campaign.title
+    currency = campaign.currency or "RUB"
+    total_collected = float(campaign.collected_amount)
+    goal_amount = float(campaign.goal_amount)
+    
+    # Отправляем уведомление в отдельном потоке (не блокируя основной поток)
+    def send_notification_thread():
+        try:
+            notification_service.notify_campaign_donation_sync(
+                owner_tg_id=int(owner_tg_id),
+                campaign_title=title,
+                donation_amount=float(amount),
+                currency=currency,
+                total_collected=total_collected,
+                goal_amount=goal_amount
+            )
+        except Exception as e:
+            logger.warning(f"Не удалось отправить уведомление организатору: {e}")
+    
+    threading.Thread(target=send_notification_thread, daemon=True).start()
+
+
+def _notify_goal_reached(owner_tg_id: int, campaign: Campaign) -> None:
+    """Уведомление организатору о завершении кампании (в фоне)"""
+    from app.services import notification_service
+    import threading
+    
+    message = f"""✅ <b>Кампания успешно завершена!</b>
 
 📋 <b>Кампания:</b> {campaign.title}
 
@@ -198,24 +636,163 @@ def update_campaign_progress(
 Отчёт о расходовании средств будет опубликован фондом-получателем.
 
 Благодарим вас за инициативу! 🙏"""
-                                
-                                notification_service.send_telegram_message_sync(
-                                    chat_id=int(owner.tg_id),
-                                    text=message
-                                )
-                            except Exception as e:
-                                logger.warning(f"Не удалось отправить уведомление о завершении: {e}")
-                        
-                        thread = threading.Thread(target=send_completion_notification_thread, daemon=True)
-                        thread.start()
-                except Exception as e:
-                    logger.warning(f"Ошибка при подготовке уведомления о завершении: {e}")
-        
+    
+    def send_completion_notification_thread():
+        try:
+            notification_service.send_telegram_message_sync(
+                chat_id=int(owner_tg_id),
+                text=message
+            )
+        except Exception as e:
+            logger.warning(f"Не удалось отправить уведомление о завершении: {e}")
+    
+    threading.Thread(target=send_completion_notification_thread, daemon=True).start()
+
+
+async def update_campaign_progress(
+    db: AsyncSession,
+    campaign_id: int,
+    amount: Union[Decimal, float],
+    send_notification: bool = True
+) -> Optional[Campaign]:
+    """
+    Обновить прогресс кампании (вызывается при успешном донате)
+    
+    Сумма, число участников и переход ACTIVE -> COMPLETED при достижении
+    цели меняются одним UPDATE ... RETURNING: параллельные вебхуки по одной
+    кампании не теряют обновления, а блокировка строки держится один запрос.
+    
+    При CAMPAIGN_COUNTER_SHARDS > 0 пожертвование пишется в одну из строк-дельт
+    кампании (см. flush_campaign_counters), а не в саму строку campaigns.
+    
+    Args:
+        send_notification: Отправлять ли уведомление организатору
+    """
+    amount = Decimal(str(amount))
+    
+    if settings.CAMPAIGN_COUNTER_SHARDS > 0:
+        return await _add_to_counter_shard(db, campaign_id, amount, send_notification)
+    
+    rows = await _execute_progress_update(
+        db, _progress_update(update(Campaign).where(Campaign.id == campaign_id), amount, 1)
+    )
+    if not rows:
+        return None
+    
+    campaign, owner_tg_id, goal_reached = rows[0]
+    if campaign.status in FINISHED_STATUSES:
+        # Отчёт пишется в той же транзакции, что и переход в COMPLETED
+        # (и пересчитывается, если платёж пришёл уже после завершения)
+        await refresh_campaign_reports(db, [campaign.id])
+    await db.commit()
+    
+    old_status = CampaignStatus.ACTIVE if goal_reached else campaign.status
+    invalidate_campaign_listings(campaign, old_status, campaign.status)
+    if goal_reached:
+        await _update_search_indexes([campaign])
+    
+    if send_notification and owner_tg_id:
+        _notify_donation(owner_tg_id, campaign, amount)
+        # Если цель достигнута, отправляем уведомление о завершении
+        if goal_reached:
+            _notify_goal_reached(owner_tg_id, campaign)
+    
     return campaign
 
 
-def moderate_campaign(
-    db: Session,
+async def _add_to_counter_shard(
+    db: AsyncSession,
+    campaign_id: int,
+    amount: Decimal,
+    send_notification: bool
+) -> Optional[Campaign]:
+    """Прибавить пожертвование к случайной строке-дельте кампании"""
+    from sqlalchemy.dialects.postgresql import insert
+    
+    # INSERT ... SELECT: для несуществующей кампании ничего не вставится
+    stmt = insert(CampaignCounterShard).from_select(
+        ["campaign_id", "shard", "amount", "participants"],
+        select(
+            Campaign.id,
+            literal(random.randrange(settings.CAMPAIGN_COUNTER_SHARDS)),
+            literal(amount, type_=CampaignCounterShard.amount.type),
+            literal(1)
+        ).where(Campaign.id == campaign_id)
+    )
+    stmt = stmt.on_conflict_do_update(
+        index_elements=[CampaignCounterShard.campaign_id, CampaignCounterShard.shard],
+        set_={
+            "amount": CampaignCounterShard.amount + stmt.excluded.amount,
+            "participants": CampaignCounterShard.participants + stmt.excluded.participants,
+        }
+    ).returning(CampaignCounterShard.campaign_id)
+    
+    if (await db.execute(stmt)).first() is None:
+        return None
+    await db.commit()
+    
+    # Чтение кампании с дельтами не блокирует строку campaigns
+    campaign = await get_campaign(db, campaign_id)
+    if campaign is None:
+        return None
+    invalidate_campaign_listings(campaign)
+    
+    if send_notification:
+        owner = await db.get(User, campaign.owner_id)
+        if owner and owner.tg_id:
+            _notify_donation(owner.tg_id, campaign, amount)
+    
+    return campaign
+
+
+async def flush_campaign_counters(db: AsyncSession) -> List[Campaign]:
+    """
+    Перенести строки-дельты в campaigns (write-behind)
+    
+    Один запрос: DELETE ... RETURNING забирает все дельты, они суммируются
+    по кампаниям и прибавляются тем же UPDATE, что и при прямой записи,
+    включая переход в COMPLETED. Дельта, записанная параллельно, либо
+    попадает в этот перенос, либо остаётся новой строкой до следующего.
+    
+    Returns:
+        Обновлённые кампании
+    """
+    moved = delete(CampaignCounterShard).returning(
+        CampaignCounterShard.campaign_id,
+        CampaignCounterShard.amount,
+        CampaignCounterShard.participants
+    ).cte("moved")
+    totals = select(
+        moved.c.campaign_id,
+        func.sum(moved.c.amount).label("amount"),
+        func.sum(moved.c.participants).label("participants")
+    ).group_by(moved.c.campaign_id).cte("totals")
+    
+    rows = await _execute_progress_update(
+        db,
+        _progress_update(
+            update(Campaign).where(Campaign.id == totals.c.campaign_id),
+            totals.c.amount,
+            totals.c.participants
+        )
+    )
+    finished = [campaign.id for campaign, _, _ in rows if campaign.status in FINISHED_STATUSES]
+    if finished:
+        await refresh_campaign_reports(db, finished)
+    await db.commit()
+    
+    for campaign, owner_tg_id, goal_reached in rows:
+        old_status = CampaignStatus.ACTIVE if goal_reached else campaign.status
+        invalidate_campaign_listings(campaign, old_status, campaign.status)
+        if goal_reached and owner_tg_id:
+            _notify_goal_reached(owner_tg_id, campaign)
+    await _update_search_indexes([campaign for campaign, _, goal_reached in rows if goal_reached])
+    
+    return [row[0] for row in rows]
+
+
+async def moderate_campaign(
+    db: AsyncSession,
     campaign_id: int,
     moderator_id: int,
     action: str,
@@ -229,7 +806,7 @@ def moderate_campaign(
     """
     from datetime import datetime
     
-    campaign = db.query(Campaign).filter(Campaign.id == campaign_id).first()
+    campaign = await db.get(Campaign, campaign_id)
     if not campaign:
         raise ValueError("Campaign not found")
     
@@ -249,28 +826,92 @@ def moderate_campaign(
     else:
         raise ValueError("Invalid action")
     
-    db.commit()
-    db.refresh(campaign)
+    await db.commit()
+    await db.refresh(campaign)
+    invalidate_campaign_listings(campaign, CampaignStatus.PENDING, campaign.status)
+    await _update_search_indexes([campaign])
+    
+    if campaign.status == CampaignStatus.ACTIVE:
+        # Завершение точно в срок, а не на следующем часовом проходе
+        from app.core.deadlines import campaign_deadlines
+        campaign_deadlines.add(campaign.id, campaign.end_date)
     
     return campaign
 
 
-def check_and_expire_campaigns(db: Session) -> List[Campaign]:
-    """
-    Проверить и завершить истекшие кампании
-    Вызывается периодически (через cron или задачу)
+async def expire_campaigns(
+    db: AsyncSession,
+    campaign_ids: Optional[List[int]] = None,
+    batch_size: Optional[int] = None
+) -> List[Campaign]:
     """
-    from datetime import datetime
+    Перевести истёкшие активные кампании в EXPIRED
     
-    expired_campaigns = db.query(Campaign).filter(
-        Campaign.status == CampaignStatus.ACTIVE,
-        Campaign.end_date < datetime.utcnow()
-    ).all()
+    Пачками по batch_size: UPDATE ... WHERE id IN (SELECT ... FOR UPDATE
+    SKIP LOCKED LIMIT n) RETURNING - без загрузки кампаний до обновления,
+    каждая пачка в своей транзакции вместе с отчётами кампаний. Условие
+    (ACTIVE и end_date <= now()) проверяется в самом UPDATE, поэтому
+    устаревшие id из таймера безопасны.
     
-    for campaign in expired_campaigns:
-        campaign.status = CampaignStatus.EXPIRED
+    Args:
+        campaign_ids: только эти кампании (срабатывание таймера); None - все
     
-    db.commit()
+    Returns:
+        Завершённые кампании
+    """
+    batch_size = batch_size or settings.CAMPAIGN_EXPIRY_BATCH_SIZE
+    expired: List[Campaign] = []
     
-    return expired_campaigns
+    while True:
+        due = select(Campaign.id).where(
+            Campaign.status == CampaignStatus.ACTIVE,
+            Campaign.end_date <= func.now()
+        )
+        if campaign_ids is not None:
+            due = due.where(Campaign.id.in_(campaign_ids))
+        due = due.order_by(Campaign.end_date).limit(batch_size).with_for_update(skip_locked=True)
+        
+        stmt = (
+            update(Campaign)
+            .where(Campaign.id.in_(due.scalar_subquery()))
+            .values(status=CampaignStatus.EXPIRED)
+            .returning(Campaign)
+        )
+        batch = list((await db.execute(
+            select(Campaign).from_statement(stmt).execution_options(populate_existing=True)
+        )).scalars().all())
+        
+        if batch:
+            await refresh_campaign_reports(db, [campaign.id for campaign in batch])
+        await db.commit()
+        
+        for campaign in batch:
+            invalidate_campaign_listings(campaign, CampaignStatus.ACTIVE, CampaignStatus.EXPIRED)
+        await _update_search_indexes(batch)
+        expired.extend(batch)
+        
+        if len(batch) < batch_size:
+            return expired
+
+
+async def check_and_expire_campaigns(db: AsyncSession) -> List[Campaign]:
+    """
+    Проверить и завершить истекшие кампании
+    Вызывается периодически (через cron или задачу)
+    """
+    return await expire_campaigns(db)
+
 
+async def get_upcoming_deadlines(
+    db: AsyncSession,
+    until: Optional[datetime] = None,
+    campaign_ids: Optional[List[int]] = None
+) -> List[Tuple[int, datetime]]:
+    """(id, end_date) активных кампаний, истекающих до until (индекс status, end_date)"""
+    query = select(Campaign.id, Campaign.end_date).where(Campaign.status == CampaignStatus.ACTIVE)
+    if until is not None:
+        query = query.where(Campaign.end_date <= until)
+    if campaign_ids is not None:
+        query = query.where(Campaign.id.in_(campaign_ids))
+    result = await db.execute(query.order_by(Campaign.end_date))
+    return [(row.id, row.end_date) for row in result.all()]
@@ -1,47 +1,128 @@
 """
 Сервис для работы с пожертвованиями
 """
-from sqlalchemy.orm import Session
-from typing import Optional
+from sqlalchemy import select, update, literal, exists, func
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.ext.asyncio import AsyncSession
+from typing import Optional, NamedTuple, Dict, Tuple
+from app.core.config import settings
 from app.models import User, Donation
 from app.schemas.donation import DonationInit
 from app.services.payment import payment_service
 from datetime import datetime
 from app.models.donation import DonationStatus
 import logging
+import time
 
 logger = logging.getLogger(__name__)
 
 
-def get_or_create_user(
-    db: Session,
+class UserIdentity(NamedTuple):
+    """Лёгкое представление пользователя для зависимостей авторизации"""
+    id: int
+    tg_id: int
+    first_name: Optional[str]
+    last_name: Optional[str]
+    username: Optional[str]
+
+
+# Кэш процесса: tg_id -> (срок годности, пользователь)
+_user_cache: Dict[int, Tuple[float, UserIdentity]] = {}
+
+
+def _get_cached_user(tg_id: int) -> Optional[UserIdentity]:
+    entry = _user_cache.get(tg_id)
+    if entry is None:
+        return None
+    expires_at, user = entry
+    if expires_at <= time.monotonic():
+        _user_cache.pop(tg_id, None)
+        return None
+    return user
+
+
+def _cache_user(user: UserIdentity) -> None:
+    if len(_user_cache) >= settings.USER_CACHE_SIZE:
+        now = time.monotonic()
+        for key in [k for k, (expires_at, _) in _user_cache.items() if expires_at <= now]:
+            del _user_cache[key]
+        if len(_user_cache) >= settings.USER_CACHE_SIZE:
+            _user_cache.clear()
+    _user_cache[user.tg_id] = (time.monotonic() + settings.USER_CACHE_TTL, user)
+
+
+async def get_or_create_user(
+    db: AsyncSession,
     tg_id: int,
     first_name: Optional[str] = None,
     last_name: Optional[str] = None,
     username: Optional[str] = None
-) -> User:
-    """Получить или создать пользователя"""
-    user = db.query(User).filter(User.tg_id == tg_id).first()
-    is_new = False
-    if not user:
-        user = User(
-            tg_id=tg_id,
-            first_name=first_name,
-            last_name=last_name,
-            username=username
+) -> UserIdentity:
+    """
+    Получить или создать пользователя
+
+    Если пользователь есть в кэше и профиль из initData не изменился,
+    запроса к БД нет. Иначе - один INSERT ... ON CONFLICT (tg_id) DO UPDATE,
+    который пишет строку только при изменении first_name/last_name/username;
+    если изменений нет, тот же запрос возвращает существующую строку
+    (при одновременном первом входе - повторный SELECT).
+    """
+    cached = _get_cached_user(tg_id)
+    if cached is not None and (cached.first_name, cached.last_name, cached.username) == (first_name, last_name, username):
+        return cached
+
+    user_columns = (User.id, User.tg_id, User.first_name, User.last_name, User.username)
+
+    stmt = insert(User).values(
+        tg_id=tg_id,
+        first_name=first_name,
+        last_name=last_name,
+        username=username
+    )
+    upserted = stmt.on_conflict_do_update(
+        index_elements=[User.tg_id],
+        set_={
+            "first_name": stmt.excluded.first_name,
+            "last_name": stmt.excluded.last_name,
+            "username": stmt.excluded.username,
+            "updated_at": func.now(),
+        },
+        where=(
+            User.first_name.is_distinct_from(stmt.excluded.first_name)
+            | User.last_name.is_distinct_from(stmt.excluded.last_name)
+            | User.username.is_distinct_from(stmt.excluded.username)
         )
-        db.add(user)
-        db.commit()
-        db.refresh(user)
-        is_new = True
+    ).returning(*user_columns, literal(True).label("written")).cte("upserted")
+
+    # Если строка не изменилась, DO UPDATE ... WHERE ничего не возвращает -
+    # тогда берём существующую строку в том же запросе
+    existing = select(*user_columns, literal(False).label("written")).where(User.tg_id == tg_id)
+    query = select(upserted).union_all(existing.where(~exists(select(upserted.c.id))))
+    row = (await db.execute(query)).first()
+    if row is None:
+        # Гонка первых входов: параллельный запрос вставил строку и
+        # зафиксировал её после снимка этого выражения - конфликт без
+        # изменений ничего не вернул, а SELECT её не видит. Новое выражение
+        # берёт новый снимок (READ COMMITTED) и строку находит
+        row = (await db.execute(existing)).one()
+    if row.written:
+        await db.commit()
     
     # Синхронизация нового пользователя с e-replika.ru будет вызвана из API эндпоинта через BackgroundTasks
     
+    user = UserIdentity(
+        id=row.id,
+        tg_id=row.tg_id,
+        first_name=row.first_name,
+        last_name=row.last_name,
+        username=row.username
+    )
+    _cache_user(user)
     return user
 
 
-def init_donation(
-    db: Session,
+async def init_donation(
+    db: AsyncSession,
     user_id: int,
     donation_data: DonationInit,
     return_url: Optional[str] = None
@@ -50,7 +131,9 @@ def init_donation(
     Инициализировать пожертвование
     Создает запись и генерирует платежную ссылку
     """
-    donation = Donation(
+    # INSERT/UPDATE ... RETURNING вместо add + refresh: серверные значения
+    # (id, created_at) приходят тем же запросом, без повторного SELECT
+    stmt = insert(Donation).values(
         user_id=user_id,
         fund_id=donation_data.fund_id,
         campaign_id=donation_data.campaign_id,
@@ -58,27 +141,31 @@ def init_donation(
         currency=donation_data.currency,
         donation_type=donation_data.donation_type,
         status=DonationStatus.PENDING
-    )
-    db.add(donation)
-    db.commit()
-    db.refresh(donation)
+    ).returning(Donation)
+    donation = (await db.execute(select(Donation).from_statement(stmt))).scalar_one()
+    # Запись должна существовать до обращения к провайдеру (вебхук ищет её по id)
+    await db.commit()
     
     # Инициализация платежа через платежный сервис
-    payment_result = payment_service.init_payment(
+    payment_result = await payment_service.init_payment(
         amount=float(donation_data.amount_value),
         currency=donation_data.currency,
         order_id=str(donation.id),
-        return_url=return_url
+        return_url=return_url,
+        card_bin=donation_data.card_bin
     )
     
     # Обновляем donation с данными платежа
-    donation.payment_id = payment_result.get("payment_id")
-    donation.payment_url = payment_result.get("payment_url")
-    donation.provider = payment_result.get("provider")
-    donation.status = DonationStatus.PROCESSING
-    
-    db.commit()
-    db.refresh(donation)
+    stmt = update(Donation).where(Donation.id == donation.id).values(
+        payment_id=payment_result.get("payment_id"),
+        payment_url=payment_result.get("payment_url"),
+        provider=payment_result.get("provider"),
+        status=DonationStatus.PROCESSING
+    ).returning(Donation)
+    donation = (await db.execute(
+        select(Donation).from_statement(stmt).execution_options(populate_existing=True)
+    )).scalar_one()
+    await db.commit()
     
     # Синхронизация с e-replika.ru будет вызвана из API эндпоинта через BackgroundTasks
     # Это позволяет не блокировать ответ и корректно обрабатывать async
@@ -86,16 +173,19 @@ def init_donation(
     return donation
 
 
-def get_donation(db: Session, donation_id: int, user_id: int) -> Optional[Donation]:
+async def get_donation(db: AsyncSession, donation_id: int, user_id: int) -> Optional[Donation]:
     """Получить пожертвование по ID"""
-    return db.query(Donation).filter(
-        Donation.id == donation_id,
-        Donation.user_id == user_id
-    ).first()
+    result = await db.execute(
+        select(Donation).where(
+            Donation.id == donation_id,
+            Donation.user_id == user_id
+        )
+    )
+    return result.scalars().first()
 
 
-def update_donation_status(
-    db: Session,
+async def update_donation_status(
+    db: AsyncSession,
     donation_id: int,
     status: DonationStatus,
     payment_id: Optional[str] = None
@@ -103,7 +193,7 @@ def update_donation_status(
     """Обновить статус пожертвования (для вебхуков)"""
     from app.services import campaign_service
     
-    donation = db.query(Donation).filter(Donation.id == donation_id).first()
+    donation = await db.get(Donation, donation_id)
     if donation:
         donation.status = status
         if payment_id:
@@ -113,13 +203,13 @@ def update_donation_status(
             
             # Обновляем прогресс кампании, если пожертвование связано с кампанией
             if donation.campaign_id:
-                campaign_service.update_campaign_progress(
+                await campaign_service.update_campaign_progress(
                     db=db,
                     campaign_id=donation.campaign_id,
-                    amount=float(donation.amount_value)
+                    amount=donation.amount_value
                 )
         
-        db.commit()
-        db.refresh(donation)
+        await db.commit()
+        await db.refresh(donation)
     return donation
 
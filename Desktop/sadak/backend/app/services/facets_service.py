@@ -0,0 +1,167 @@
+"""
+Счётчики для панели фильтров: активные кампании и проверенные фонды
+по категориям и странам
+
+Счётчики живут в памяти процесса, GET /campaigns/facets не обращается к БД.
+Для каждой учтённой записи хранятся её значения, поэтому обновление
+идемпотентно: кампании обновляются из campaign_service при смене статуса
+(см. invalidate_campaign_listings), фонды - при проверке. Целиком счётчики
+перечитываются при старте и раз в FACETS_REBUILD_MINUTES (изменения в
+других воркерах и в обход сервисов).
+"""
+from collections import Counter
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+from typing import Dict, Iterable, List, Optional, Tuple
+from app.models import Campaign, Fund
+from app.models.campaign import CampaignStatus
+
+# Значения записи по фасетам: (категории, страны)
+FacetValues = Tuple[Tuple[str, ...], Tuple[str, ...]]
+
+FACETS = ("categories", "countries")
+
+
+class FacetCounts:
+    """Счётчики значений по набору записей (запись -> её значения)"""
+
+    def __init__(self):
+        self._items: Dict[int, FacetValues] = {}
+        self._counts: Tuple[Counter, ...] = tuple(Counter() for _ in FACETS)
+        # Пока идёт перечитывание, изменения копятся здесь и
+        # применяются к новым счётчикам после подмены
+        self._pending: Optional[List[Tuple[int, Optional[FacetValues]]]] = None
+
+    def __len__(self) -> int:
+        return len(self._items)
+
+    def _put(self, item_id: int, values: Optional[FacetValues]) -> None:
+        old = self._items.pop(item_id, None)
+        if old is not None:
+            for counts, old_values in zip(self._counts, old):
+                counts.subtract(old_values)
+                for value in old_values:
+                    if counts[value] <= 0:
+                        del counts[value]
+        if values is not None:
+            self._items[item_id] = values
+            for counts, new_values in zip(self._counts, values):
+                counts.update(new_values)
+
+    def put(self, item_id: int, values: Optional[FacetValues]) -> bool:
+        """
+        Учесть запись с такими значениями; values=None - убрать её из счётчиков
+
+        Returns:
+            Изменились ли счётчики
+        """
+        if self._pending is not None:
+            self._pending.append((item_id, values))
+        if self._items.get(item_id) == values:
+            return False
+        self._put(item_id, values)
+        return True
+
+    def replace(self, items: Dict[int, FacetValues]) -> None:
+        """Подменить содержимое и доиграть изменения, пришедшие во время перечитывания"""
+        pending = self._pending or []
+        self._items = {}
+        self._counts = tuple(Counter() for _ in FACETS)
+        self._pending = None
+        for item_id, values in items.items():
+            self._put(item_id, values)
+        for item_id, values in pending:
+            self._put(item_id, values)
+
+    def snapshot(self) -> Dict:
+        """total и списки {value, count} по фасетам, больше записей - выше"""
+        result = {"total": len(self._items)}
+        for facet, counts in zip(FACETS, self._counts):
+            result[facet] = [
+                {"value": value, "count": count}
+                for value, count in sorted(counts.items(), key=lambda item: (-item[1], item[0]))
+            ]
+        return result
+
+
+campaign_facets = FacetCounts()
+fund_facets = FacetCounts()
+
+# Готовый ответ GET /campaigns/facets; сбрасывается при любом изменении
+_snapshot: Optional[Dict] = None
+
+
+def _values(*facets: Iterable[Optional[str]]) -> FacetValues:
+    return tuple(tuple(value for value in values if value) for values in facets)
+
+
+def _campaign_values(category: Optional[str], country_code: Optional[str]) -> FacetValues:
+    return _values((category,), (country_code,))
+
+
+def _fund_values(categories: Optional[List[str]], country_code: Optional[str]) -> FacetValues:
+    return _values(sorted(set(categories or ())), (country_code,))
+
+
+async def rebuild_facets(db: AsyncSession) -> int:
+    """
+    Перечитать счётчики из БД
+
+    Returns:
+        Количество учтённых кампаний и фондов
+    """
+    global _snapshot
+
+    campaign_facets._pending = []
+    fund_facets._pending = []
+    try:
+        campaigns = (await db.execute(
+            select(Campaign.id, Campaign.category, Campaign.effective_country_code)
+            .where(Campaign.status == CampaignStatus.ACTIVE)
+        )).all()
+        funds = (await db.execute(
+            select(Fund.id, Fund.categories, Fund.country_code).where(Fund.verified.is_(True))
+        )).all()
+    except Exception:
+        campaign_facets._pending = None
+        fund_facets._pending = None
+        raise
+
+    campaign_facets.replace({
+        row.id: _campaign_values(row.category, row.effective_country_code) for row in campaigns
+    })
+    fund_facets.replace({
+        row.id: _fund_values(row.categories, row.country_code) for row in funds
+    })
+    _snapshot = None
+    return len(campaign_facets) + len(fund_facets)
+
+
+def update_campaign(campaign: Campaign) -> None:
+    """Учесть смену статуса кампании: активные считаются, остальные - нет"""
+    global _snapshot
+
+    values = None
+    if campaign.status == CampaignStatus.ACTIVE:
+        values = _campaign_values(campaign.category, campaign.effective_country_code)
+    # Пожертвования статус не меняют - готовый ответ остаётся
+    if campaign_facets.put(campaign.id, values):
+        _snapshot = None
+
+
+def update_fund(fund: Fund) -> None:
+    """Учесть проверку фонда: проверенные считаются, остальные - нет"""
+    global _snapshot
+
+    values = _fund_values(fund.categories, fund.country_code) if fund.verified else None
+    if fund_facets.put(fund.id, values):
+        _snapshot = None
+
+
+def get_facets() -> Dict:
+    """Счётчики для панели фильтров: {campaigns: ..., funds: ...}"""
+    global _snapshot
+
+    if _snapshot is None:
+        _snapshot = {"campaigns": campaign_facets.snapshot(), "funds": fund_facets.snapshot()}
+    return _snapshot
@@ -1,14 +1,17 @@
 """
 Сервис для работы с фондами
 """
-from sqlalchemy.orm import Session
-from sqlalchemy import and_
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
 from typing import Optional, List
-from app.models import Fund
+from app.models import Campaign, Fund
+import logging
 
+logger = logging.getLogger(__name__)
 
-def get_funds(
-    db: Session,
+
+async def get_funds(
+    db: AsyncSession,
     country_code: Optional[str] = None,
     category: Optional[str] = None,
     verified: Optional[bool] = None,
@@ -16,21 +19,88 @@ def get_funds(
     limit: int = 100
 ) -> List[Fund]:
     """Получить список фондов с фильтрацией"""
-    query = db.query(Fund)
+    query = select(Fund)
     
     if country_code:
-        query = query.filter(Fund.country_code == country_code)
+        query = query.where(Fund.country_code == country_code)
     
     if category:
-        query = query.filter(Fund.categories.contains([category]))
+        query = query.where(Fund.categories.contains([category]))
     
     if verified is not None:
-        query = query.filter(Fund.verified == verified)
+        query = query.where(Fund.verified == verified)
     
-    return query.offset(skip).limit(limit).all()
+    result = await db.execute(query.offset(skip).limit(limit))
+    return list(result.scalars().all())
 
 
-def get_fund(db: Session, fund_id: int) -> Fund:
+async def get_fund(db: AsyncSession, fund_id: int) -> Fund:
     """Получить фонд по ID"""
-    return db.query(Fund).filter(Fund.id == fund_id).first()
+    return await db.get(Fund, fund_id)
+
+
+async def set_fund_verified(db: AsyncSession, fund_id: int, verified: bool = True) -> Fund:
+    """
+    Отметить фонд как проверенный (или снять отметку)
+    
+    Проверенные фонды попадают в поиск, автодополнение и счётчики панели
+    фильтров - они обновляются сразу, не дожидаясь полного перечитывания.
+    """
+    from app.services import autocomplete_service, facets_service
+    from app.services.search import search_backend
+    
+    fund = await db.get(Fund, fund_id)
+    if not fund:
+        raise ValueError("Fund not found")
+    
+    fund.verified = verified
+    await db.commit()
+    await db.refresh(fund)
+    
+    facets_service.update_fund(fund)
+    autocomplete_service.autocomplete_index.put("fund", fund.id, fund.name if fund.verified else None)
+    try:
+        await search_backend.index_funds([fund])
+    except Exception as e:
+        logger.warning(f"Не удалось обновить поисковый индекс фондов: {e}")
+    
+    logger.info(f"Фонд {fund.id}: verified={fund.verified}")
+    
+    return fund
 
+
+async def set_fund_country(db: AsyncSession, fund_id: int, country_code: Optional[str]) -> Fund:
+    """
+    Сменить страну фонда
+    
+    Триггер funds_propagate_country переносит её в effective_country_code
+    кампаний фонда без собственной страны; их страницы листинга (старой
+    и новой страны), лента срочных и счётчики фильтров обновляются сразу.
+    """
+    from app.services import campaign_service, facets_service
+    
+    fund = await db.get(Fund, fund_id)
+    if not fund:
+        raise ValueError("Fund not found")
+    
+    previous_country_code = fund.country_code
+    if country_code == previous_country_code:
+        return fund
+    
+    fund.country_code = country_code
+    await db.commit()
+    await db.refresh(fund)
+    
+    # effective_country_code записан триггером - перечитываем кампании из БД
+    campaigns = (await db.execute(
+        select(Campaign)
+        .where(Campaign.fund_id == fund.id, Campaign.country_code.is_(None))
+        .execution_options(populate_existing=True)
+    )).scalars().all()
+    for campaign in campaigns:
+        campaign_service.invalidate_campaign_listings(campaign, previous_country_code=previous_country_code)
+    facets_service.update_fund(fund)
+    
+    logger.info(f"Фонд {fund.id}: country_code={previous_country_code} -> {country_code}")
+    
+    return fund
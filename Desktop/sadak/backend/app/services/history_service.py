@@ -1,14 +1,15 @@
 """
 Сервис для истории транзакций
 """
-from sqlalchemy.orm import Session
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
 from typing import List, Dict, Any
 from app.models import Donation, Subscription
 from datetime import datetime
 
 
-def get_user_history(
-    db: Session,
+async def get_user_history(
+    db: AsyncSession,
     user_id: int,
     limit: int = 50
 ) -> List[Dict[str, Any]]:
@@ -18,9 +19,11 @@ def get_user_history(
     history = []
     
     # Пожертвования
-    donations = db.query(Donation).filter(
-        Donation.user_id == user_id
-    ).order_by(Donation.created_at.desc()).limit(limit).all()
+    donations = (await db.execute(
+        select(Donation).where(
+            Donation.user_id == user_id
+        ).order_by(Donation.created_at.desc()).limit(limit)
+    )).scalars().all()
     
     for donation in donations:
         history.append({
@@ -37,9 +40,11 @@ def get_user_history(
         })
     
     # Подписки
-    subscriptions = db.query(Subscription).filter(
-        Subscription.user_id == user_id
-    ).order_by(Subscription.created_at.desc()).limit(limit).all()
+    subscriptions = (await db.execute(
+        select(Subscription).where(
+            Subscription.user_id == user_id
+        ).order_by(Subscription.created_at.desc()).limit(limit)
+    )).scalars().all()
     
     for subscription in subscriptions:
         history.append({
@@ -66,7 +66,8 @@ async def send_telegram_message(
     chat_id: int,
     text: str,
     parse_mode: str = "HTML",
-    disable_notification: bool = False
+    disable_notification: bool = False,
+    client: Optional[httpx.AsyncClient] = None
 ) -> bool:
     """
     Отправить сообщение пользователю через Telegram Bot API
@@ -76,6 +77,8 @@ async def send_telegram_message(
         text: Текст сообщения
         parse_mode: Режим парсинга (HTML или Markdown)
         disable_notification: Отключить уведомление
+        client: Общий клиент для серии отправок (соединение с API
+            переиспользуется); без него создаётся клиент на одно сообщение
         
     Returns:
         True если успешно, False если ошибка
@@ -86,29 +89,31 @@ async def send_telegram_message(
     
     bot_api_url = f"https://api.telegram.org/bot{settings.TELEGRAM_BOT_TOKEN}/sendMessage"
     
+    payload = {
+        "chat_id": chat_id,
+        "text": text,
+        "parse_mode": parse_mode,
+        "disable_notification": disable_notification,
+    }
+    
     try:
-        async with httpx.AsyncClient(timeout=10.0) as client:
-            response = await client.post(
-                bot_api_url,
-                json={
-                    "chat_id": chat_id,
-                    "text": text,
-                    "parse_mode": parse_mode,
-                    "disable_notification": disable_notification,
-                }
-            )
-            
-            if response.status_code == 200:
-                result = response.json()
-                if result.get("ok"):
-                    logger.info(f"Уведомление отправлено пользователю {chat_id}")
-                    return True
-                else:
-                    logger.error(f"Ошибка отправки уведомления: {result.get('description')}")
-                    return False
+        if client is not None:
+            response = await client.post(bot_api_url, json=payload)
+        else:
+            async with httpx.AsyncClient(timeout=10.0) as own_client:
+                response = await own_client.post(bot_api_url, json=payload)
+        
+        if response.status_code == 200:
+            result = response.json()
+            if result.get("ok"):
+                logger.info(f"Уведомление отправлено пользователю {chat_id}")
+                return True
             else:
-                logger.error(f"HTTP ошибка при отправке уведомления: {response.status_code}")
+                logger.error(f"Ошибка отправки уведомления: {result.get('description')}")
                 return False
+        else:
+            logger.error(f"HTTP ошибка при отправке уведомления: {response.status_code}")
+            return False
                 
     except Exception as e:
         logger.error(f"Ошибка при отправке уведомления пользователю {chat_id}: {e}", exc_info=True)
@@ -221,7 +226,8 @@ async def notify_campaign_expired(
     total_collected: float,
     goal_amount: float,
     participants_count: int,
-    currency: str = "RUB"
+    currency: str = "RUB",
+    client: Optional[httpx.AsyncClient] = None
 ) -> bool:
     """
     Уведомить организатора об истечении срока кампании
@@ -233,6 +239,7 @@ async def notify_campaign_expired(
         goal_amount: Целевая сумма
         participants_count: Количество участников
         currency: Валюта
+        client: Общий httpx-клиент (см. send_telegram_message)
         
     Returns:
         True если успешно
@@ -249,5 +256,5 @@ async def notify_campaign_expired(
 
 Спасибо за вашу инициативу! 🙏"""
     
-    return await send_telegram_message(owner_tg_id, message)
+    return await send_telegram_message(owner_tg_id, message, client=client)
 
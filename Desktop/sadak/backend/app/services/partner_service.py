@@ -1,7 +1,8 @@
 """
 Сервис для работы с заявками на партнёрство фондов
 """
-from sqlalchemy.orm import Session
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
 from datetime import datetime
 from typing import Optional, List
 from app.models import PartnerApplication
@@ -12,8 +13,8 @@ import logging
 logger = logging.getLogger(__name__)
 
 
-def create_partner_application(
-    db: Session,
+async def create_partner_application(
+    db: AsyncSession,
     application_data: PartnerApplicationCreate
 ) -> PartnerApplication:
     """
@@ -31,16 +32,16 @@ def create_partner_application(
     )
     
     db.add(application)
-    db.commit()
-    db.refresh(application)
+    await db.commit()
+    await db.refresh(application)
     
     logger.info(f"Создана заявка на партнёрство: {application.id} - {application.organization_name}")
     
     return application
 
 
-def get_partner_applications(
-    db: Session,
+async def get_partner_applications(
+    db: AsyncSession,
     status: Optional[PartnerApplicationStatus] = None,
     country_code: Optional[str] = None,
     skip: int = 0,
@@ -49,31 +50,32 @@ def get_partner_applications(
     """
     Получить список заявок на партнёрство с фильтрацией
     """
-    query = db.query(PartnerApplication)
+    query = select(PartnerApplication)
     
     if status:
-        query = query.filter(PartnerApplication.status == status)
+        query = query.where(PartnerApplication.status == status)
     
     if country_code:
-        query = query.filter(PartnerApplication.country_code == country_code)
+        query = query.where(PartnerApplication.country_code == country_code)
     
-    return query.order_by(PartnerApplication.created_at.desc()).offset(skip).limit(limit).all()
+    result = await db.execute(
+        query.order_by(PartnerApplication.created_at.desc()).offset(skip).limit(limit)
+    )
+    return list(result.scalars().all())
 
 
-def get_partner_application(
-    db: Session,
+async def get_partner_application(
+    db: AsyncSession,
     application_id: int
 ) -> Optional[PartnerApplication]:
     """
     Получить заявку по ID
     """
-    return db.query(PartnerApplication).filter(
-        PartnerApplication.id == application_id
-    ).first()
+    return await db.get(PartnerApplication, application_id)
 
 
-def update_partner_application_status(
-    db: Session,
+async def update_partner_application_status(
+    db: AsyncSession,
     application_id: int,
     reviewer_id: int,
     status_update: PartnerApplicationStatusUpdate
@@ -82,9 +84,7 @@ def update_partner_application_status(
     Обновить статус заявки (одобрить/отклонить)
     Только администратор может изменять статус
     """
-    application = db.query(PartnerApplication).filter(
-        PartnerApplication.id == application_id
-    ).first()
+    application = await db.get(PartnerApplication, application_id)
     
     if not application:
         raise ValueError("Application not found")
@@ -99,8 +99,8 @@ def update_partner_application_status(
     if status_update.status == PartnerApplicationStatus.REJECTED:
         application.rejection_reason = status_update.rejection_reason
     
-    db.commit()
-    db.refresh(application)
+    await db.commit()
+    await db.refresh(application)
     
     logger.info(f"Заявка {application_id} обновлена: {status_update.status} пользователем {reviewer_id}")
     
@@ -0,0 +1,110 @@
+"""
+Таблица диапазонов BIN карт: страна, платёжная система и банк-эмитент
+
+Диапазоны читаются из CSV один раз при старте (PaymentService.open) и
+хранятся как отсортированные массивы начал и концов диапазонов. Поиск -
+bisect по массиву начал, без обращений к диску и БД в пути платежа.
+
+Формат CSV (первая строка - заголовок):
+
+    bin_from,bin_to,country,scheme,issuer
+    2200,2204,RU,mir,
+    4,4,,visa,
+
+BIN сравниваются на 8 знаках: bin_from дополняется нулями, bin_to -
+девятками, поэтому диапазон можно задать префиксом любой длины до 8.
+Диапазоны не должны пересекаться.
+"""
+import csv
+from array import array
+from bisect import bisect_right
+from pathlib import Path
+from typing import Dict, List, NamedTuple, Optional, Union
+
+BIN_LENGTH = 8
+
+CSV_COLUMNS = ("bin_from", "bin_to", "country", "scheme", "issuer")
+
+# Таблица по умолчанию: только диапазоны платёжных систем, без банков
+DEFAULT_BIN_TABLE = Path(__file__).with_name("bin_ranges.csv")
+
+
+class BinInfo(NamedTuple):
+    country: Optional[str]  # ISO 3166-1 alpha-2
+    scheme: Optional[str]   # visa, mastercard, mir, ...
+    issuer: Optional[str]
+
+
+def _bin_key(value: str, fill: str) -> int:
+    if not value.isdigit() or len(value) > BIN_LENGTH:
+        raise ValueError(f"Invalid BIN: {value!r}")
+    return int(value.ljust(BIN_LENGTH, fill))
+
+
+class BinTable:
+    """Непересекающиеся диапазоны BIN в отсортированных массивах"""
+
+    def __init__(self):
+        self._starts = array("L")
+        self._ends = array("L")
+        # Одинаковые BinInfo - один объект на все диапазоны
+        self._info: List[BinInfo] = []
+
+    def __len__(self) -> int:
+        return len(self._starts)
+
+    @classmethod
+    def load(cls, path: Union[str, Path]) -> "BinTable":
+        """
+        Прочитать таблицу из CSV
+
+        Raises:
+            ValueError: неверный BIN или пересекающиеся диапазоны
+        """
+        rows = []
+        interned: Dict[BinInfo, BinInfo] = {}
+        with open(path, newline="", encoding="utf-8") as file:
+            reader = csv.reader(file)
+            header = [name.strip() for name in next(reader, [])]
+            try:
+                columns = [header.index(name) for name in CSV_COLUMNS]
+            except ValueError:
+                raise ValueError(f"{path}: expected columns {', '.join(CSV_COLUMNS)}") from None
+            for line, row in enumerate(reader, start=2):
+                if not row:
+                    continue
+                bin_from, bin_to, country, scheme, issuer = (
+                    row[column].strip() if column < len(row) else "" for column in columns
+                )
+                try:
+                    start = _bin_key(bin_from, "0")
+                    end = _bin_key(bin_to, "9")
+                except ValueError as e:
+                    raise ValueError(f"{path}:{line}: {e}") from None
+                if start > end:
+                    raise ValueError(f"{path}:{line}: bin_from is greater than bin_to")
+                info = BinInfo(country.upper() or None, scheme.lower() or None, issuer or None)
+                rows.append((start, end, interned.setdefault(info, info)))
+
+        rows.sort(key=lambda item: item[0])
+        table = cls()
+        for start, end, info in rows:
+            if table._ends and start <= table._ends[-1]:
+                raise ValueError(f"{path}: BIN range {start}-{end} overlaps the previous one")
+            table._starts.append(start)
+            table._ends.append(end)
+            table._info.append(info)
+        return table
+
+    def lookup(self, card_bin: Optional[str]) -> Optional[BinInfo]:
+        """Данные диапазона, в который попадает BIN (6-8 первых цифр карты), или None"""
+        if not card_bin:
+            return None
+        try:
+            key = _bin_key(card_bin[:BIN_LENGTH], "0")
+        except ValueError:
+            return None
+        index = bisect_right(self._starts, key) - 1
+        if index >= 0 and key <= self._ends[index]:
+            return self._info[index]
+        return None
@@ -1,19 +1,132 @@
 """
 Сервис для работы с платежными системами
 Автоматический выбор между YooKassa и CloudPayments
+
+К каждому провайдеру - один долгоживущий httpx.AsyncClient с пулом
+соединений: keep-alive, TLS-рукопожатие платится один раз, а не на каждое
+пожертвование. Клиенты открываются при старте приложения (open) и
+закрываются при остановке (aclose).
+
+Провайдер выбирается по BIN карты (см. choose_providers): таблица
+диапазонов BIN загружается в память в open(), поиск - bisect без I/O.
 """
-from typing import Dict, Optional
+from typing import Dict, Optional, Tuple
 from app.core.config import settings
+from app.services.payment.bin_table import DEFAULT_BIN_TABLE, BinTable
 import httpx
 import logging
 
 logger = logging.getLogger(__name__)
 
+# Базовые URL API провайдеров
+PROVIDER_URLS = {
+    "yookassa": "https://api.yookassa.ru/v3",
+    "cloudpayments": "https://api.cloudpayments.ru",
+}
+
+# Порядок попыток: YooKassa - основной провайдер для РФ
+RUSSIAN_FIRST = ("yookassa", "cloudpayments")
+FOREIGN_FIRST = ("cloudpayments", "yookassa")
+
+# Иностранные карты, которые выгоднее проводить через CloudPayments
+CLOUDPAYMENTS_SCHEMES = frozenset({"visa", "mastercard"})
+
+
+def _provider_credentials(provider: str) -> Optional[tuple]:
+    """(логин, секрет) для Basic Auth или None, если провайдер не настроен"""
+    if provider == "yookassa":
+        credentials = (settings.YOOKASSA_SHOP_ID, settings.YOOKASSA_SECRET_KEY)
+    elif provider == "cloudpayments":
+        credentials = (settings.CLOUDPAYMENTS_PUBLIC_ID, settings.CLOUDPAYMENTS_API_SECRET)
+    else:
+        return None
+    return credentials if all(credentials) else None
+
 
 class PaymentService:
     """Сервис для инициализации платежей"""
     
-    def init_payment(
+    def __init__(self):
+        self._clients: Dict[str, httpx.AsyncClient] = {}
+        self.bins = BinTable()
+    
+    def _create_client(self, provider: str) -> httpx.AsyncClient:
+        return httpx.AsyncClient(
+            base_url=PROVIDER_URLS[provider],
+            auth=httpx.BasicAuth(*_provider_credentials(provider)),
+            headers={"Content-Type": "application/json"},
+            timeout=httpx.Timeout(
+                settings.PAYMENT_HTTP_READ_TIMEOUT,
+                connect=settings.PAYMENT_HTTP_CONNECT_TIMEOUT
+            ),
+            limits=httpx.Limits(
+                max_connections=settings.PAYMENT_HTTP_MAX_CONNECTIONS,
+                max_keepalive_connections=settings.PAYMENT_HTTP_MAX_CONNECTIONS,
+                keepalive_expiry=settings.PAYMENT_HTTP_KEEPALIVE_EXPIRY
+            )
+        )
+    
+    def _client(self, provider: str) -> httpx.AsyncClient:
+        """Клиент провайдера; без open() (скрипты) создаётся при первом платеже"""
+        client = self._clients.get(provider)
+        if client is None or client.is_closed:
+            client = self._clients[provider] = self._create_client(provider)
+        return client
+    
+    def open(self) -> None:
+        """Загрузить таблицу BIN и создать клиенты настроенных провайдеров (при старте приложения)"""
+        self.load_bins()
+        for provider in PROVIDER_URLS:
+            if _provider_credentials(provider):
+                self._client(provider)
+    
+    def load_bins(self, path: Optional[str] = None) -> int:
+        """
+        Загрузить таблицу диапазонов BIN (по умолчанию PAYMENT_BIN_TABLE_PATH)
+        
+        Таблица подменяется целиком; при ошибке остаётся прежняя и
+        провайдер выбирается по порядку по умолчанию.
+        
+        Returns:
+            Количество диапазонов в таблице
+        """
+        path = path or settings.PAYMENT_BIN_TABLE_PATH or DEFAULT_BIN_TABLE
+        try:
+            self.bins = BinTable.load(path)
+        except (OSError, ValueError) as e:
+            logger.error(f"BIN table {path} not loaded: {e}")
+        return len(self.bins)
+    
+    def choose_providers(
+        self,
+        card_bin: Optional[str],
+        amount: float,
+        currency: str = "RUB"
+    ) -> Tuple[str, ...]:
+        """
+        Порядок провайдеров для платежа
+        
+        - Российская карта или МИР -> YooKassa, затем CloudPayments
+        - Иностранная Visa/MC и сумма < PAYMENT_CLOUDPAYMENTS_MAX_AMOUNT RUB
+          (или платёж не в рублях) -> CloudPayments, затем YooKassa
+        - Неизвестный BIN, иностранная карта на крупную сумму -> YooKassa первой
+        """
+        info = self.bins.lookup(card_bin)
+        if info is None or info.country in (None, "RU") or info.scheme == "mir":
+            return RUSSIAN_FIRST
+        if info.scheme in CLOUDPAYMENTS_SCHEMES and (
+            currency != "RUB" or amount < settings.PAYMENT_CLOUDPAYMENTS_MAX_AMOUNT
+        ):
+            return FOREIGN_FIRST
+        return RUSSIAN_FIRST
+    
+    async def aclose(self) -> None:
+        """Закрыть клиенты и их соединения (при остановке приложения)"""
+        clients, self._clients = self._clients, {}
+        for client in clients.values():
+            await client.aclose()
+    
+    async def init_payment(
         self,
         amount: float,
         currency: str = "RUB",
@@ -24,31 +137,18 @@ class PaymentService:
         """
         Инициализация платежа с автоматическим выбором провайдера
         
-        Логика выбора:
-        - Если BIN карты начинается с 4,5,6 (Visa/MC) и сумма < 10000 RUB -> CloudPayments
-        - Если российская карта или сумма >= 10000 -> YooKassa
-        - По умолчанию пробуем YooKassa, затем CloudPayments
+        Провайдеры пробуются в порядке choose_providers; ненастроенные
+        пропускаются, при ошибке - следующий.
         """
-        # TODO: Реализовать определение страны по BIN карты
-        
-        # Пробуем YooKassa сначала (основной провайдер для РФ)
-        if settings.YOOKASSA_SHOP_ID and settings.YOOKASSA_SECRET_KEY:
-            try:
-                result = self._init_yookassa(
-                    amount=amount,
-                    currency=currency,
-                    order_id=order_id,
-                    return_url=return_url
-                )
-                if result:
-                    return result
-            except Exception:
-                pass
-        
-        # Фоллбэк на CloudPayments
-        if settings.CLOUDPAYMENTS_PUBLIC_ID and settings.CLOUDPAYMENTS_API_SECRET:
+        init_methods = {
+            "yookassa": self._init_yookassa,
+            "cloudpayments": self._init_cloudpayments,
+        }
+        for provider in self.choose_providers(card_bin, amount, currency):
+            if not _provider_credentials(provider):
+                continue
             try:
-                result = self._init_cloudpayments(
+                result = await init_methods[provider](
                     amount=amount,
                     currency=currency,
                     order_id=order_id,
@@ -61,7 +161,7 @@ class PaymentService:
         
         raise Exception("No payment provider available")
     
-    def _init_yookassa(
+    async def _init_yookassa(
         self,
         amount: float,
         currency: str,
@@ -69,18 +169,7 @@ class PaymentService:
         return_url: Optional[str]
     ) -> Optional[Dict]:
         """Инициализация платежа через YooKassa"""
-        import base64
-        import httpx
-        
-        from app.core.config import settings
-        
-        # Базовая авторизация
-        auth_string = f"{settings.YOOKASSA_SHOP_ID}:{settings.YOOKASSA_SECRET_KEY}"
-        auth_header = base64.b64encode(auth_string.encode()).decode()
-        
-        # URL API (для продакшена используйте https://api.yookassa.ru/v3/payments)
-        api_url = "https://api.yookassa.ru/v3/payments"
-        # Для тестирования: https://api.yookassa.ru/v3/payments (test mode)
+        client = self._client("yookassa")
         
         payload = {
             "amount": {
@@ -98,37 +187,23 @@ class PaymentService:
         }
         
         try:
-            # Реальный запрос (раскомментировать когда будут реальные ключи):
-            # async with httpx.AsyncClient() as client:
-            #     response = await client.post(
-            #         api_url,
-            #         json=payload,
-            #         headers={
-            #             "Authorization": f"Basic {auth_header}",
-            #             "Content-Type": "application/json",
-            #             "Idempotence-Key": order_id  # Для предотвращения дубликатов
-            #         },
-            #         timeout=30.0
-            #     )
-            #     response.raise_for_status()
-            #     data = response.json()
-            #     return {
-            #         "payment_id": data.get("id"),
-            #         "payment_url": data.get("confirmation", {}).get("confirmation_url"),
-            #         "provider": "yookassa"
-            #     }
-            
-            # Заглушка для разработки
+            response = await client.post(
+                "/payments",
+                json=payload,
+                headers={"Idempotence-Key": order_id}  # Для предотвращения дубликатов
+            )
+            response.raise_for_status()
+            data = response.json()
             return {
-                "payment_id": f"yk_{order_id}",
-                "payment_url": f"https://yookassa.ru/payment/{order_id}?test=true",
+                "payment_id": data.get("id"),
+                "payment_url": data.get("confirmation", {}).get("confirmation_url"),
                 "provider": "yookassa"
             }
         except Exception as e:
             logger.error(f"YooKassa payment init error: {e}", exc_info=True)
             return None
     
-    def _init_cloudpayments(
+    async def _init_cloudpayments(
         self,
         amount: float,
         currency: str,
@@ -136,17 +211,7 @@ class PaymentService:
         return_url: Optional[str]
     ) -> Optional[Dict]:
         """Инициализация платежа через CloudPayments"""
-        import httpx
-        
-        from app.core.config import settings
-        
-        # CloudPayments использует Basic Auth
-        from base64 import b64encode
-        auth_string = f"{settings.CLOUDPAYMENTS_PUBLIC_ID}:{settings.CLOUDPAYMENTS_API_SECRET}"
-        auth_header = b64encode(auth_string.encode()).decode()
-        
-        # URL для создания платежа
-        api_url = "https://api.cloudpayments.ru/payments/cards/charge"
+        client = self._client("cloudpayments")
         
         payload = {
             "Amount": amount,
@@ -157,35 +222,18 @@ class PaymentService:
         }
         
         try:
-            # Реальный запрос (раскомментировать когда будут реальные ключи):
-            # async with httpx.AsyncClient() as client:
-            #     response = await client.post(
-            #         api_url,
-            #         json=payload,
-            #         headers={
-            #             "Authorization": f"Basic {auth_header}",
-            #             "Content-Type": "application/json"
-            #         },
-            #         timeout=30.0
-            #     )
-            #     response.raise_for_status()
-            #     data = response.json()
-            #     
-            #     if data.get("Success"):
-            #         return {
-            #             "payment_id": data.get("Model", {}).get("TransactionId"),
-            #             "payment_url": data.get("Model", {}).get("RedirectUrl"),
-            #             "provider": "cloudpayments"
-            #         }
-            #     else:
-            #         raise Exception(data.get("Message", "Payment failed"))
+            response = await client.post("/payments/cards/charge", json=payload)
+            response.raise_for_status()
+            data = response.json()
             
-            # Заглушка для разработки
-            return {
-                "payment_id": f"cp_{order_id}",
-                "payment_url": f"https://cloudpayments.ru/payment/{order_id}?test=true",
-                "provider": "cloudpayments"
-            }
+            if data.get("Success"):
+                return {
+                    "payment_id": data.get("Model", {}).get("TransactionId"),
+                    "payment_url": data.get("Model", {}).get("RedirectUrl"),
+                    "provider": "cloudpayments"
+                }
+            else:
+                raise Exception(data.get("Message", "Payment failed"))
         except Exception as e:
             logger.error(f"CloudPayments payment init error: {e}", exc_info=True)
             return None
@@ -207,4 +255,3 @@ class PaymentService:
         """Валидация вебхука CloudPayments"""
         # TODO: Реализовать проверку подписи
         return True
-
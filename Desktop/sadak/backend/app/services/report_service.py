@@ -0,0 +1,35 @@
+"""
+Сервис для работы с отчётами фондов
+"""
+from sqlalchemy.ext.asyncio import AsyncSession
+from datetime import datetime
+from app.models import Report
+import logging
+
+logger = logging.getLogger(__name__)
+
+
+async def verify_report(db: AsyncSession, report_id: int, verified_by: int) -> Report:
+    """
+    Отметить отчёт фонда как проверенный
+    
+    Материализованные отчёты завершённых кампаний фонда обновляются в той же
+    транзакции: в них ссылка на последний проверенный отчёт фонда.
+    """
+    from app.services import campaign_service
+    
+    report = await db.get(Report, report_id)
+    if not report:
+        raise ValueError("Report not found")
+    
+    report.verified = True
+    report.verified_by = verified_by
+    report.verified_at = datetime.utcnow()
+    
+    refreshed = await campaign_service.refresh_campaign_reports(db, fund_id=report.fund_id)
+    await db.commit()
+    await db.refresh(report)
+    
+    logger.info(f"Отчёт фонда {report.fund_id} проверен: {report.id}, обновлено отчётов кампаний: {refreshed}")
+    
+    return report
@@ -0,0 +1,10 @@
+from app.core.config import settings
+from .search_service import SearchBackend, PostgresSearchBackend, SEARCH_TYPES
+
+if settings.ELASTICSEARCH_URL:
+    from .elastic import ElasticsearchSearchBackend
+    search_backend: SearchBackend = ElasticsearchSearchBackend(settings.ELASTICSEARCH_URL)
+else:
+    search_backend = PostgresSearchBackend()
+
+__all__ = ["search_backend", "SearchBackend", "SEARCH_TYPES"]
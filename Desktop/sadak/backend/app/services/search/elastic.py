@@ -0,0 +1,148 @@
+"""
+Поиск через Elasticsearch (REST API по httpx, без клиентской библиотеки)
+
+Документы: "<type>-<id>" в одном индексе (sadaka_search), текст разбирается
+анализатором russian. В индексе только активные кампании и проверенные фонды;
+обновления приходят из campaign_service, полная загрузка - scripts/reindex_search.py.
+"""
+from sqlalchemy.ext.asyncio import AsyncSession
+from typing import Dict, Iterable, List, Optional, Tuple
+from app.models import Campaign, Fund
+from app.models.campaign import CampaignStatus
+from .search_service import SearchBackend, decode_cursor, encode_cursor
+import httpx
+import json
+import logging
+
+logger = logging.getLogger(__name__)
+
+INDEX_MAPPINGS = {
+    "mappings": {
+        "properties": {
+            "type": {"type": "keyword"},
+            "ref_id": {"type": "long"},
+            # Уникальный ключ документа - второй ключ сортировки для search_after
+            "uid": {"type": "keyword"},
+            "title": {"type": "text", "analyzer": "russian"},
+            "description": {"type": "text", "analyzer": "russian"},
+        }
+    }
+}
+
+
+def _document(kind: str, ref_id: int, title: str, description: Optional[str]) -> Dict:
+    return {
+        "type": kind,
+        "ref_id": ref_id,
+        "uid": f"{kind}-{ref_id}",
+        "title": title,
+        "description": description,
+    }
+
+
+class ElasticsearchSearchBackend(SearchBackend):
+    """Поиск по индексу Elasticsearch, ранжирование по _score"""
+
+    def __init__(self, url: str, index: str = "sadaka_search", timeout: float = 5.0):
+        self.index = index
+        self._client = httpx.AsyncClient(base_url=url.rstrip("/"), timeout=timeout)
+        self._index_ready = False
+
+    async def _ensure_index(self) -> None:
+        if self._index_ready:
+            return
+        response = await self._client.put(f"/{self.index}", json=INDEX_MAPPINGS)
+        if response.status_code >= 400 and "resource_already_exists_exception" not in response.text:
+            response.raise_for_status()
+        self._index_ready = True
+
+    async def search(
+        self,
+        db: AsyncSession,
+        query: str,
+        kind: Optional[str] = None,
+        cursor: Optional[str] = None,
+        limit: int = 20
+    ) -> Tuple[List[Dict], Optional[str]]:
+        if kind not in (None, "campaign", "fund"):
+            raise ValueError("Invalid search type")
+
+        body = {
+            "size": limit + 1,
+            "query": {
+                "bool": {
+                    "must": {
+                        "multi_match": {
+                            "query": query,
+                            "fields": ["title^2", "description"],
+                            "operator": "and",
+                        }
+                    },
+                    "filter": [{"term": {"type": kind}}] if kind else [],
+                }
+            },
+            "sort": [{"_score": "desc"}, {"uid": "desc"}],
+        }
+        if cursor:
+            body["search_after"] = decode_cursor(cursor, query, kind)
+
+        response = await self._client.post(f"/{self.index}/_search", json=body)
+        if response.status_code == 404:
+            return [], None
+        response.raise_for_status()
+        hits = response.json()["hits"]["hits"]
+
+        next_cursor = None
+        if len(hits) > limit:
+            hits = hits[:limit]
+            next_cursor = encode_cursor(query, kind, hits[-1]["sort"])
+
+        return [
+            {
+                "type": hit["_source"]["type"],
+                "id": hit["_source"]["ref_id"],
+                "title": hit["_source"]["title"],
+                "description": hit["_source"].get("description"),
+                "rank": hit["_score"],
+            }
+            for hit in hits
+        ], next_cursor
+
+    async def _bulk(self, actions: List[Dict]) -> None:
+        if not actions:
+            return
+        await self._ensure_index()
+        payload = "".join(json.dumps(action, ensure_ascii=False) + "\n" for action in actions)
+        response = await self._client.post(
+            f"/{self.index}/_bulk",
+            content=payload.encode(),
+            headers={"Content-Type": "application/x-ndjson"}
+        )
+        response.raise_for_status()
+        if response.json().get("errors"):
+            logger.warning(f"Elasticsearch bulk: часть операций не выполнена ({self.index})")
+
+    async def index_campaigns(self, campaigns: Iterable[Campaign]) -> None:
+        actions = []
+        for campaign in campaigns:
+            doc_id = f"campaign-{campaign.id}"
+            if campaign.status == CampaignStatus.ACTIVE:
+                actions.append({"index": {"_id": doc_id}})
+                actions.append(_document("campaign", campaign.id, campaign.title, campaign.description))
+            else:
+                actions.append({"delete": {"_id": doc_id}})
+        await self._bulk(actions)
+
+    async def index_funds(self, funds: Iterable[Fund]) -> None:
+        actions = []
+        for fund in funds:
+            doc_id = f"fund-{fund.id}"
+            if fund.verified:
+                actions.append({"index": {"_id": doc_id}})
+                actions.append(_document("fund", fund.id, fund.name, fund.description))
+            else:
+                actions.append({"delete": {"_id": doc_id}})
+        await self._bulk(actions)
+
+    async def aclose(self) -> None:
+        await self._client.aclose()
@@ -0,0 +1,151 @@
+"""
+Полнотекстовый поиск по кампаниям и фондам
+
+По умолчанию ищет PostgresSearchBackend: хранимые колонки search_vector
+(to_tsvector с русской конфигурацией) и GIN-индексы поддерживает сама БД,
+отдельная индексация не нужна. Внешний движок подключается реализацией
+SearchBackend (см. elastic.py) и включается через ELASTICSEARCH_URL.
+"""
+from abc import ABC, abstractmethod
+from sqlalchemy import select, func, literal, tuple_, union_all, String
+from sqlalchemy.dialects.postgresql import REGCONFIG
+from sqlalchemy.ext.asyncio import AsyncSession
+from typing import Dict, Iterable, List, Optional, Tuple
+from app.models import Campaign, Fund
+from app.models.campaign import CampaignStatus
+import base64
+import binascii
+import json
+
+SEARCH_CONFIG = "russian"
+
+# Что можно искать: type в ответе и фильтр ?type=
+SEARCH_TYPES = ("campaign", "fund")
+
+
+def encode_cursor(query: str, kind: Optional[str], after: list) -> str:
+    """Курсор страницы поиска: привязан к запросу и фильтру type"""
+    payload = json.dumps({"q": query, "t": kind, "a": after}, separators=(",", ":"))
+    return base64.urlsafe_b64encode(payload.encode()).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str, query: str, kind: Optional[str]) -> list:
+    """Разобрать курсор; ValueError, если он испорчен или от другого запроса"""
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        payload = json.loads(base64.urlsafe_b64decode(padded.encode()))
+        after = payload["a"]
+        if payload["q"] != query or payload["t"] != kind or not isinstance(after, list):
+            raise ValueError
+    except (ValueError, KeyError, TypeError, binascii.Error):
+        raise ValueError("Invalid cursor")
+    return after
+
+
+class SearchBackend(ABC):
+    """
+    Интерфейс поискового движка
+
+    search обязателен; index_* и aclose нужны только движкам со своим
+    индексом и по умолчанию ничего не делают.
+    """
+
+    @abstractmethod
+    async def search(
+        self,
+        db: AsyncSession,
+        query: str,
+        kind: Optional[str] = None,
+        cursor: Optional[str] = None,
+        limit: int = 20
+    ) -> Tuple[List[Dict], Optional[str]]:
+        """
+        Найти активные кампании и проверенные фонды, по убыванию релевантности
+
+        Args:
+            kind: 'campaign', 'fund' или None (всё)
+            cursor: next_cursor из предыдущей страницы
+
+        Returns:
+            (результаты, next_cursor); результат - dict с ключами
+            type, id, title, description, rank
+        """
+
+    async def index_campaigns(self, campaigns: Iterable[Campaign]) -> None:
+        """Обновить кампании в индексе (неактивные - убрать из него)"""
+
+    async def index_funds(self, funds: Iterable[Fund]) -> None:
+        """Обновить фонды в индексе (непроверенные - убрать из него)"""
+
+    async def aclose(self) -> None:
+        """Освободить ресурсы (соединения с внешним движком)"""
+
+
+class PostgresSearchBackend(SearchBackend):
+    """Поиск средствами PostgreSQL: websearch_to_tsquery + ts_rank_cd"""
+
+    async def search(
+        self,
+        db: AsyncSession,
+        query: str,
+        kind: Optional[str] = None,
+        cursor: Optional[str] = None,
+        limit: int = 20
+    ) -> Tuple[List[Dict], Optional[str]]:
+        # Синтаксис как у поисковиков: слова, "фраза", -исключение, or
+        tsquery = func.websearch_to_tsquery(literal(SEARCH_CONFIG, type_=REGCONFIG), query)
+
+        parts = []
+        if kind in (None, "campaign"):
+            parts.append(
+                select(
+                    literal("campaign", type_=String).label("type"),
+                    Campaign.id.label("id"),
+                    Campaign.title.label("title"),
+                    Campaign.description.label("description"),
+                    func.ts_rank_cd(Campaign.search_vector, tsquery).label("rank")
+                ).where(
+                    Campaign.status == CampaignStatus.ACTIVE,
+                    Campaign.search_vector.bool_op("@@")(tsquery)
+                )
+            )
+        if kind in (None, "fund"):
+            parts.append(
+                select(
+                    literal("fund", type_=String).label("type"),
+                    Fund.id.label("id"),
+                    Fund.name.label("title"),
+                    Fund.description.label("description"),
+                    func.ts_rank_cd(Fund.search_vector, tsquery).label("rank")
+                ).where(
+                    Fund.verified.is_(True),
+                    Fund.search_vector.bool_op("@@")(tsquery)
+                )
+            )
+        if not parts:
+            raise ValueError("Invalid search type")
+
+        hits = (union_all(*parts) if len(parts) > 1 else parts[0]).subquery("hits")
+        stmt = select(hits)
+
+        # Keyset по (rank, type, id): порядок однозначен и при равной релевантности
+        if cursor:
+            after = decode_cursor(cursor, query, kind)
+            try:
+                rank, hit_type, hit_id = float(after[0]), str(after[1]), int(after[2])
+            except (IndexError, TypeError, ValueError):
+                raise ValueError("Invalid cursor")
+            stmt = stmt.where(
+                tuple_(hits.c.rank, hits.c.type, hits.c.id) < tuple_(literal(rank), literal(hit_type), literal(hit_id))
+            )
+
+        stmt = stmt.order_by(hits.c.rank.desc(), hits.c.type.desc(), hits.c.id.desc()).limit(limit + 1)
+        rows = (await db.execute(stmt)).all()
+
+        next_cursor = None
+        if len(rows) > limit:
+            rows = rows[:limit]
+            last = rows[-1]
+            next_cursor = encode_cursor(query, kind, [last.rank, last.type, last.id])
+
+        return [dict(row._mapping) for row in rows], next_cursor
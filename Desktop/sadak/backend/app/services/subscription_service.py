@@ -1,7 +1,8 @@
 """
 Сервис для работы с подписками
 """
-from sqlalchemy.orm import Session
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
 from datetime import timedelta, datetime
 from typing import Optional
 from app.models import Subscription
@@ -55,8 +56,8 @@ def get_period_months(period: SubscriptionPeriod) -> int:
     return period_map[period]
 
 
-def init_subscription(
-    db: Session,
+async def init_subscription(
+    db: AsyncSession,
     user_id: int,
     subscription_data: SubscriptionInit,
     return_url: Optional[str] = None
@@ -84,36 +85,40 @@ def init_subscription(
     )
     
     db.add(subscription)
-    db.commit()
-    db.refresh(subscription)
+    await db.commit()
+    await db.refresh(subscription)
     
     # TODO: Инициализация рекуррентного платежа через платежный сервис
     
     return subscription
 
 
-def get_user_subscriptions(
-    db: Session,
+async def get_user_subscriptions(
+    db: AsyncSession,
     user_id: int,
     status: Optional[SubscriptionStatus] = None
 ) -> list[Subscription]:
     """Получить подписки пользователя"""
-    query = db.query(Subscription).filter(Subscription.user_id == user_id)
+    query = select(Subscription).where(Subscription.user_id == user_id)
     if status:
-        query = query.filter(Subscription.status == status)
-    return query.all()
+        query = query.where(Subscription.status == status)
+    result = await db.execute(query)
+    return list(result.scalars().all())
 
 
-def cancel_subscription(
-    db: Session,
+async def cancel_subscription(
+    db: AsyncSession,
     subscription_id: int,
     user_id: int
 ) -> Subscription:
     """Отменить подписку"""
-    subscription = db.query(Subscription).filter(
-        Subscription.id == subscription_id,
-        Subscription.user_id == user_id
-    ).first()
+    result = await db.execute(
+        select(Subscription).where(
+            Subscription.id == subscription_id,
+            Subscription.user_id == user_id
+        )
+    )
+    subscription = result.scalars().first()
     
     if not subscription:
         raise ValueError("Subscription not found")
@@ -121,22 +126,25 @@ def cancel_subscription(
     subscription.status = SubscriptionStatus.CANCELLED
     subscription.cancelled_at = datetime.utcnow()
     
-    db.commit()
-    db.refresh(subscription)
+    await db.commit()
+    await db.refresh(subscription)
     
     return subscription
 
 
-def pause_subscription(
-    db: Session,
+async def pause_subscription(
+    db: AsyncSession,
     subscription_id: int,
     user_id: int
 ) -> Subscription:
     """Приостановить подписку"""
-    subscription = db.query(Subscription).filter(
-        Subscription.id == subscription_id,
-        Subscription.user_id == user_id
-    ).first()
+    result = await db.execute(
+        select(Subscription).where(
+            Subscription.id == subscription_id,
+            Subscription.user_id == user_id
+        )
+    )
+    subscription = result.scalars().first()
     
     if not subscription:
         raise ValueError("Subscription not found")
@@ -147,22 +155,25 @@ def pause_subscription(
     subscription.status = SubscriptionStatus.PAUSED
     subscription.updated_at = datetime.utcnow()
     
-    db.commit()
-    db.refresh(subscription)
+    await db.commit()
+    await db.refresh(subscription)
     
     return subscription
 
 
-def resume_subscription(
-    db: Session,
+async def resume_subscription(
+    db: AsyncSession,
     subscription_id: int,
     user_id: int
 ) -> Subscription:
     """Возобновить подписку"""
-    subscription = db.query(Subscription).filter(
-        Subscription.id == subscription_id,
-        Subscription.user_id == user_id
-    ).first()
+    result = await db.execute(
+        select(Subscription).where(
+            Subscription.id == subscription_id,
+            Subscription.user_id == user_id
+        )
+    )
+    subscription = result.scalars().first()
     
     if not subscription:
         raise ValueError("Subscription not found")
@@ -177,7 +188,7 @@ def resume_subscription(
     subscription.status = SubscriptionStatus.ACTIVE
     subscription.updated_at = datetime.utcnow()
     
-    db.commit()
-    db.refresh(subscription)
+    await db.commit()
+    await db.refresh(subscription)
     
     return subscription
@@ -0,0 +1,97 @@
+"""
+Лента срочных кампаний для карусели на главной
+
+Верхние URGENT_CAMPAIGNS_SIZE активных кампаний с ближайшим end_date
+хранятся в памяти процесса готовыми схемами ответа: GET /campaigns/urgent
+не обращается к БД. Список целиком перечитывается раз в
+URGENT_CAMPAIGNS_REFRESH_SECONDS, а между перечитываниями поддерживается
+событиями campaign_service (см. invalidate_campaign_listings): завершённые
+кампании убираются, одобренные и обновлённые - вставляются на своё место.
+"""
+from bisect import insort
+from datetime import datetime, timezone
+from sqlalchemy import select, func
+from sqlalchemy.ext.asyncio import AsyncSession
+from typing import List, Optional
+from app.core.config import settings
+from app.models import Campaign
+from app.models.campaign import CampaignStatus
+from app.schemas.campaign import Campaign as CampaignSchema
+
+# Отсортировано по (end_date, id); храним вдвое больше, чем отдаём, чтобы
+# кампании, ушедшие из списка между перечитываниями, было чем заменить
+_entries: List[tuple] = []
+_loaded = False
+
+
+def _capacity() -> int:
+    return settings.URGENT_CAMPAIGNS_SIZE * 2
+
+
+def _not_ended(end_date: datetime) -> bool:
+    now = datetime.now(timezone.utc) if end_date.tzinfo else datetime.utcnow()
+    return end_date > now
+
+
+def _remove(campaign_id: int) -> None:
+    for position, entry in enumerate(_entries):
+        if entry[1] == campaign_id:
+            del _entries[position]
+            return
+
+
+async def refresh_urgent_campaigns(db: AsyncSession) -> int:
+    """
+    Перечитать список из БД (индекс status, end_date)
+
+    Returns:
+        Количество кампаний в списке
+    """
+    global _entries, _loaded
+
+    result = await db.execute(
+        select(Campaign).where(
+            Campaign.status == CampaignStatus.ACTIVE,
+            Campaign.end_date > func.now()
+        ).order_by(Campaign.end_date.asc(), Campaign.id.asc()).limit(_capacity())
+    )
+    _entries = [
+        (campaign.end_date, campaign.id, CampaignSchema.model_validate(campaign))
+        for campaign in result.scalars().all()
+    ]
+    _loaded = True
+    return len(_entries)
+
+
+def update_campaign(campaign: Campaign) -> None:
+    """Учесть изменение кампании (статус, сумма, участники) без запроса к БД"""
+    if not _loaded:
+        return
+
+    in_list = any(entry[1] == campaign.id for entry in _entries)
+    eligible = campaign.status == CampaignStatus.ACTIVE and _not_ended(campaign.end_date)
+    if not eligible:
+        if in_list:
+            _remove(campaign.id)
+        return
+
+    # Новая кампания за пределами полного списка - его хвост всё равно не отдаётся
+    full = len(_entries) >= _capacity()
+    if not in_list and full and (campaign.end_date, campaign.id) > _entries[-1][:2]:
+        return
+
+    _remove(campaign.id)
+    insort(_entries, (campaign.end_date, campaign.id, CampaignSchema.model_validate(campaign)))
+    del _entries[_capacity():]
+
+
+def get_urgent_campaigns(limit: Optional[int] = None) -> List[CampaignSchema]:
+    """Срочные кампании, ближайший end_date первым"""
+    limit = min(limit or settings.URGENT_CAMPAIGNS_SIZE, settings.URGENT_CAMPAIGNS_SIZE)
+    result = []
+    for end_date, _, snapshot in _entries:
+        if _not_ended(end_date):
+            result.append(snapshot)
+            if len(result) >= limit:
+                break
+    return result
@@ -1,7 +1,8 @@
 """
 Сервис для расчета и выплаты закята
 """
-from sqlalchemy.orm import Session
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
 from decimal import Decimal
 from typing import Dict, Any
 from app.models import ZakatCalc, Donation
@@ -93,8 +94,8 @@ def calculate_total_wealth(calc_data: ZakatCalcCreate) -> Decimal:
     return max(total, Decimal("0"))
 
 
-def calculate_zakat(
-    db: Session,
+async def calculate_zakat(
+    db: AsyncSession,
     user_id: int,
     calc_data: ZakatCalcCreate
 ) -> ZakatCalc:
@@ -150,14 +151,14 @@ def calculate_zakat(
     )
     
     db.add(calculation)
-    db.commit()
-    db.refresh(calculation)
+    await db.commit()
+    await db.refresh(calculation)
     
     return calculation
 
 
-def pay_zakat(
-    db: Session,
+async def pay_zakat(
+    db: AsyncSession,
     user_id: int,
     calculation_id: int,
     return_url: str = None
@@ -166,10 +167,13 @@ def pay_zakat(
     Выплатить закят
     Создает пожертвование на рассчитанную сумму
     """
-    calculation = db.query(ZakatCalc).filter(
-        ZakatCalc.id == calculation_id,
-        ZakatCalc.user_id == user_id
-    ).first()
+    result = await db.execute(
+        select(ZakatCalc).where(
+            ZakatCalc.id == calculation_id,
+            ZakatCalc.user_id == user_id
+        )
+    )
+    calculation = result.scalars().first()
     
     if not calculation:
         raise ValueError("Calculation not found")
@@ -185,7 +189,7 @@ def pay_zakat(
         return_url=return_url
     )
     
-    donation = init_donation(
+    donation = await init_donation(
         db=db,
         user_id=user_id,
         donation_data=donation_data,
@@ -194,23 +198,25 @@ def pay_zakat(
     
     # Связываем расчет с пожертвованием
     calculation.donation_id = donation.id
-    db.commit()
+    await db.commit()
     
     return donation
 
 
-def get_zakat_history(
-    db: Session,
+async def get_zakat_history(
+    db: AsyncSession,
     user_id: int,
     limit: int = 50
 ) -> list[ZakatCalc]:
     """
     Получить историю расчётов закята пользователя
     """
-    calculations = db.query(ZakatCalc).filter(
-        ZakatCalc.user_id == user_id
-    ).order_by(
-        ZakatCalc.created_at.desc()
-    ).limit(limit).all()
+    result = await db.execute(
+        select(ZakatCalc).where(
+            ZakatCalc.user_id == user_id
+        ).order_by(
+            ZakatCalc.created_at.desc()
+        ).limit(limit)
+    )
     
-    return calculations
+    return list(result.scalars().all())
@@ -0,0 +1,92 @@
+"""
+Нагрузочный бенчмарк API: requests-per-second для GET /campaigns и POST /donations/init
+
+Запускается против уже поднятого сервера, поэтому одним и тем же скриптом
+можно сравнить две версии backend (до и после изменения):
+
+    uvicorn app.main:app --workers 1 --port 8000
+    python scripts/bench_api.py --url http://localhost:8000 --concurrency 50 --duration 20
+
+Для /donations/init нужен настроенный платёжный провайдер (YOOKASSA_* или
+CLOUDPAYMENTS_*), а TELEGRAM_SECRET_KEY должен быть пустым - тогда initData
+принимается без проверки подписи.
+"""
+import argparse
+import asyncio
+import json
+import statistics
+import time
+from urllib.parse import urlencode
+
+import httpx
+
+
+def make_init_data(tg_id: int) -> str:
+    """initData без подписи (режим разработки)"""
+    user = {"id": tg_id, "first_name": "Bench", "username": f"bench_{tg_id}"}
+    return urlencode({"user": json.dumps(user), "auth_date": str(int(time.time()))})
+
+
+async def run_scenario(
+    client: httpx.AsyncClient,
+    name: str,
+    method: str,
+    path: str,
+    concurrency: int,
+    duration: float,
+    **request_kwargs
+) -> None:
+    """Гоняет запросы в `concurrency` воркеров в течение `duration` секунд"""
+    latencies = []
+    errors = 0
+    deadline = time.perf_counter() + duration
+
+    async def worker():
+        nonlocal errors
+        while time.perf_counter() < deadline:
+            started = time.perf_counter()
+            try:
+                response = await client.request(method, path, **request_kwargs)
+                if response.status_code >= 400:
+                    errors += 1
+            except httpx.HTTPError:
+                errors += 1
+            latencies.append(time.perf_counter() - started)
+
+    started = time.perf_counter()
+    await asyncio.gather(*(worker() for _ in range(concurrency)))
+    elapsed = time.perf_counter() - started
+
+    latencies.sort()
+    p50 = statistics.median(latencies) * 1000 if latencies else 0
+    p99 = latencies[int(len(latencies) * 0.99) - 1] * 1000 if latencies else 0
+    print(
+        f"{name:<22} {len(latencies) / elapsed:>9.1f} req/s   "
+        f"p50 {p50:>7.1f} ms   p99 {p99:>7.1f} ms   errors {errors}"
+    )
+
+
+async def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--url", default="http://localhost:8000")
+    parser.add_argument("--concurrency", type=int, default=50)
+    parser.add_argument("--duration", type=float, default=20.0)
+    parser.add_argument("--tg-id", type=int, default=900000001)
+    args = parser.parse_args()
+
+    limits = httpx.Limits(max_connections=args.concurrency, max_keepalive_connections=args.concurrency)
+    async with httpx.AsyncClient(base_url=f"{args.url}/api/v1", limits=limits, timeout=30.0) as client:
+        await run_scenario(
+            client, "GET /campaigns", "GET", "/campaigns",
+            args.concurrency, args.duration
+        )
+        await run_scenario(
+            client, "POST /donations/init", "POST", "/donations/init",
+            args.concurrency, args.duration,
+            headers={"X-Telegram-Init-Data": make_init_data(args.tg_id)},
+            json={"amount_value": "100.00", "currency": "RUB", "donation_type": "sadaqa"},
+        )
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,102 @@
+"""
+Бенчмарк индекса автодополнения: память и задержка подсказок
+
+Строит PrefixIndex из синтетических названий (без БД) и печатает
+потребление памяти (tracemalloc), время полной сборки, p50/p99
+suggest() на случайных префиксах и время точечного обновления.
+
+    python scripts/bench_autocomplete.py                 # 100k названий
+    python scripts/bench_autocomplete.py --titles 500000
+"""
+import argparse
+import gc
+import random
+import statistics
+import sys
+import time
+import tracemalloc
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from app.services.autocomplete_service import PrefixIndex, build_index, normalize  # noqa: E402
+
+WORDS = (
+    "сбор на строительство мечети помощь сиротам детям лечение операция ремонт "
+    "школы колодец воды продукты семьям нуждающимся ифтар рамадан курбан закят "
+    "фонд благотворительный медресе коран обучение студентам вдовам пожилым "
+    "одежда зима отопление дом пострадавшим пожар наводнение реабилитация"
+).split()
+
+
+def make_titles(count: int, rng: random.Random):
+    for item_id in range(1, count + 1):
+        words = rng.choices(WORDS, k=rng.randint(3, 8))
+        yield ("campaign" if item_id % 10 else "fund", item_id, f"{' '.join(words).capitalize()} №{item_id}")
+
+
+def percentile(values, share: float) -> float:
+    values = sorted(values)
+    return values[min(len(values) - 1, int(len(values) * share))]
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--titles", type=int, default=100_000)
+    parser.add_argument("--queries", type=int, default=20_000)
+    args = parser.parse_args()
+
+    rng = random.Random(42)
+    items = list(make_titles(args.titles, rng))
+    index = PrefixIndex()
+
+    gc.collect()
+    tracemalloc.start()
+    started = time.perf_counter()
+    index.replace(build_index(items))
+    build_seconds = time.perf_counter() - started
+    gc.collect()
+    memory, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    # Строки названий созданы до замера (в приложении они приходят из БД) - считаем отдельно
+    titles_memory = sum(sys.getsizeof(title) for _, _, title in items)
+
+    stats = index.stats()
+    total = memory + titles_memory
+    print(f"items: {stats['items']:,}  keys: {stats['keys']:,}")
+    print(f"memory: {total / 2**20:.1f} MiB total ({total / stats['items']:.0f} B/item): "
+          f"index {memory / 2**20:.1f} MiB ({memory / stats['keys']:.0f} B/key), "
+          f"titles {titles_memory / 2**20:.1f} MiB")
+    print(f"full build: {build_seconds:.2f}s (в приложении - в отдельном потоке)")
+
+    # Префиксы длиной 1-6 символов от случайных слов - как при наборе
+    prefixes = [normalize(rng.choice(WORDS))[:rng.randint(1, 6)] for _ in range(args.queries)]
+    timings = []
+    for prefix in prefixes:
+        started = time.perf_counter()
+        index.suggest(prefix, limit=10)
+        timings.append((time.perf_counter() - started) * 1000)
+    print(f"suggest: p50 {statistics.median(timings):.3f} ms  p99 {percentile(timings, 0.99):.3f} ms  "
+          f"max {max(timings):.3f} ms ({args.queries:,} queries)")
+
+    timings = []
+    for item_id in rng.sample(range(1, args.titles + 1), 1000):
+        started = time.perf_counter()
+        index.put("campaign", item_id, None)
+        index.put("campaign", item_id, f"Новое название кампании {item_id}")
+        timings.append((time.perf_counter() - started) * 1000)
+    print(f"update (remove + add): p50 {statistics.median(timings):.3f} ms  p99 {percentile(timings, 0.99):.3f} ms")
+
+    # Подсказки после точечных изменений: основные списки + delta
+    timings = []
+    for prefix in prefixes:
+        started = time.perf_counter()
+        index.suggest(prefix, limit=10)
+        timings.append((time.perf_counter() - started) * 1000)
+    stats = index.stats()
+    print(f"suggest after updates (delta {stats['delta_keys']:,} keys, {stats['dead']:,} dead): "
+          f"p50 {statistics.median(timings):.3f} ms  p99 {percentile(timings, 0.99):.3f} ms")
+
+
+if __name__ == "__main__":
+    main()
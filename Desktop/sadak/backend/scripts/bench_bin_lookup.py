@@ -0,0 +1,104 @@
+"""
+Бенчмарк таблицы BIN: загрузка, память и скорость выбора провайдера
+
+Пишет во временный CSV синтетическую таблицу непересекающихся диапазонов
+(без БД), загружает её через BinTable.load и печатает время загрузки,
+память (tracemalloc) и время 1M поисков: BinTable.lookup и полный
+PaymentService.choose_providers. Половина BIN попадает в диапазоны,
+половина - в промежутки между ними.
+
+    python scripts/bench_bin_lookup.py                      # 300k диапазонов, 1M поисков
+    python scripts/bench_bin_lookup.py --ranges 1000000 --lookups 5000000
+"""
+import argparse
+import csv
+import gc
+import os
+import random
+import sys
+import tempfile
+import time
+import tracemalloc
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from app.services.payment.bin_table import BIN_LENGTH, BinTable  # noqa: E402
+from app.services.payment.payment_service import PaymentService  # noqa: E402
+
+COUNTRIES = ("RU", "KZ", "UZ", "TR", "AE", "DE", "US", "GB")
+SCHEMES = ("visa", "mastercard", "mir", "unionpay")
+
+
+def write_table(path: str, count: int, rng: random.Random) -> None:
+    """count диапазонов по 8-значным BIN с промежутками между ними"""
+    step = 10 ** BIN_LENGTH // count
+    with open(path, "w", newline="", encoding="utf-8") as file:
+        writer = csv.writer(file)
+        writer.writerow(("bin_from", "bin_to", "country", "scheme", "issuer"))
+        for index in range(count):
+            start = index * step
+            writer.writerow((
+                f"{start:0{BIN_LENGTH}d}",
+                f"{start + step // 2 - 1:0{BIN_LENGTH}d}",
+                rng.choice(COUNTRIES),
+                rng.choice(SCHEMES),
+                f"Bank {index % 500}"
+            ))
+
+
+def run(label: str, lookup, bins, lookups: int) -> None:
+    started = time.perf_counter()
+    for card_bin in bins:
+        lookup(card_bin)
+    seconds = time.perf_counter() - started
+    print(f"{label}: {seconds:.2f}s for {lookups:,} ({seconds / lookups * 1e6:.2f} µs/lookup)")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--ranges", type=int, default=300_000)
+    parser.add_argument("--lookups", type=int, default=1_000_000)
+    args = parser.parse_args()
+
+    rng = random.Random(42)
+    fd, path = tempfile.mkstemp(suffix=".csv")
+    os.close(fd)
+    try:
+        write_table(path, args.ranges, rng)
+        size = os.path.getsize(path)
+
+        started = time.perf_counter()
+        BinTable.load(path)
+        load_seconds = time.perf_counter() - started
+
+        # Память - отдельной загрузкой: tracemalloc сильно замедляет разбор CSV
+        gc.collect()
+        tracemalloc.start()
+        table = BinTable.load(path)
+        gc.collect()
+        memory, _ = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+    finally:
+        os.unlink(path)
+
+    print(f"ranges: {len(table):,}  csv: {size / 2**20:.1f} MiB")
+    print(f"load: {load_seconds:.2f}s (при старте приложения)  "
+          f"memory: {memory / 2**20:.1f} MiB ({memory / len(table):.0f} B/range)")
+
+    # 6- и 8-значные BIN, как их присылает клиент
+    bins = [
+        f"{rng.randrange(10 ** BIN_LENGTH):0{BIN_LENGTH}d}"[:rng.choice((6, BIN_LENGTH))]
+        for _ in range(args.lookups)
+    ]
+    hits = sum(table.lookup(card_bin) is not None for card_bin in bins[:100_000])
+    print(f"hit rate: {hits / min(len(bins), 100_000):.0%}")
+
+    service = PaymentService()
+    service.bins = table
+    run("BinTable.lookup", table.lookup, bins, args.lookups)
+    run("choose_providers", lambda card_bin: service.choose_providers(card_bin, 500, "RUB"), bins, args.lookups)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,122 @@
+"""
+Бенчмарк листинга кампаний с sort=progress
+
+Сравнивает сортировку по выражению CASE (как было раньше) и по хранимой
+колонке campaigns.progress с индексом (status, progress, id): первая и
+глубокая страница (keyset-курсор из середины выборки).
+
+    alembic upgrade head
+    python scripts/bench_campaign_sort.py --seed 100000   # 100k активных кампаний
+    python scripts/bench_campaign_sort.py
+
+--seed пишет в БД из DATABASE_URL, использовать только на тестовой БД.
+"""
+import argparse
+import enum
+import statistics
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from sqlalchemy import Float, case, cast, create_engine, literal, select, text, tuple_  # noqa: E402
+
+from app.core.config import settings  # noqa: E402
+from app.models import Campaign  # noqa: E402
+from app.models.campaign import CampaignStatus  # noqa: E402
+
+
+SEED_SQL = """
+INSERT INTO users (tg_id, first_name, username)
+VALUES (-424242, 'Bench', 'bench_owner')
+ON CONFLICT (tg_id) DO NOTHING;
+
+INSERT INTO funds (name, description, country_code, categories, verified)
+VALUES ('Bench fund', 'Фонд для бенчмарка', 'RU', ARRAY['сироты'], true);
+
+INSERT INTO campaigns (owner_id, fund_id, title, description, category, goal_amount,
+                       collected_amount, currency, country_code, end_date, status,
+                       participants_count)
+SELECT (SELECT id FROM users WHERE tg_id = -424242), (SELECT max(id) FROM funds),
+       'Кампания ' || g, repeat('Описание кампании. ', 20), 'сироты',
+       10000 + g % 90000, (g * 7919) % 100000, 'RUB', 'RU',
+       now() + (1 + g % 90) * interval '1 day', 'ACTIVE'::campaignstatus, g % 500
+FROM generate_series(1, :campaigns) AS g;
+"""
+
+PAGE_SIZE = 20
+
+
+def legacy_progress():
+    """Выражение, по которому сортировал get_campaigns до появления колонки"""
+    return case(
+        (Campaign.goal_amount > 0, cast(Campaign.collected_amount, Float) / cast(Campaign.goal_amount, Float)),
+        else_=0.0
+    )
+
+
+def page_query(key, cursor=None):
+    query = select(Campaign).where(Campaign.status == CampaignStatus.ACTIVE)
+    if cursor is not None:
+        query = query.where(tuple_(key, Campaign.id) < tuple_(literal(cursor[0]), cursor[1]))
+    return query.order_by(key.desc(), Campaign.id.desc()).limit(PAGE_SIZE + 1)
+
+
+def explain_head(conn, statement) -> str:
+    """Верхние узлы плана (Sort или Index Scan)"""
+    compiled = statement.compile(dialect=conn.dialect)
+    params = {
+        key: value.name if isinstance(value, enum.Enum) else value
+        for key, value in compiled.params.items()
+    }
+    plan = conn.exec_driver_sql(f"EXPLAIN {compiled}", params).scalars().all()
+    return " / ".join(line.strip().lstrip("-> ").split("  (")[0] for line in plan[:3])
+
+
+def measure(conn, statement, repeat: int) -> float:
+    """Медиана времени выполнения, мс"""
+    timings = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        conn.execute(statement).all()
+        timings.append((time.perf_counter() - started) * 1000)
+    return statistics.median(timings)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--seed", type=int, metavar="CAMPAIGNS", help="Добавить активные кампании")
+    parser.add_argument("--repeat", type=int, default=20)
+    args = parser.parse_args()
+
+    engine = create_engine(settings.DATABASE_URL)
+
+    if args.seed:
+        with engine.begin() as conn:
+            for statement in SEED_SQL.split(";"):
+                if statement.strip():
+                    conn.execute(text(statement), {"campaigns": args.seed})
+            conn.execute(text("ANALYZE campaigns"))
+        print(f"Seeded {args.seed} active campaigns")
+
+    with engine.connect() as conn:
+        active = conn.execute(text(
+            "SELECT count(*) FROM campaigns WHERE status = 'ACTIVE'"
+        )).scalar()
+        print(f"Active campaigns: {active}\n")
+
+        for name, key in (("CASE expression", legacy_progress()), ("stored column", Campaign.progress)):
+            # Курсор из середины выборки - "глубокая" страница
+            middle = conn.execute(
+                select(key, Campaign.id).where(Campaign.status == CampaignStatus.ACTIVE)
+                .order_by(key.desc(), Campaign.id.desc()).offset(active // 2).limit(1)
+            ).first()
+
+            for page, statement in (("first page", page_query(key)), ("deep page", page_query(key, middle))):
+                print(f"{name:>16} | {page:<10} | {measure(conn, statement, args.repeat):>8.2f} ms | "
+                      f"{explain_head(conn, statement)}")
+
+
+if __name__ == "__main__":
+    main()
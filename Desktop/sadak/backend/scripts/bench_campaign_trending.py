@@ -0,0 +1,182 @@
+"""
+Бенчмарк листинга кампаний с sort=trending
+
+Сравнивает три способа получить верх листинга:
+- popularity: participants_count с индексом (status, participants_count, id);
+- trending: хранимый trending_score с индексом (status, trending_score, id);
+- затухание при чтении: сумма 2^(-возраст / T) по пожертвованиям на каждый
+  запрос - то, что пришлось бы делать без хранимого счёта.
+
+Плюс цена записи: UPDATE прогресса кампании с пересчётом trending_score
+и без него (в откатываемой транзакции).
+
+    alembic upgrade head
+    python scripts/bench_campaign_trending.py --seed 100000   # кампании + по 10 пожертвований
+    python scripts/bench_campaign_trending.py
+
+--seed пишет в БД из DATABASE_URL, использовать только на тестовой БД.
+"""
+import argparse
+import asyncio
+import enum
+import statistics
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from sqlalchemy import create_engine, extract, func, literal, select, text, tuple_, update  # noqa: E402
+
+from app.core.config import settings  # noqa: E402
+from app.core.database import AsyncSessionLocal  # noqa: E402
+from app.models import Campaign, Donation  # noqa: E402
+from app.models.campaign import CampaignStatus  # noqa: E402
+from app.models.donation import DonationStatus  # noqa: E402
+from app.services import campaign_service  # noqa: E402
+
+
+SEED_SQL = """
+INSERT INTO users (tg_id, first_name, username)
+VALUES (-424243, 'Bench', 'bench_trending')
+ON CONFLICT (tg_id) DO NOTHING;
+
+INSERT INTO funds (name, description, country_code, categories, verified)
+VALUES ('Bench fund', 'Фонд для бенчмарка', 'RU', ARRAY['сироты'], true);
+
+INSERT INTO campaigns (owner_id, fund_id, title, description, category, goal_amount,
+                       collected_amount, currency, country_code, end_date, status,
+                       participants_count)
+SELECT (SELECT id FROM users WHERE tg_id = -424243), (SELECT max(id) FROM funds),
+       'Кампания ' || g, repeat('Описание кампании. ', 20), 'сироты',
+       1000000, 0, 'RUB', 'RU',
+       now() + (1 + g % 90) * interval '1 day', 'ACTIVE'::campaignstatus, g % 500
+FROM generate_series(1, :campaigns) AS g;
+
+INSERT INTO donations (user_id, campaign_id, amount_value, currency, status, donation_type,
+                       created_at, completed_at)
+SELECT (SELECT id FROM users WHERE tg_id = -424243),
+       c.max_id - (g % :campaigns), 100 + g % 5000, 'RUB', 'COMPLETED'::donationstatus, 'campaign',
+       now() - (g % 720) * interval '1 hour', now() - (g % 720) * interval '1 hour'
+FROM generate_series(1, :campaigns * :per_campaign) AS g,
+     (SELECT max(id) AS max_id FROM campaigns) AS c;
+"""
+
+PAGE_SIZE = 20
+
+
+def page_query(key, cursor=None):
+    query = select(Campaign).where(Campaign.status == CampaignStatus.ACTIVE)
+    if cursor is not None:
+        query = query.where(tuple_(key, Campaign.id) < tuple_(literal(cursor[0]), cursor[1]))
+    return query.order_by(key.desc(), Campaign.id.desc()).limit(PAGE_SIZE + 1)
+
+
+def decay_on_read_query():
+    """Трендовость, посчитанная по пожертвованиям в момент запроса"""
+    age_hours = extract("epoch", func.now() - Donation.completed_at) / 3600
+    score = func.sum(func.power(0.5, age_hours / settings.TRENDING_HALF_LIFE_HOURS)).label("score")
+    return select(Donation.campaign_id, score).join(Campaign, Campaign.id == Donation.campaign_id).where(
+        Campaign.status == CampaignStatus.ACTIVE,
+        Donation.status == DonationStatus.COMPLETED
+    ).group_by(Donation.campaign_id).order_by(score.desc(), Donation.campaign_id.desc()).limit(PAGE_SIZE + 1)
+
+
+def progress_update(campaign_id: int, with_trending: bool):
+    """UPDATE прогресса, как его выполняет update_campaign_progress"""
+    stmt = campaign_service._progress_update(update(Campaign).where(Campaign.id == campaign_id), 100, 1)
+    if not with_trending:
+        stmt = stmt.values(trending_score=Campaign.trending_score)
+    return stmt
+
+
+def explain_head(conn, statement) -> str:
+    """Верхние узлы плана (Sort или Index Scan)"""
+    compiled = statement.compile(dialect=conn.dialect)
+    params = {
+        key: value.name if isinstance(value, enum.Enum) else value
+        for key, value in compiled.params.items()
+    }
+    plan = conn.exec_driver_sql(f"EXPLAIN {compiled}", params).scalars().all()
+    return " / ".join(line.strip().lstrip("-> ").split("  (")[0] for line in plan[:3])
+
+
+def measure(conn, statement, repeat: int) -> float:
+    """Медиана времени выполнения, мс"""
+    timings = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        conn.execute(statement).all()
+        timings.append((time.perf_counter() - started) * 1000)
+    return statistics.median(timings)
+
+
+def measure_write(engine, statement, repeat: int) -> float:
+    """Медиана времени UPDATE в транзакции, которая откатывается, мс"""
+    timings = []
+    for _ in range(repeat):
+        with engine.connect() as conn:
+            transaction = conn.begin()
+            started = time.perf_counter()
+            conn.execute(statement).all()
+            timings.append((time.perf_counter() - started) * 1000)
+            transaction.rollback()
+    return statistics.median(timings)
+
+
+async def recompute() -> int:
+    async with AsyncSessionLocal() as db:
+        return await campaign_service.recompute_trending_scores(db)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--seed", type=int, metavar="CAMPAIGNS", help="Добавить активные кампании")
+    parser.add_argument("--per-campaign", type=int, default=10, help="Пожертвований на кампанию при --seed")
+    parser.add_argument("--repeat", type=int, default=20)
+    args = parser.parse_args()
+
+    engine = create_engine(settings.DATABASE_URL)
+
+    if args.seed:
+        with engine.begin() as conn:
+            for statement in SEED_SQL.split(";"):
+                if statement.strip():
+                    conn.execute(text(statement), {"campaigns": args.seed, "per_campaign": args.per_campaign})
+        print(f"Seeded {args.seed} active campaigns, {args.seed * args.per_campaign} donations")
+        print(f"trending_score recomputed for {asyncio.run(recompute())} campaigns")
+        with engine.begin() as conn:
+            conn.execute(text("ANALYZE campaigns"))
+            conn.execute(text("ANALYZE donations"))
+
+    with engine.connect() as conn:
+        active = conn.execute(text(
+            "SELECT count(*) FROM campaigns WHERE status = 'ACTIVE'"
+        )).scalar()
+        campaign_id = conn.execute(select(func.max(Campaign.id))).scalar()
+        print(f"Active campaigns: {active}\n")
+
+        for name, key in (("popularity", Campaign.participants_count), ("trending", Campaign.trending_score)):
+            # Курсор из середины выборки - "глубокая" страница
+            middle = conn.execute(
+                select(key, Campaign.id).where(Campaign.status == CampaignStatus.ACTIVE)
+                .order_by(key.desc(), Campaign.id.desc()).offset(active // 2).limit(1)
+            ).first()
+
+            for page, statement in (("first page", page_query(key)), ("deep page", page_query(key, middle))):
+                print(f"{name:>16} | {page:<10} | {measure(conn, statement, args.repeat):>8.2f} ms | "
+                      f"{explain_head(conn, statement)}")
+
+        statement = decay_on_read_query()
+        print(f"{'decay on read':>16} | {'first page':<10} | {measure(conn, statement, args.repeat):>8.2f} ms | "
+              f"{explain_head(conn, statement)}")
+
+    if campaign_id is not None:
+        print()
+        for name, with_trending in (("progress UPDATE", False), ("+ trending", True)):
+            timing = measure_write(engine, progress_update(campaign_id, with_trending), args.repeat)
+            print(f"{name:>16} | {'write':<10} | {timing:>8.2f} ms |")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,52 @@
+"""
+Микробенчмарк валидации Telegram initData (валидаций в секунду)
+
+    python scripts/bench_init_data.py
+
+Сравнивает полную проверку (разбор, HMAC, json.loads) с повторной
+проверкой той же строки, которая обслуживается из кэша.
+"""
+import hashlib
+import hmac
+import json
+import sys
+import time
+import timeit
+from pathlib import Path
+from urllib.parse import urlencode
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from app.core import telegram  # noqa: E402
+from app.core.config import settings  # noqa: E402
+
+
+def make_signed_init_data(secret: str, tg_id: int) -> str:
+    """initData, подписанная так же, как это делает Telegram"""
+    data = {
+        "query_id": f"AAH{tg_id}",
+        "user": json.dumps({"id": tg_id, "first_name": "Bench", "username": f"bench_{tg_id}", "language_code": "ru"}),
+        "auth_date": str(int(time.time())),
+    }
+    data_check_string = "\n".join(f"{k}={v}" for k, v in sorted(data.items()))
+    secret_key = hmac.new(b"WebAppData", secret.encode(), hashlib.sha256).digest()
+    data["hash"] = hmac.new(secret_key, data_check_string.encode(), hashlib.sha256).hexdigest()
+    return urlencode(data)
+
+
+def main() -> None:
+    settings.TELEGRAM_SECRET_KEY = "bench-secret"
+    number = 200_000
+
+    init_data = make_signed_init_data(settings.TELEGRAM_SECRET_KEY, 123456789)
+    assert telegram.validate_telegram_init_data(init_data) is not None
+
+    uncached = timeit.timeit(lambda: telegram._validate(init_data), number=number)
+    cached = timeit.timeit(lambda: telegram.validate_telegram_init_data(init_data), number=number)
+
+    print(f"full validation:   {number / uncached:>12,.0f} validations/s")
+    print(f"cached validation: {number / cached:>12,.0f} validations/s")
+
+
+if __name__ == "__main__":
+    main()
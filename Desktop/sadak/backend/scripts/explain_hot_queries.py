@@ -0,0 +1,196 @@
+"""
+EXPLAIN ANALYZE для горячих запросов API
+
+Запросы собираются теми же выражениями SQLAlchemy, что и в сервисах,
+и выполняются с EXPLAIN (ANALYZE, BUFFERS) на БД из DATABASE_URL.
+
+    alembic upgrade head
+    python scripts/explain_hot_queries.py --seed 100000   # заполнить тестовыми данными
+    python scripts/explain_hot_queries.py
+
+--seed генерирует данные через generate_series и запускает ANALYZE,
+поэтому использовать его стоит только на отдельной тестовой БД.
+"""
+import argparse
+import enum
+import sys
+from datetime import datetime
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from sqlalchemy import create_engine, func, literal, select, text, tuple_  # noqa: E402
+
+from app.core.config import settings  # noqa: E402
+from app.models import Campaign, CampaignReport, Donation, Fund, Report, Subscription, ZakatCalc  # noqa: E402
+from app.models.campaign import CampaignStatus  # noqa: E402
+from app.models.donation import DonationStatus  # noqa: E402
+from app.models.subscription import SubscriptionStatus  # noqa: E402
+
+
+SEED_SQL = """
+INSERT INTO users (tg_id, first_name, username)
+SELECT 1000000 + g, 'User ' || g, 'user_' || g
+FROM generate_series(1, :users) AS g;
+
+INSERT INTO funds (name, description, country_code, categories, verified)
+SELECT 'Фонд ' || g, 'Описание фонда ' || g,
+       (ARRAY['RU', 'KZ', 'UZ', 'TR', 'AE'])[1 + g % 5],
+       ARRAY[(ARRAY['мечеть', 'сироты', 'медицина', 'образование', 'вода'])[1 + g % 5]],
+       g % 3 <> 0
+FROM generate_series(1, :funds) AS g;
+
+INSERT INTO campaigns (owner_id, fund_id, title, description, category, goal_amount,
+                       collected_amount, currency, country_code, end_date, status,
+                       participants_count, created_at)
+SELECT u.min_id + (g % :users), f.min_id + (g % :funds),
+       'Кампания ' || g, repeat('Описание кампании. ', 20),
+       (ARRAY['мечеть', 'сироты', 'медицина', 'образование', 'вода'])[1 + g % 5],
+       100000, (g * 37) % 100000, 'RUB',
+       (ARRAY['RU', 'KZ', 'UZ', 'TR', 'AE'])[1 + g % 5],
+       now() + ((g % 90) - 10) * interval '1 day',
+       (CASE WHEN g % 10 < 7 THEN 'ACTIVE' WHEN g % 10 < 9 THEN 'COMPLETED' ELSE 'PENDING' END)::campaignstatus,
+       g % 500, now() - (g % 365) * interval '1 day'
+FROM generate_series(1, :campaigns) AS g,
+     (SELECT min(id) AS min_id FROM users) AS u,
+     (SELECT min(id) AS min_id FROM funds) AS f;
+
+INSERT INTO donations (user_id, campaign_id, amount_value, currency, status, donation_type,
+                       created_at, completed_at)
+SELECT u.min_id + (g % :users), c.min_id + (g % :campaigns), 100 + g % 5000, 'RUB',
+       (CASE WHEN g % 4 = 0 THEN 'PENDING' ELSE 'COMPLETED' END)::donationstatus,
+       'campaign', now() - (g % 400) * interval '1 day',
+       CASE WHEN g % 4 = 0 THEN NULL ELSE now() - (g % 400) * interval '1 day' END
+FROM generate_series(1, :donations) AS g,
+     (SELECT min(id) AS min_id FROM users) AS u,
+     (SELECT min(id) AS min_id FROM campaigns) AS c;
+
+INSERT INTO subscriptions (user_id, plan, period, amount_value, status)
+SELECT u.min_id + (g % :users), 'BASIC', 'P1M', 500,
+       (CASE WHEN g % 3 = 0 THEN 'CANCELLED' ELSE 'ACTIVE' END)::subscriptionstatus
+FROM generate_series(1, :users) AS g, (SELECT min(id) AS min_id FROM users) AS u;
+
+INSERT INTO zakat_calculations (user_id, total_wealth, nisab_value, zakat_due, created_at)
+SELECT u.min_id + (g % :users), 1000000, 450000, 25000, now() - (g % 365) * interval '1 day'
+FROM generate_series(1, :users) AS g, (SELECT min(id) AS min_id FROM users) AS u;
+
+INSERT INTO reports (fund_id, period_start, period_end, file_url, verified, created_at)
+SELECT f.min_id + (g % :funds), now() - interval '30 days', now(),
+       'https://example.org/report/' || g || '.pdf', g % 2 = 0, now() - (g % 365) * interval '1 day'
+FROM generate_series(1, :funds) AS g, (SELECT min(id) AS min_id FROM funds) AS f;
+"""
+
+
+def hot_queries(sample: dict) -> dict:
+    """Горячие запросы в том виде, в каком их строят сервисы"""
+    now = datetime.utcnow()
+    month_start = now.replace(day=1, hour=0, minute=0, second=0, microsecond=0)
+    user_id = sample["user_id"]
+    campaign_id = sample["campaign_id"]
+    fund_id = sample["fund_id"]
+
+    return {
+        "GET /campaigns (newest)": select(Campaign).where(
+            Campaign.status == CampaignStatus.ACTIVE
+        ).order_by(Campaign.created_at.desc(), Campaign.id.desc()).limit(21),
+        "GET /campaigns (newest, country)": select(Campaign).where(
+            Campaign.status == CampaignStatus.ACTIVE,
+            Campaign.effective_country_code == "RU"
+        ).order_by(Campaign.created_at.desc(), Campaign.id.desc()).limit(21),
+        "GET /campaigns (popularity, deep page)": select(Campaign).where(
+            Campaign.status == CampaignStatus.ACTIVE,
+            tuple_(Campaign.participants_count, Campaign.id) < tuple_(literal(10), 1)
+        ).order_by(Campaign.participants_count.desc(), Campaign.id.desc()).limit(21),
+        "GET /campaigns (progress)": select(Campaign).where(
+            Campaign.status == CampaignStatus.ACTIVE
+        ).order_by(Campaign.progress.desc(), Campaign.id.desc()).limit(21),
+        "GET /campaigns (trending)": select(Campaign).where(
+            Campaign.status == CampaignStatus.ACTIVE
+        ).order_by(Campaign.trending_score.desc(), Campaign.id.desc()).limit(21),
+        "GET /campaigns (trending, country)": select(Campaign).where(
+            Campaign.status == CampaignStatus.ACTIVE,
+            Campaign.effective_country_code == "RU"
+        ).order_by(Campaign.trending_score.desc(), Campaign.id.desc()).limit(21),
+        "GET /campaigns/{id}/donations": select(Donation).where(
+            Donation.campaign_id == campaign_id,
+            Donation.status == DonationStatus.COMPLETED
+        ).order_by(Donation.completed_at.desc()).limit(10),
+        "GET /campaigns/{id}/report": select(CampaignReport).where(
+            CampaignReport.campaign_id == campaign_id
+        ),
+        "refresh_campaign_reports: fund report": select(Report).where(
+            Report.fund_id == fund_id,
+            Report.verified == True
+        ).order_by(Report.created_at.desc()).limit(1),
+        "GET /me/stats (month)": select(
+            func.sum(Donation.amount_value), func.count(Donation.id)
+        ).where(
+            Donation.user_id == user_id,
+            Donation.status == DonationStatus.COMPLETED,
+            Donation.completed_at >= month_start
+        ),
+        "GET /me/history (donations)": select(Donation).where(
+            Donation.user_id == user_id
+        ).order_by(Donation.created_at.desc()).limit(50),
+        "GET /me/stats (subscriptions)": select(func.count(Subscription.id)).where(
+            Subscription.user_id == user_id,
+            Subscription.status == SubscriptionStatus.ACTIVE
+        ),
+        "GET /zakat/history": select(ZakatCalc).where(
+            ZakatCalc.user_id == user_id
+        ).order_by(ZakatCalc.created_at.desc()).limit(50),
+        "GET /funds?category=": select(Fund).where(
+            Fund.categories.contains(["сироты"])
+        ).limit(100),
+        "check_and_expire_campaigns": select(Campaign).where(
+            Campaign.status == CampaignStatus.ACTIVE,
+            Campaign.end_date < now
+        ),
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--seed", type=int, metavar="CAMPAIGNS", help="Заполнить БД тестовыми данными")
+    args = parser.parse_args()
+
+    engine = create_engine(settings.DATABASE_URL)
+
+    if args.seed:
+        campaigns = args.seed
+        params = {
+            "users": max(campaigns // 2, 1),
+            "funds": max(campaigns // 100, 1),
+            "campaigns": campaigns,
+            "donations": campaigns * 10,
+        }
+        with engine.begin() as conn:
+            for statement in SEED_SQL.split(";"):
+                if statement.strip():
+                    conn.execute(text(statement), params)
+            conn.execute(text("ANALYZE"))
+        print(f"Seeded: {params}")
+
+    with engine.connect() as conn:
+        sample = conn.execute(text(
+            "SELECT (SELECT user_id FROM donations ORDER BY id LIMIT 1) AS user_id, "
+            "(SELECT campaign_id FROM donations WHERE campaign_id IS NOT NULL ORDER BY id LIMIT 1) AS campaign_id, "
+            "(SELECT id FROM funds ORDER BY id LIMIT 1) AS fund_id"
+        )).mappings().one()
+
+        for name, statement in hot_queries(dict(sample)).items():
+            compiled = statement.compile(dialect=engine.dialect)
+            # Enum-колонки хранят имена членов (как это делает SQLAlchemy Enum)
+            params = {
+                key: value.name if isinstance(value, enum.Enum) else value
+                for key, value in compiled.params.items()
+            }
+            plan = conn.exec_driver_sql(
+                f"EXPLAIN (ANALYZE, BUFFERS) {compiled}", params
+            ).scalars().all()
+            print(f"\n=== {name} ===")
+            print("\n".join(plan))
+
+
+if __name__ == "__main__":
+    main()
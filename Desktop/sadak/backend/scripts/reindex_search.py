@@ -0,0 +1,63 @@
+"""
+Полная загрузка активных кампаний и фондов во внешний поисковый движок
+
+Нужна при первом включении ELASTICSEARCH_URL или после потери индекса;
+дальше индекс обновляется из campaign_service. Для поиска средствами
+PostgreSQL не нужна: search_vector вычисляет сама БД.
+
+    ELASTICSEARCH_URL=http://localhost:9200 python scripts/reindex_search.py
+"""
+import argparse
+import asyncio
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from sqlalchemy import select  # noqa: E402
+
+from app.core.database import AsyncSessionLocal, engine  # noqa: E402
+from app.models import Campaign, Fund  # noqa: E402
+from app.models.campaign import CampaignStatus  # noqa: E402
+from app.services.search import search_backend  # noqa: E402
+
+
+async def reindex(model, query, batch_size: int) -> int:
+    """Передать строки движку пачками по batch_size (keyset по id)"""
+    total, last_id = 0, 0
+    async with AsyncSessionLocal() as db:
+        while True:
+            rows = (await db.execute(
+                query.where(model.id > last_id).order_by(model.id).limit(batch_size)
+            )).scalars().all()
+            if not rows:
+                return total
+            if model is Campaign:
+                await search_backend.index_campaigns(rows)
+            else:
+                await search_backend.index_funds(rows)
+            total += len(rows)
+            last_id = rows[-1].id
+            db.expunge_all()
+
+
+async def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--batch-size", type=int, default=500)
+    args = parser.parse_args()
+
+    try:
+        campaigns = await reindex(
+            Campaign,
+            select(Campaign).where(Campaign.status == CampaignStatus.ACTIVE),
+            args.batch_size
+        )
+        funds = await reindex(Fund, select(Fund), args.batch_size)
+        print(f"Indexed {campaigns} campaigns, {funds} funds ({type(search_backend).__name__})")
+    finally:
+        await search_backend.aclose()
+        await engine.dispose()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,72 @@
+"""
+Зависимости авторизации (app/core/security.py)
+"""
+import pytest
+
+from app.core.config import settings
+from app.models.campaign import CampaignStatus
+
+pytestmark = pytest.mark.anyio
+
+
+@pytest.fixture
+def admin_only(monkeypatch, user):
+    monkeypatch.setattr(settings, "ADMIN_TELEGRAM_IDS", str(user.tg_id))
+
+
+async def test_token_only_admin_moderates_campaign(client, make_campaign, auth_headers, admin_only):
+    campaign = await make_campaign(status=CampaignStatus.PENDING)
+
+    response = await client.patch(
+        f"/api/v1/campaigns/{campaign.id}/status", headers=auth_headers, json={"status": "approved"}
+    )
+
+    assert response.status_code == 200
+    assert response.json()["status"] == "active"
+
+
+async def test_init_data_user_is_authorized(client, init_data_headers):
+    response = await client.get("/api/v1/me/history", headers=init_data_headers)
+
+    assert response.status_code == 200
+
+
+@pytest.mark.parametrize("headers", [
+    {},
+    {"Authorization": "Bearer not-a-token"},
+    {"X-Telegram-Init-Data": "auth_date=1"},
+])
+async def test_unauthorized(client, headers):
+    response = await client.get("/api/v1/me/history", headers=headers)
+
+    assert response.status_code == 401
+
+
+async def test_non_admin_is_forbidden(client, make_campaign, auth_headers, monkeypatch):
+    monkeypatch.setattr(settings, "ADMIN_TELEGRAM_IDS", "999")
+    campaign = await make_campaign(status=CampaignStatus.PENDING)
+
+    response = await client.patch(
+        f"/api/v1/campaigns/{campaign.id}/status", headers=auth_headers, json={"status": "approved"}
+    )
+
+    assert response.status_code == 403
+
+
+async def test_default_secret_key_is_rejected_in_production(client, user, monkeypatch):
+    from jose import jwt
+    from app.core.config import DEFAULT_SECRET_KEY
+    from app.core.security import create_access_token
+
+    monkeypatch.setattr(settings, "SECRET_KEY", DEFAULT_SECRET_KEY)
+    monkeypatch.setattr(settings, "ENVIRONMENT", "production")
+    monkeypatch.setattr(settings, "ADMIN_TELEGRAM_IDS", str(user.tg_id))
+    # Поддельный токен администратора, подписанный публичным ключом по умолчанию
+    forged = jwt.encode({"sub": str(user.id), "tg_id": user.tg_id, "exp": 2 ** 32},
+                        DEFAULT_SECRET_KEY, algorithm=settings.ALGORITHM)
+
+    response = await client.get("/metrics/db", headers={"Authorization": f"Bearer {forged}"})
+
+    assert response.status_code == 401
+    with pytest.raises(RuntimeError):
+        create_access_token(user.id, user.tg_id)
@@ -0,0 +1,33 @@
+"""
+Кэш страниц GET /campaigns и отставание реплики
+"""
+import time
+
+import pytest
+
+pytestmark = pytest.mark.anyio
+
+
+async def test_replica_page_is_not_cached_right_after_invalidation(db, make_campaign, monkeypatch):
+    from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine
+    from app.core.config import settings
+    from app.services import campaign_service
+
+    replica_engine = create_async_engine("postgresql+asyncpg://replica/sadaka")
+    replica = AsyncSession(bind=replica_engine)
+
+    # make_campaign не сбрасывает кэш - сбрасываем как сервис при изменении кампании
+    campaign = await make_campaign()
+    campaign_service.invalidate_campaign_listings(campaign)
+
+    assert not campaign_service.can_cache_listing(replica)
+    assert campaign_service.can_cache_listing(db)
+
+    monkeypatch.setattr(
+        campaign_service, "_listings_invalidated_at",
+        time.monotonic() - settings.READ_AFTER_WRITE_SECONDS
+    )
+    assert campaign_service.can_cache_listing(replica)
+
+    await replica.close()
+    await replica_engine.dispose()
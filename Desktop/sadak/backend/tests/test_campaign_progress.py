@@ -0,0 +1,60 @@
+"""
+Конкурентные обновления прогресса кампании (update_campaign_progress)
+
+COUNT завершений пожертвований одновременно, каждое в своей сессии, как
+отдельные вебхуки: ни одно не должно потеряться, а переход в COMPLETED
+должен случиться ровно один раз.
+"""
+import asyncio
+from decimal import Decimal
+
+import pytest
+
+from app.models.campaign import CampaignStatus
+
+pytestmark = pytest.mark.anyio
+
+COUNT = 1000
+
+
+@pytest.fixture
+def goal_reached_calls(monkeypatch):
+    """Кампании, о завершении которых ушло бы уведомление организатору"""
+    from app.services import campaign_service
+
+    calls = []
+    monkeypatch.setattr(campaign_service, "_notify_donation", lambda owner_tg_id, campaign, amount: None)
+    monkeypatch.setattr(campaign_service, "_notify_goal_reached",
+                        lambda owner_tg_id, campaign: calls.append(campaign.id))
+    return calls
+
+
+@pytest.mark.parametrize("shards", [0, 16])
+async def test_concurrent_progress_updates(make_campaign, goal_reached_calls, monkeypatch, shards):
+    from app.core.config import settings
+    from app.core.database import AsyncSessionLocal
+    from app.models import Campaign
+    from app.services import campaign_service
+
+    monkeypatch.setattr(settings, "CAMPAIGN_COUNTER_SHARDS", shards)
+    amounts = [Decimal(100 + i % 50) for i in range(COUNT)]
+    expected_total = sum(amounts)
+    # Цель достигается примерно на середине
+    campaign = await make_campaign(goal_amount=expected_total / 2)
+
+    async def complete_donation(amount: Decimal) -> None:
+        async with AsyncSessionLocal() as db:
+            await campaign_service.update_campaign_progress(db=db, campaign_id=campaign.id, amount=amount)
+
+    await asyncio.gather(*(complete_donation(amount) for amount in amounts))
+    if shards > 0:
+        async with AsyncSessionLocal() as db:
+            await campaign_service.flush_campaign_counters(db=db)
+
+    async with AsyncSessionLocal() as db:
+        result = await db.get(Campaign, campaign.id)
+
+    assert result.collected_amount == expected_total
+    assert result.participants_count == COUNT
+    assert result.status == CampaignStatus.COMPLETED
+    assert goal_reached_calls == [campaign.id]
@@ -0,0 +1,30 @@
+"""
+Смена страны фонда и кэши листинга кампаний
+"""
+import pytest
+
+from app.core.config import settings
+
+pytestmark = pytest.mark.anyio
+
+
+async def test_fund_country_change_refreshes_listings(client, make_campaign, fund, auth_headers, monkeypatch, user):
+    monkeypatch.setattr(settings, "ADMIN_TELEGRAM_IDS", str(user.tg_id))
+    campaign = await make_campaign()
+    own_country = await make_campaign(country_code="RU")
+
+    # Страницы обеих стран попадают в кэш
+    ru = await client.get("/api/v1/campaigns", params={"country_code": "RU"})
+    kz = await client.get("/api/v1/campaigns", params={"country_code": "KZ"})
+    assert {item["id"] for item in ru.json()["items"]} == {campaign.id, own_country.id}
+    assert kz.json()["items"] == []
+
+    response = await client.patch(f"/api/v1/admin/funds/{fund.id}/country",
+                                  headers=auth_headers, json={"country_code": "kz"})
+    assert response.status_code == 200
+    assert response.json()["country_code"] == "KZ"
+
+    ru = await client.get("/api/v1/campaigns", params={"country_code": "RU"})
+    kz = await client.get("/api/v1/campaigns", params={"country_code": "KZ"})
+    assert [item["id"] for item in ru.json()["items"]] == [own_country.id]
+    assert [item["id"] for item in kz.json()["items"]] == [campaign.id]
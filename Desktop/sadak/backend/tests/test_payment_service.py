@@ -0,0 +1,45 @@
+"""
+Инициализация платежей у провайдеров (PaymentService)
+"""
+import json
+
+import pytest
+
+pytestmark = pytest.mark.anyio
+
+
+async def test_yookassa_payment(yookassa):
+    from app.services.payment import payment_service
+
+    result = await payment_service.init_payment(amount=500, currency="RUB", order_id="42",
+                                                return_url="https://t.me/test_bot")
+
+    request, = yookassa
+    assert request.method == "POST"
+    assert request.url.path == "/v3/payments"
+    assert request.headers["Idempotence-Key"] == "42"
+    assert json.loads(request.content) == {
+        "amount": {"value": "500.00", "currency": "RUB"},
+        "confirmation": {"type": "redirect", "return_url": "https://t.me/test_bot"},
+        "description": "Пожертвование #42",
+        "metadata": {"order_id": "42"},
+    }
+    assert result == {
+        "payment_id": "yk-42",
+        "payment_url": "https://yoomoney.ru/checkout/payments/v2/contract?orderId=yk-42",
+        "provider": "yookassa",
+    }
+
+
+async def test_no_provider_available(monkeypatch):
+    import httpx
+    from app.services.payment import payment_service
+
+    # Ответ провайдера с ошибкой: CloudPayments в тестах не настроен, пробовать больше некого
+    client = httpx.AsyncClient(base_url="https://api.yookassa.ru/v3",
+                               transport=httpx.MockTransport(lambda request: httpx.Response(500)))
+    monkeypatch.setitem(payment_service._clients, "yookassa", client)
+
+    with pytest.raises(Exception, match="No payment provider available"):
+        await payment_service.init_payment(amount=500, currency="RUB", order_id="43")
+    await client.aclose()
@@ -0,0 +1,106 @@
+"""
+Бюджеты SQL-запросов (app/core/query_budget.py)
+
+По тесту на каждый эндпоинт из QUERY_BUDGETS и на EXPIRY_TASK_QUERY_BUDGET.
+Новый бюджет в QUERY_BUDGETS без теста здесь роняет test_every_budget_is_tested.
+"""
+from datetime import datetime, timedelta, timezone
+
+import pytest
+
+from app.core.query_budget import EXPIRY_TASK_QUERY_BUDGET, QUERY_BUDGETS
+from app.models.campaign import CampaignStatus
+
+pytestmark = pytest.mark.anyio
+
+TESTED_BUDGETS = {
+    "GET /api/v1/campaigns",
+    "GET /api/v1/campaigns/{campaign_id}/report",
+    "POST /api/v1/donations/init",
+}
+
+
+def test_every_budget_is_tested():
+    assert set(QUERY_BUDGETS) == TESTED_BUDGETS
+
+
+async def test_campaigns_listing(client, make_campaign, query_budget):
+    for _ in range(3):
+        await make_campaign()
+
+    with query_budget("GET /api/v1/campaigns"):
+        response = await client.get("/api/v1/campaigns")
+
+    assert response.status_code == 200
+    assert len(response.json()["items"]) == 3
+
+
+async def test_campaign_report_of_active_campaign(client, make_campaign, query_budget):
+    # Отчёта нет: чтение отчёта и кампании - худший случай
+    campaign = await make_campaign()
+
+    with query_budget("GET /api/v1/campaigns/{campaign_id}/report"):
+        response = await client.get(f"/api/v1/campaigns/{campaign.id}/report")
+
+    assert response.status_code == 400
+
+
+async def test_campaign_report_of_completed_campaign(client, make_campaign, query_budget):
+    from app.core.tasks import check_expired_campaigns_task
+
+    campaign = await make_campaign(end_date=datetime.now(timezone.utc) - timedelta(minutes=1))
+    await check_expired_campaigns_task()
+
+    with query_budget("GET /api/v1/campaigns/{campaign_id}/report"):
+        response = await client.get(f"/api/v1/campaigns/{campaign.id}/report")
+
+    assert response.status_code == 200
+    assert response.json()["campaign_id"] == campaign.id
+
+
+@pytest.fixture
+def no_replika_sync(monkeypatch):
+    """Фоновая синхронизация с e-replika.ru - внешний HTTP вне бюджета эндпоинта"""
+    from app.api.v1 import donations
+
+    async def _skip(donation_id: int):
+        pass
+
+    monkeypatch.setattr(donations, "sync_donation_to_replika", _skip)
+
+
+@pytest.mark.parametrize("auth", ["auth_headers", "init_data_headers"])
+async def test_donation_init(client, make_campaign, query_budget, no_replika_sync, yookassa, auth, request):
+    # initData: пользователя нет в кэше - бюджет включает его upsert
+    headers = request.getfixturevalue(auth)
+    campaign = await make_campaign()
+
+    with query_budget("POST /api/v1/donations/init"):
+        response = await client.post("/api/v1/donations/init", headers=headers, json={
+            "campaign_id": campaign.id,
+            "amount_value": "500.00",
+            "currency": "RUB",
+        })
+
+    assert response.status_code == 200
+    body = response.json()
+    assert body["status"] == "processing"
+    assert body["payment_url"]
+    assert body["created_at"]
+    assert len(yookassa) == 1
+
+
+async def test_expiry_task_is_constant(db, make_campaign, query_budget):
+    from app.core.config import settings
+    from app.core.tasks import check_expired_campaigns_task
+
+    # Пачка до CAMPAIGN_EXPIRY_BATCH_SIZE: число запросов не зависит от числа кампаний
+    count = min(5, settings.CAMPAIGN_EXPIRY_BATCH_SIZE)
+    for _ in range(count):
+        await make_campaign(end_date=datetime.now(timezone.utc) - timedelta(minutes=1))
+
+    with query_budget(EXPIRY_TASK_QUERY_BUDGET):
+        expired = await check_expired_campaigns_task()
+
+    assert len(expired) == count
+    assert all(campaign.status == CampaignStatus.EXPIRED for campaign in expired)
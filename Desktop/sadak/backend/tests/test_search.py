@@ -0,0 +1,31 @@
+"""
+Полнотекстовый поиск (PostgresSearchBackend)
+"""
+import pytest
+
+pytestmark = pytest.mark.anyio
+
+
+async def test_unverified_funds_are_not_found(client, db, fund):
+    from app.models import Fund
+
+    unverified = Fund(name="Test fund unverified", description="Фонд для тестов", country_code="RU",
+                      categories=["сироты"], verified=False)
+    db.add(unverified)
+    await db.commit()
+
+    response = await client.get("/api/v1/search", params={"q": "test fund", "type": "fund"})
+
+    assert response.status_code == 200
+    assert [item["id"] for item in response.json()["items"]] == [fund.id]
+
+
+def test_backend_without_search_cannot_be_created():
+    from app.services.search import SearchBackend
+
+    class IndexOnlyBackend(SearchBackend):
+        async def index_campaigns(self, campaigns):
+            pass
+
+    with pytest.raises(TypeError):
+        IndexOnlyBackend()
@@ -0,0 +1,41 @@
+"""
+get_or_create_user: upsert пользователя при входе
+"""
+import asyncio
+
+import pytest
+
+from app.core.database import AsyncSessionLocal
+from app.models import User
+from app.services import donation_service
+
+pytestmark = pytest.mark.anyio
+
+
+async def test_creates_and_returns_existing_user(db):
+    created = await donation_service.get_or_create_user(db, tg_id=2001, first_name="Ali")
+    donation_service._user_cache.clear()
+
+    existing = await donation_service.get_or_create_user(db, tg_id=2001, first_name="Ali")
+
+    assert existing == created
+
+
+async def test_concurrent_first_login(db):
+    # Первый запрос вставил строку, но ещё не зафиксировал; второй ждёт на
+    # конфликте и после commit первого не должен упасть с NoResultFound
+    async with AsyncSessionLocal() as first, AsyncSessionLocal() as second:
+        first.add(User(tg_id=2002, first_name="Ali"))
+        await first.flush()
+
+        login = asyncio.create_task(
+            donation_service.get_or_create_user(second, tg_id=2002, first_name="Ali")
+        )
+        await asyncio.sleep(0.2)
+        assert not login.done()
+        await first.commit()
+
+        user = await asyncio.wait_for(login, timeout=5)
+
+    assert user.tg_id == 2002
+    assert user.first_name == "Ali"
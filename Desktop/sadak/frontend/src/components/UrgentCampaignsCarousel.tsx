@@ -24,37 +24,8 @@ const UrgentCampaignsCarousel = ({ maxItems = 5 }: UrgentCampaignsCarouselProps)
 
   const loadUrgentCampaigns = async () => {
     try {
-      const allCampaigns = await campaignsService.getCampaigns({ status: 'active' })
-      
-      // Фильтруем срочные кампании (заканчиваются в ближайшие 7 дней или мало собрано)
-      const now = new Date()
-      let urgent = allCampaigns
-        .filter(campaign => {
-          const endDate = new Date(campaign.end_date)
-          const daysLeft = Math.ceil((endDate.getTime() - now.getTime()) / (1000 * 60 * 60 * 24))
-          const progress = parseFloat(campaign.collected_amount) / parseFloat(campaign.goal_amount)
-          
-          // Срочные: заканчиваются через 7 дней или меньше, или собрано меньше 50%
-          return (daysLeft <= 7 && daysLeft > 0) || (progress < 0.5 && daysLeft <= 30)
-        })
-        .sort((a, b) => {
-          // Сначала те, что заканчиваются раньше
-          const aEnd = new Date(a.end_date).getTime()
-          const bEnd = new Date(b.end_date).getTime()
-          return aEnd - bEnd
-        })
-        .slice(0, maxItems)
-      
-      // Если нет срочных, показываем последние активные кампании
-      if (urgent.length === 0 && allCampaigns.length > 0) {
-        urgent = allCampaigns
-          .sort((a, b) => {
-            const aDate = new Date(a.created_at || a.start_date).getTime()
-            const bDate = new Date(b.created_at || b.start_date).getTime()
-            return bDate - aDate // Последние созданные первыми
-          })
-          .slice(0, maxItems)
-      }
+      // Ранжирование по срочности выполняет сервер
+      const urgent = await campaignsService.getUrgentCampaigns(maxItems)
       
       setUrgentCampaigns(urgent)
     } catch (error) {
@@ -17,9 +17,7 @@ const CampaignDetailPage = () => {
   const [donationAmount, setDonationAmount] = useState<string>('')
   const [showDonationForm, setShowDonationForm] = useState(false)
   const [campaignDonations, setCampaignDonations] = useState<CampaignDonation[]>([])
-  const [loadingDonations, setLoadingDonations] = useState(false)
   const [campaignReport, setCampaignReport] = useState<CampaignReport | null>(null)
-  const [loadingReport, setLoadingReport] = useState(false)
   const { success, error, warning } = useToast()
 
   useEffect(() => {
@@ -28,22 +26,13 @@ const CampaignDetailPage = () => {
     }
   }, [id])
 
-  useEffect(() => {
-    if (campaign && campaign.status === 'active') {
-      loadDonations()
-    }
-  }, [campaign])
-
-  useEffect(() => {
-    if (campaign && (campaign.status === 'completed' || campaign.status === 'expired')) {
-      loadReport()
-    }
-  }, [campaign])
-
+  // Кампания, история пожертвований и отчёт приходят одним запросом
   const loadCampaign = async () => {
     try {
-      const data = await campaignsService.getCampaign(parseInt(id!))
-      setCampaign(data)
+      const data = await campaignsService.getCampaignDetail(parseInt(id!))
+      setCampaign(data.campaign)
+      setCampaignDonations(data.donations)
+      setCampaignReport(data.report)
     } catch (err: any) {
       console.error('Error loading campaign:', err)
       error(err.message || 'Ошибка при загрузке кампании')
@@ -56,34 +45,6 @@ const CampaignDetailPage = () => {
     }
   }
 
-  const loadDonations = async () => {
-    if (!id) return
-    setLoadingDonations(true)
-    try {
-      const donations = await campaignsService.getCampaignDonations(parseInt(id), 10)
-      setCampaignDonations(donations)
-    } catch (err: any) {
-      console.error('Error loading donations:', err)
-      // Не показываем ошибку, просто не загружаем историю
-    } finally {
-      setLoadingDonations(false)
-    }
-  }
-
-  const loadReport = async () => {
-    if (!id) return
-    setLoadingReport(true)
-    try {
-      const report = await campaignsService.getCampaignReport(parseInt(id))
-      setCampaignReport(report)
-    } catch (err: any) {
-      console.error('Error loading report:', err)
-      // Не показываем ошибку, если отчёт недоступен
-    } finally {
-      setLoadingReport(false)
-    }
-  }
-
   const handleDonate = async () => {
     if (!campaign || !donationAmount || parseFloat(donationAmount) <= 0) {
       warning('Укажите сумму пожертвования')
@@ -306,47 +267,41 @@ const CampaignDetailPage = () => {
             <Icon name="history" size={20} />
             История пожертвований
           </h3>
-          {loadingDonations ? (
-            <div style={{ textAlign: 'center', padding: '20px' }}>
-              <LoadingSpinner size="sm" />
-            </div>
-          ) : (
-            <div style={{ display: 'flex', flexDirection: 'column', gap: '12px' }}>
-              {campaignDonations.slice(0, 10).map((donation) => (
-                <div
-                  key={donation.id}
-                  style={{
-                    display: 'flex',
-                    justifyContent: 'space-between',
-                    alignItems: 'center',
-                    padding: '12px',
-                    background: 'var(--bg-secondary)',
-                    borderRadius: '8px',
-                  }}
-                >
-                  <div>
-                    <div style={{ fontWeight: '600', marginBottom: '4px' }}>
-                      {parseFloat(donation.amount_value).toLocaleString('ru-RU')} {donation.currency}
-                    </div>
-                    <div style={{ fontSize: '12px', color: 'var(--text-muted)' }}>
-                      {donation.completed_at
-                        ? new Date(donation.completed_at).toLocaleDateString('ru-RU', {
-                            day: 'numeric',
-                            month: 'long',
-                            year: 'numeric',
-                            hour: '2-digit',
-                            minute: '2-digit',
-                          })
-                        : 'В обработке'}
-                    </div>
+          <div style={{ display: 'flex', flexDirection: 'column', gap: '12px' }}>
+            {campaignDonations.slice(0, 10).map((donation) => (
+              <div
+                key={donation.id}
+                style={{
+                  display: 'flex',
+                  justifyContent: 'space-between',
+                  alignItems: 'center',
+                  padding: '12px',
+                  background: 'var(--bg-secondary)',
+                  borderRadius: '8px',
+                }}
+              >
+                <div>
+                  <div style={{ fontWeight: '600', marginBottom: '4px' }}>
+                    {parseFloat(donation.amount_value).toLocaleString('ru-RU')} {donation.currency}
                   </div>
-                  <div>
-                    <span className="badge badge-success">Завершено</span>
+                  <div style={{ fontSize: '12px', color: 'var(--text-muted)' }}>
+                    {donation.completed_at
+                      ? new Date(donation.completed_at).toLocaleDateString('ru-RU', {
+                          day: 'numeric',
+                          month: 'long',
+                          year: 'numeric',
+                          hour: '2-digit',
+                          minute: '2-digit',
+                        })
+                      : 'В обработке'}
                   </div>
                 </div>
-              ))}
-            </div>
-          )}
+                <div>
+                  <span className="badge badge-success">Завершено</span>
+                </div>
+              </div>
+            ))}
+          </div>
         </div>
       )}
 
@@ -357,11 +312,7 @@ const CampaignDetailPage = () => {
             <Icon name="fileText" size={20} />
             Отчет о завершении кампании
           </h3>
-          {loadingReport ? (
-            <div style={{ textAlign: 'center', padding: '20px' }}>
-              <LoadingSpinner size="sm" />
-            </div>
-          ) : campaignReport ? (
+          {campaignReport ? (
             <div style={{ display: 'flex', flexDirection: 'column', gap: '16px' }}>
               <div style={{ padding: '16px', background: 'var(--bg-secondary)', borderRadius: '12px' }}>
                 <div style={{ display: 'grid', gridTemplateColumns: 'repeat(2, 1fr)', gap: '16px', marginBottom: '16px' }}>
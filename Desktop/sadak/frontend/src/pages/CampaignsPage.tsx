@@ -1,6 +1,6 @@
 import { useState, useEffect } from 'react'
 import { useNavigate } from 'react-router-dom'
-import { campaignsService, Campaign } from '../services/campaignsService'
+import { campaignsService, Campaign, CampaignFacets } from '../services/campaignsService'
 import Skeleton from '../components/Skeleton'
 import CampaignCard from '../components/CampaignCard'
 import CreateCampaignModal from '../components/CreateCampaignModal'
@@ -20,11 +20,17 @@ const CampaignsPage = () => {
   const [selectedStatus, setSelectedStatus] = useState('active')
   const [selectedSort, setSelectedSort] = useState<string>('newest')
   const [selectedCountry, setSelectedCountry] = useState<string>('')
+  const [facets, setFacets] = useState<CampaignFacets | null>(null)
   
   const debouncedSearch = useDebounce(searchQuery, 300)
   
-  // Получаем уникальные категории
-  const categories = Array.from(new Set(campaigns.map(c => c.category).filter((cat): cat is string => Boolean(cat))))
+  // Категории со счётчиками активных кампаний; пока счётчики не загружены - из загруженных кампаний
+  const categories = facets
+    ? facets.campaigns.categories.map(facet => facet.value)
+    : Array.from(new Set(campaigns.map(c => c.category).filter((cat): cat is string => Boolean(cat))))
+  const facetCount = (group: 'categories' | 'countries', value: string) =>
+    facets?.campaigns[group].find(facet => facet.value === value)?.count
+  const withCount = (label: string, count?: number) => (count !== undefined ? `${label} (${count})` : label)
   
   // Список стран (можно расширить)
   const countries = [
@@ -37,6 +43,12 @@ const CampaignsPage = () => {
     { value: 'TR', label: '🇹🇷 Турция' },
   ]
 
+  useEffect(() => {
+    campaignsService.getCampaignFacets()
+      .then(setFacets)
+      .catch((error) => console.error('Error loading facets:', error))
+  }, [])
+
   useEffect(() => {
     loadCampaigns()
   }, [selectedStatus, selectedSort, selectedCountry])
@@ -144,7 +156,10 @@ const CampaignsPage = () => {
                 label: 'Географическое расположение',
                 options: [
                   { value: '', label: 'Все страны и регионы' },
-                  ...countries,
+                  ...countries.map(country => ({
+                    value: country.value,
+                    label: withCount(country.label, facetCount('countries', country.value)),
+                  })),
                 ],
                 value: selectedCountry,
                 onChange: (value) => {
@@ -155,7 +170,7 @@ const CampaignsPage = () => {
                 label: 'Категория проекта',
                 options: [
                   { value: '', label: 'Все категории проектов' },
-                  ...categories.map(cat => ({ value: cat, label: cat })),
+                  ...categories.map(cat => ({ value: cat, label: withCount(cat, facetCount('categories', cat)) })),
                 ],
                 value: selectedCategory,
                 onChange: setSelectedCategory,
@@ -184,6 +199,7 @@ const CampaignsPage = () => {
               {[
                 { value: 'newest', label: 'Новейшие кампании' },
                 { value: 'popularity', label: 'Наиболее популярные' },
+                { value: 'trending', label: 'Сейчас в тренде' },
                 { value: 'progress', label: 'По уровню прогресса' },
               ].map((option) => (
                 <button
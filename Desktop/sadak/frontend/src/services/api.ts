@@ -19,8 +19,15 @@ const isTelegramWebApp = () => {
   }
 }
 
+// Момент последней записи (X-Last-Write от сервера): пока он свежий, сервер
+// читает для нас с primary, а не с реплики, - в любом воркере
+let lastWrite: string | null = null
+
 // Добавление initData в заголовки для каждого запроса (только если в Telegram)
 apiClient.interceptors.request.use((config) => {
+  if (lastWrite) {
+    config.headers['X-Last-Write'] = lastWrite
+  }
   if (isTelegramWebApp()) {
     try {
       // @ts-ignore
@@ -46,7 +53,13 @@ apiClient.interceptors.request.use((config) => {
 
 // Централизованная обработка ошибок API
 apiClient.interceptors.response.use(
-  (response) => response,
+  (response) => {
+    const written = response.headers['x-last-write']
+    if (written) {
+      lastWrite = written
+    }
+    return response
+  },
   (error) => {
     // Обработка ошибок сети
     if (!error.response) {
@@ -20,6 +20,28 @@ export interface Campaign {
   updated_at?: string
 }
 
+export interface CampaignPage {
+  items: Campaign[]
+  next_cursor: string | null
+}
+
+export interface FacetValue {
+  value: string
+  count: number
+}
+
+export interface FacetGroup {
+  total: number
+  categories: FacetValue[]
+  countries: FacetValue[]
+}
+
+// Счётчики для панели фильтров
+export interface CampaignFacets {
+  campaigns: FacetGroup
+  funds: FacetGroup
+}
+
 export interface CampaignCreate {
   fund_id: number
   title: string
@@ -51,6 +73,23 @@ export interface CampaignReport {
   report_documents?: string[]
 }
 
+export interface FundSummary {
+  id: number
+  name: string
+  country_code?: string
+  verified: boolean
+  logo_url?: string
+  website_url?: string
+}
+
+// Страница кампании одним запросом
+export interface CampaignDetail {
+  campaign: Campaign
+  fund: FundSummary | null
+  donations: CampaignDonation[]
+  report: CampaignReport | null
+}
+
 export const campaignsService = {
   getCampaigns: async (params?: {
     country_code?: string
@@ -65,12 +104,39 @@ export const campaignsService = {
       return cached
     }
 
-    const response = await apiClient.get<Campaign[]>('/campaigns', { params })
+    const response = await apiClient.get<CampaignPage>('/campaigns', {
+      params: { ...params, limit: 100 }
+    })
     
     // Кешируем активные кампании на 2 минуты (быстро меняются)
     const ttl = params?.status === 'active' ? 2 * 60 * 1000 : 5 * 60 * 1000
-    cacheService.set(cacheKey, response.data, ttl)
+    cacheService.set(cacheKey, response.data.items, ttl)
     
+    return response.data.items
+  },
+
+  // Постраничная загрузка: следующая страница - с cursor = next_cursor
+  getCampaignsPage: async (params?: {
+    country_code?: string
+    category?: string
+    status?: string
+    sort?: string
+    cursor?: string
+    limit?: number
+  }) => {
+    const response = await apiClient.get<CampaignPage>('/campaigns', { params })
+    return response.data
+  },
+
+  // Срочные кампании (ближайший end_date первым) - отдаются сервером из памяти
+  getUrgentCampaigns: async (limit: number = 5) => {
+    const response = await apiClient.get<Campaign[]>('/campaigns/urgent', { params: { limit } })
+    return response.data
+  },
+
+  // Счётчики активных кампаний и проверенных фондов по категориям и странам
+  getCampaignFacets: async () => {
+    const response = await apiClient.get<CampaignFacets>('/campaigns/facets')
     return response.data
   },
 
@@ -79,6 +145,14 @@ export const campaignsService = {
     return response.data
   },
 
+  getCampaignDetail: async (campaignId: number, donationsLimit: number = 10) => {
+    const response = await apiClient.get<CampaignDetail>(
+      `/campaigns/${campaignId}/detail`,
+      { params: { donations_limit: donationsLimit } }
+    )
+    return response.data
+  },
+
   createCampaign: async (data: CampaignCreate) => {
     const response = await apiClient.post<Campaign>('/campaigns', data)
     return response.data
@@ -23,6 +23,7 @@ export interface DonationInit {
   currency?: string
   donation_type?: string
   return_url?: string
+  card_bin?: string
 }
 
 export const donationsService = {